@@ -206,7 +206,8 @@ class UserAuditTrail(models.Model):
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='audit_trails')
     action = TextChoiceField(max_length=40, choices_cls=Actions)
-    datetime = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set by the writer rather than auto_now_add so buffered rows keep the time the action happened.
+    datetime = models.DateTimeField(default=timezone.now, db_index=True)
 
     class Meta:
         ordering = ['-datetime', '-id']
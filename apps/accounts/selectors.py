@@ -1,4 +1,16 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
 from . import models
+from .services import _get_redis
+
+logger = logging.getLogger(__name__)
+
+MODULE_SNAPSHOT_GENERATION_KEY = 'accounts:module-snapshot:generation'
+MODULE_SNAPSHOT_KEY = 'accounts:module-snapshot:{generation}:{user_id}:{superuser}'
 
 
 def active_staff_get():
@@ -27,19 +39,99 @@ def user_role_modules_get(*, user: models.User):
     return role_modules
 
 
-def user_role_modules_data_get(*, user: models.User):
-    role_modules = user_role_modules_get(user=user)
-    result = []
-    for rm in role_modules:
-        perms = [p.codename for p in rm.permissions.all()]
-        result.append({
-            'name': rm.module.name,
-            'description': rm.module.description,
-            'codename': rm.module.codename,
-            'permissions': perms,
+def _module_snapshot_generation(client=None):
+    if client is not None:
+        client.set(MODULE_SNAPSHOT_GENERATION_KEY, 1, nx=True)
+        return int(client.get(MODULE_SNAPSHOT_GENERATION_KEY) or 1)
+    generation = cache.get(MODULE_SNAPSHOT_GENERATION_KEY)
+    if generation is None:
+        generation = 1
+        cache.add(MODULE_SNAPSHOT_GENERATION_KEY, generation, None)
+    return generation
+
+
+def invalidate_module_snapshots():
+    """Drop every cached module snapshot by moving to a new cache generation."""
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.incr(MODULE_SNAPSHOT_GENERATION_KEY)
+        except Exception:
+            logger.warning('module snapshot: redis generation bump failed', exc_info=True)
+    try:
+        cache.incr(MODULE_SNAPSHOT_GENERATION_KEY)
+    except ValueError:
+        cache.set(MODULE_SNAPSHOT_GENERATION_KEY, 2, None)
+
+
+def _build_module_snapshot(*, user: models.User):
+    role_modules = models.RoleModule.objects.select_related('module').prefetch_related('permissions')
+    if not user.is_superuser:
+        role_modules = role_modules.filter(role__in=user.groups.all())
+
+    role_module_data = {}
+    enabled = {}
+    for rm in role_modules.order_by('module__order', 'module_id', 'id'):
+        module = rm.module
+        entry = role_module_data.setdefault(module.codename, {
+            'name': module.name,
+            'description': module.description,
+            'codename': module.codename,
+            'permissions': [],
         })
-    # dedupe by codename
-    dedup = {}
-    for item in result:
-        dedup[item['codename']] = item
-    return list(dedup.values())
+        for perm in rm.permissions.all():
+            if perm.codename not in entry['permissions']:
+                entry['permissions'].append(perm.codename)
+        enabled[module.pk] = (module.order, module.pk, module.codename)
+
+    if user.is_superuser:
+        modules = models.Module.objects.order_by('order', 'id').values_list('order', 'id', 'codename')
+        enabled = {pk: (order, pk, codename) for order, pk, codename in modules}
+
+    ordered_codenames = [codename for _, _, codename in sorted(enabled.values()) if codename]
+    return {
+        'codenames': sorted(set(ordered_codenames)),
+        'ordered_codenames': ordered_codenames,
+        'role_modules': list(role_module_data.values()),
+    }
+
+
+def user_module_snapshot_get(*, user: models.User):
+    """Return the cached enabled-module/permission snapshot for ``user``.
+
+    ``codenames`` is the sorted set of enabled module codenames, ``ordered_codenames`` follows
+    Module.order then id, and ``role_modules`` is the per-module permission data.
+    Invalidated by the signal handlers in ``apps.accounts.signals``.
+
+    With ``REDIS_URL`` set the snapshot and its generation live in Redis, so an invalidation
+    reaches every web and worker process. Otherwise they sit in this process's cache, which
+    other processes' invalidations cannot reach, so they expire after the much shorter
+    ``ACCOUNT_MODULE_SNAPSHOT_LOCAL_TTL``.
+    """
+    client = _get_redis()
+    if client is not None:
+        try:
+            key = MODULE_SNAPSHOT_KEY.format(
+                generation=_module_snapshot_generation(client), user_id=user.pk, superuser=int(bool(user.is_superuser))
+            )
+            cached = client.get(key)
+            if cached is not None:
+                return json.loads(cached)
+            snapshot = _build_module_snapshot(user=user)
+            client.set(key, json.dumps(snapshot), ex=getattr(settings, 'ACCOUNT_MODULE_SNAPSHOT_TTL', 300))
+            return snapshot
+        except Exception:
+            logger.warning('module snapshot: redis unavailable, using the local cache', exc_info=True)
+
+    key = MODULE_SNAPSHOT_KEY.format(
+        generation=_module_snapshot_generation(), user_id=user.pk, superuser=int(bool(user.is_superuser))
+    )
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = _build_module_snapshot(user=user)
+        cache.set(key, snapshot, getattr(settings, 'ACCOUNT_MODULE_SNAPSHOT_LOCAL_TTL', 5))
+    return snapshot
+
+
+def user_role_modules_data_get(*, user: models.User):
+    return [dict(item, permissions=list(item['permissions'])) for item in user_module_snapshot_get(user=user)['role_modules']]
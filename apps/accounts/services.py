@@ -7,8 +7,12 @@ from rest_framework import exceptions
 from django.db import transaction
 from django.contrib.auth.models import Group
 
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
 from . import models
-import os, time
+import atexit, logging, os, threading, time
 import qrcode
 import pyotp
 try:  # optional redis dependency
@@ -16,6 +20,8 @@ try:  # optional redis dependency
 except Exception:  # pragma: no cover
     redis = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
 _redis_client = None
 def _get_redis():
     global _redis_client
@@ -36,6 +42,108 @@ RATE_LIMIT_MAX_ATTEMPTS = int(os.environ.get('LOGIN_RATE_LIMIT_MAX', '10'))
 RATE_LIMIT_WINDOW_SEC = int(os.environ.get('LOGIN_RATE_LIMIT_WINDOW', '60'))
 
 
+# Audit trail writer. ``AUDIT_LOG_BACKEND`` selects how rows reach the database:
+#   sync      one INSERT per action (the historical behaviour)
+#   buffered  queued in-process and written with bulk_create on size/time thresholds
+#   celery    queued in-process and handed to a worker task in batches
+# High-frequency actions listed in AUDIT_COALESCE_ACTIONS keep at most one row per
+# user per AUDIT_COALESCE_SECONDS window.
+AUDIT_LAST_SEEN_MAX = 10000
+
+_audit_lock = threading.Lock()
+_audit_buffer: list[dict] = []
+_audit_last_seen: dict[tuple, float] = {}
+_audit_timer = None
+
+
+def _audit_setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def _audit_coalesced(user_id, action: str, now: float, *, record: bool = True) -> bool:
+    if action not in set(_audit_setting('AUDIT_COALESCE_ACTIONS', ())):
+        return False
+    window = float(_audit_setting('AUDIT_COALESCE_SECONDS', 0) or 0)
+    if window <= 0:
+        return False
+    key = (user_id, action)
+    with _audit_lock:
+        last = _audit_last_seen.get(key)
+        if last is not None and now - last < window:
+            return True
+        if not record:
+            return False
+        if len(_audit_last_seen) >= AUDIT_LAST_SEEN_MAX:
+            _audit_last_seen.clear()
+        _audit_last_seen[key] = now
+    return False
+
+
+def write_audit_entries(entries: list[dict]) -> int:
+    """Persist queued audit entries (``user_id``/``action``/``datetime`` dicts) in one INSERT."""
+    if not entries:
+        return 0
+    rows = [
+        models.UserAuditTrail(user_id=entry['user_id'], action=entry['action'], datetime=entry['datetime'])
+        for entry in entries
+    ]
+    models.UserAuditTrail.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def flush_audit_buffer() -> int:
+    """Drain the in-process audit queue; returns the number of entries handed off."""
+    global _audit_timer
+    with _audit_lock:
+        entries = _audit_buffer[:]
+        _audit_buffer.clear()
+        if _audit_timer is not None:
+            _audit_timer.cancel()
+            _audit_timer = None
+    if not entries:
+        return 0
+    if _audit_setting('AUDIT_LOG_BACKEND', 'sync') == 'celery':
+        try:
+            from . import tasks
+
+            tasks.write_audit_entries.delay(
+                [{**entry, 'datetime': entry['datetime'].isoformat()} for entry in entries]
+            )
+            return len(entries)
+        except Exception:
+            logger.exception('audit: failed to enqueue %s entries, writing inline', len(entries))
+    try:
+        return write_audit_entries(entries)
+    except Exception:
+        logger.exception('audit: failed to write %s entries', len(entries))
+        return 0
+
+
+def _flush_audit_buffer_from_timer():
+    try:
+        flush_audit_buffer()
+    finally:
+        close_old_connections()
+
+
+def _enqueue_audit_entry(entry: dict):
+    global _audit_timer
+    size = int(_audit_setting('AUDIT_BUFFER_SIZE', 100) or 1)
+    with _audit_lock:
+        _audit_buffer.append(entry)
+        full = len(_audit_buffer) >= size
+        if not full and _audit_timer is None:
+            interval = float(_audit_setting('AUDIT_FLUSH_INTERVAL', 5) or 0)
+            _audit_timer = threading.Timer(interval, _flush_audit_buffer_from_timer)
+            _audit_timer.daemon = True
+            _audit_timer.start()
+    if full:
+        flush_audit_buffer()
+
+
+atexit.register(flush_audit_buffer)
+
+
 def log_user_action(*, user: models.User | None, action: models.UserAuditTrail.Actions):
     if not user:
         return
@@ -44,7 +152,20 @@ def log_user_action(*, user: models.User | None, action: models.UserAuditTrail.A
             return
     except Exception:
         return
-    models.UserAuditTrail.objects.create(user=user, action=action)
+    if _audit_coalesced(user.pk, str(action), time.monotonic()):
+        return
+    if _audit_setting('AUDIT_LOG_BACKEND', 'sync') == 'sync':
+        models.UserAuditTrail.objects.create(user=user, action=action)
+        return
+    _enqueue_audit_entry({'user_id': user.pk, 'action': str(action), 'datetime': timezone.now()})
+
+def audit_coalesced(*, user: models.User | None, action: models.UserAuditTrail.Actions) -> bool:
+    """Whether ``log_user_action`` would currently drop ``action`` for ``user`` (read-only)."""
+    user_id = getattr(user, 'pk', None)
+    if user_id is None:
+        return False
+    return _audit_coalesced(user_id, str(action), time.monotonic(), record=False)
+
 
 def rate_limit_check(email: str):
     client = _get_redis()
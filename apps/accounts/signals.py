@@ -0,0 +1,21 @@
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from . import models, selectors
+
+
+def _invalidate_module_snapshots(sender, **kwargs):
+    selectors.invalidate_module_snapshots()
+
+
+def _invalidate_on_m2m_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        selectors.invalidate_module_snapshots()
+
+
+def connect():
+    for model in (Group, models.Role, models.Module, models.RoleModule):
+        post_save.connect(_invalidate_module_snapshots, sender=model, dispatch_uid=f'module-snapshot-save-{model.__name__}')
+        post_delete.connect(_invalidate_module_snapshots, sender=model, dispatch_uid=f'module-snapshot-delete-{model.__name__}')
+    for through in (models.RoleModule, models.RoleModule.permissions.through, models.User.groups.through):
+        m2m_changed.connect(_invalidate_on_m2m_change, sender=through, dispatch_uid=f'module-snapshot-m2m-{through.__name__}')
@@ -0,0 +1,14 @@
+"""Celery tasks for account housekeeping."""
+
+from celery import shared_task
+from django.utils.dateparse import parse_datetime
+
+from . import services
+
+
+@shared_task
+def write_audit_entries(entries):
+    """Bulk-insert audit entries queued by ``services.flush_audit_buffer``."""
+    return services.write_audit_entries(
+        [{**entry, 'datetime': parse_datetime(entry['datetime'])} for entry in entries]
+    )
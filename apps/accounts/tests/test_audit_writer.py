@@ -0,0 +1,49 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.accounts import models, services
+
+Actions = models.UserAuditTrail.Actions
+
+
+@override_settings(AUDIT_LOG_BACKEND='buffered', AUDIT_BUFFER_SIZE=3, AUDIT_FLUSH_INTERVAL=60,
+                   AUDIT_COALESCE_ACTIONS=['testcase_run'], AUDIT_COALESCE_SECONDS=60)
+class AuditWriterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='auditor', email='auditor@example.com', password='secret123')
+        services._audit_last_seen.clear()
+        self.addCleanup(services.flush_audit_buffer)
+
+    def test_buffered_entries_flush_on_size_threshold(self):
+        services.log_user_action(user=self.user, action=Actions.CREATE_PROJECT)
+        services.log_user_action(user=self.user, action=Actions.UPDATE_PROJECT)
+        self.assertFalse(models.UserAuditTrail.objects.exists())
+
+        services.log_user_action(user=self.user, action=Actions.UPDATE_PROJECT)
+        self.assertEqual(models.UserAuditTrail.objects.filter(user=self.user).count(), 3)
+
+    def test_buffered_entries_keep_event_time(self):
+        event_time = timezone.now() - timedelta(minutes=5)
+        with mock.patch.object(services.timezone, 'now', return_value=event_time):
+            services.log_user_action(user=self.user, action=Actions.CREATE_PROJECT)
+        self.assertEqual(services.flush_audit_buffer(), 1)
+        self.assertEqual(models.UserAuditTrail.objects.get().datetime, event_time)
+
+    def test_high_frequency_actions_are_coalesced(self):
+        for _ in range(5):
+            services.log_user_action(user=self.user, action=Actions.RUN_TEST_CASE)
+        services.flush_audit_buffer()
+        self.assertEqual(models.UserAuditTrail.objects.filter(action=Actions.RUN_TEST_CASE).count(), 1)
+
+    @override_settings(AUDIT_LOG_BACKEND='celery')
+    def test_celery_backend_hands_batch_to_task(self):
+        with mock.patch('apps.accounts.tasks.write_audit_entries.delay') as delay:
+            services.log_user_action(user=self.user, action=Actions.CREATE_PROJECT)
+            services.flush_audit_buffer()
+        entries = delay.call_args.args[0]
+        self.assertEqual([(e['user_id'], e['action']) for e in entries], [(self.user.pk, 'project_create')])
+        self.assertFalse(models.UserAuditTrail.objects.exists())
@@ -0,0 +1,82 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.accounts import models, selectors
+from config.context_processors import enabled_modules
+
+
+class _SharedRedis:
+    """Just the commands the snapshot cache uses, shared like one Redis across processes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value).encode()
+        return True
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+
+class ModuleSnapshotTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='snap', email='snap@example.com', password='CorrectPass123!')
+        self.role = Group.objects.create(name='Snapshot Role')
+        self.user.groups.add(self.role)
+        self.accounts = models.Module.objects.create(name='User Accounts', codename='user_accounts', order=2)
+        self.tester = models.Module.objects.create(name='API Tester', codename='api_tester', order=1)
+        self.role_module = models.RoleModule.objects.create(role=self.role, module=self.accounts)
+
+    def _request(self):
+        return type('Request', (), {'user': self.user})()
+
+    def test_snapshot_is_cached_between_calls(self):
+        self.assertEqual(enabled_modules(self._request()), {'ENABLED_MODULE_CODENAMES': ['user_accounts']})
+        with CaptureQueriesContext(connection) as ctx:
+            enabled_modules(self._request())
+            selectors.user_role_modules_data_get(user=self.user)
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_role_module_and_permission_changes_invalidate(self):
+        selectors.user_module_snapshot_get(user=self.user)
+        models.RoleModule.objects.create(role=self.role, module=self.tester)
+        snapshot = selectors.user_module_snapshot_get(user=self.user)
+        self.assertEqual(snapshot['ordered_codenames'], ['api_tester', 'user_accounts'])
+
+        perm = Permission.objects.filter(content_type__app_label='accounts').first()
+        self.role_module.permissions.add(perm)
+        data = {item['codename']: item for item in selectors.user_role_modules_data_get(user=self.user)}
+        self.assertEqual(data['user_accounts']['permissions'], [perm.codename])
+
+    def test_group_membership_change_invalidates(self):
+        self.assertEqual(selectors.user_module_snapshot_get(user=self.user)['codenames'], ['user_accounts'])
+        self.role.user_set.remove(self.user)
+        self.assertEqual(selectors.user_module_snapshot_get(user=self.user)['codenames'], [])
+
+    def test_shared_generation_reaches_other_processes(self):
+        redis = _SharedRedis()
+        with mock.patch.object(selectors, '_get_redis', return_value=redis):
+            self.assertEqual(selectors.user_module_snapshot_get(user=self.user)['codenames'], ['user_accounts'])
+            cache.clear()  # another process: nothing in its local cache
+            with CaptureQueriesContext(connection) as ctx:
+                self.assertEqual(selectors.user_module_snapshot_get(user=self.user)['codenames'], ['user_accounts'])
+            self.assertEqual(len(ctx.captured_queries), 0)
+
+            # A role change handled by a different process only bumps the shared generation.
+            models.RoleModule.objects.filter(pk=self.role_module.pk).delete()
+            redis.incr(selectors.MODULE_SNAPSHOT_GENERATION_KEY)
+            cache.clear()
+            self.assertEqual(selectors.user_module_snapshot_get(user=self.user)['codenames'], [])
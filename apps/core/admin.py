@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from . import models
+from . import models, services
 
 
 class ApiRequestInline(admin.TabularInline):
@@ -25,10 +25,33 @@ class ApiCollectionAdmin(admin.ModelAdmin):
 
 @admin.register(models.ApiEnvironment)
 class ApiEnvironmentAdmin(admin.ModelAdmin):
-    list_display = ("name", "created_at", "updated_at")
+    list_display = ("name", "replay_mode", "created_at", "updated_at")
+    list_filter = ("replay_mode",)
     search_fields = ("name", "description")
 
 
+@admin.register(models.ApiRecording)
+class ApiRecordingAdmin(admin.ModelAdmin):
+    list_display = ("method", "url_template", "environment", "match_key", "response_status", "updated_at")
+    list_filter = ("environment", "method")
+    search_fields = ("url_template", "request__name")
+
+
+@admin.register(models.ScheduledRun)
+class ScheduledRunAdmin(admin.ModelAdmin):
+    list_display = ("name", "cron", "environment", "is_active", "running_since", "coalesced_count", "last_finished_at")
+    list_filter = ("is_active", "environment")
+    search_fields = ("name",)
+    readonly_fields = (
+        "running_since",
+        "rerun_requested",
+        "coalesced_count",
+        "last_triggered_at",
+        "last_finished_at",
+        "last_run",
+    )
+
+
 @admin.register(models.ApiRun)
 class ApiRunAdmin(admin.ModelAdmin):
     list_display = ("id", "collection", "status", "started_at", "finished_at")
@@ -44,6 +67,28 @@ class ApiRunResultAdmin(admin.ModelAdmin):
     search_fields = ("run__collection__name", "request__name")
 
 
+@admin.register(models.ApiRunArchive)
+class ApiRunArchiveAdmin(admin.ModelAdmin):
+    list_display = ("day", "run_count", "result_count", "report_count", "restored_at")
+    list_filter = ("restored_at",)
+    date_hierarchy = "day"
+    actions = ["restore_archives"]
+
+    @admin.action(description="Restore selected archives")
+    def restore_archives(self, request, queryset):
+        restored = 0
+        for archive in queryset.filter(restored_at__isnull=True):
+            services.restore_run_archive(archive)
+            restored += 1
+        self.message_user(request, f"Restored {restored} archive(s).")
+
+
+@admin.register(models.ApiRunDailyRollup)
+class ApiRunDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("day", "runs_total", "runs_passed", "runs_failed", "results_total")
+    date_hierarchy = "day"
+
+
 @admin.register(models.ApiRequest)
 class ApiRequestAdmin(admin.ModelAdmin):
     list_display = ("name", "collection", "method", "order")
@@ -51,6 +96,13 @@ class ApiRequestAdmin(admin.ModelAdmin):
     search_fields = ("name", "url", "collection__name")
 
 
+@admin.register(models.ApiDataset)
+class ApiDatasetAdmin(admin.ModelAdmin):
+    list_display = ("name", "request", "test_case", "source_format", "updated_at")
+    list_filter = ("source_format",)
+    search_fields = ("name", "request__name", "test_case__title")
+
+
 @admin.register(models.ApiAssertion)
 class ApiAssertionAdmin(admin.ModelAdmin):
     list_display = ("request", "type", "field", "comparator")
@@ -0,0 +1,307 @@
+"""Benchmark harness behind ``manage.py bench``.
+
+A local stub HTTP server stands in for the upstream so numbers reflect this
+application's own overhead. The dataset is seeded inside a transaction that the
+command rolls back, so benchmarks can run against any database.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List
+from urllib.parse import parse_qs, urlparse
+
+import django
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import models, services
+
+SCENARIOS = (
+    "execute",
+    "run_collection",
+    "recompute_report_totals",
+    "prepare_automation_data",
+    "export_reports",
+    "export_testcase_reports",
+    "postman_import",
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON document; ``?delay_ms=`` adds latency."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        query = parse_qs(urlparse(self.path).query)
+        delay_ms = float((query.get("delay_ms") or [self.server.delay_ms])[0] or 0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        payload = json.dumps({
+            "status": "ok",
+            "path": urlparse(self.path).path,
+            "received_bytes": len(body),
+            "data": {"id": 1, "pay_reference": "BENCH-0001", "items": list(range(10))},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+        return
+
+
+@contextmanager
+def stub_upstream(*, delay_ms: float = 0.0) -> Iterator[str]:
+    """Serve the stub upstream on an ephemeral local port; yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.daemon_threads = True
+    server.delay_ms = delay_ms
+    thread = threading.Thread(target=server.serve_forever, name="bench-stub-upstream", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def seed_dataset(*, base_url: str, cases: int, requests_per_collection: int) -> Dict[str, Any]:
+    """Create a representative project tree, collection, environment and report history."""
+    suffix = uuid.uuid4().hex[:8]
+    user = get_user_model().objects.create_user(username=f"bench-{suffix}", password=uuid.uuid4().hex)
+    environment = models.ApiEnvironment.objects.create(
+        name=f"Bench {suffix}",
+        variables={"base_url": base_url, "merchant": "M-BENCH"},
+        default_headers={"X-Bench": "1"},
+    )
+    collection = models.ApiCollection.objects.create(name=f"Bench collection {suffix}")
+    collection.environments.add(environment)
+
+    api_requests = []
+    for index in range(requests_per_collection):
+        api_request = models.ApiRequest.objects.create(
+            collection=collection,
+            name=f"Bench request {index}",
+            method="POST",
+            url="{{ base_url }}/pay",
+            headers={"Accept": "application/json"},
+            body_type=models.ApiRequest.BodyTypes.JSON,
+            body_json={"merchant": "{{ merchant }}", "amount": index, "reference": "", "signature": ""},
+            body_transforms={
+                "overrides": [{"path": "reference", "value": "", "isRandom": True, "charLimit": 12}],
+                "signatures": [
+                    {"target_path": "signature", "algorithm": "sha256", "components": "merchant\namount\nreference"}
+                ],
+            },
+            order=index,
+        )
+        models.ApiAssertion.objects.bulk_create([
+            models.ApiAssertion(request=api_request, type=models.ApiAssertion.AssertionTypes.STATUS_CODE, expected_value="200"),
+            models.ApiAssertion(
+                request=api_request,
+                type=models.ApiAssertion.AssertionTypes.JSON_PATH,
+                field="data.pay_reference",
+                expected_value="BENCH-0001",
+            ),
+        ])
+        api_requests.append(api_request)
+
+    project = models.Project.objects.create(name=f"Bench project {suffix}")
+    module = models.TestModules.objects.create(title="Bench module", project=project)
+    scenario_count = max(1, cases // 10)
+    scenarios = [
+        models.TestScenario.objects.create(project=project, module=module, title=f"Scenario {index}")
+        for index in range(scenario_count)
+    ]
+    test_cases = [
+        models.TestCase.objects.create(
+            scenario=scenarios[index % scenario_count],
+            title=f"Case {index}",
+            related_api_request=api_requests[index % len(api_requests)],
+        )
+        for index in range(cases)
+    ]
+
+    run = services.run_collection(collection=collection, environment=environment, user=user)
+    report = models.AutomationReport.objects.create(triggered_in="Bench", triggered_by=user, started=run.started_at)
+    results = list(run.results.all())
+    models.ApiRunResultReport.objects.bulk_create([
+        models.ApiRunResultReport(
+            run=run,
+            request=test_case.related_api_request,
+            result=None,
+            order=index,
+            status=results[index % len(results)].status,
+            testcase=test_case,
+            automation_report=report,
+        )
+        for index, test_case in enumerate(test_cases)
+    ])
+
+    return {
+        "user": user,
+        "environment": environment,
+        "collection": collection,
+        "request": api_requests[0],
+        "report": report,
+    }
+
+
+def postman_payload(*, requests_count: int) -> Dict[str, Any]:
+    folder_items = [
+        {
+            "name": f"Request {index}",
+            "request": {
+                "method": "POST",
+                "url": {"raw": "{{base_url}}/pay?page=1", "query": [{"key": "page", "value": "1"}]},
+                "header": [{"key": "Accept", "value": "application/json"}],
+                "body": {"mode": "raw", "raw": json.dumps({"amount": index}), "options": {"raw": {"language": "json"}}},
+            },
+            "event": [{"listen": "test", "script": {"exec": ["pm.response.to.have.status(200);"]}}],
+        }
+        for index in range(requests_count)
+    ]
+    return {
+        "info": {"name": f"Bench import {uuid.uuid4().hex[:8]}"},
+        "item": [{"name": "Folder", "item": folder_items}],
+    }
+
+
+def measure(func: Callable[[], Any], *, iterations: int, warmup: int = 1) -> Dict[str, Any]:
+    """Call ``func`` repeatedly and summarize per-call latency and throughput."""
+    for _ in range(warmup):
+        func()
+    samples: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - call_started) * 1000)
+    total = time.perf_counter() - started
+    ordered = sorted(samples)
+    return {
+        "iterations": iterations,
+        "total_s": round(total, 4),
+        "throughput_per_s": round(iterations / total, 2) if total else None,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _scenario_callables(seed: Dict[str, Any], *, postman_requests: int) -> Dict[str, Callable[[], Any]]:
+    from . import views  # views import the whole API surface; keep it out of module import time
+
+    user = seed["user"]
+    api_request = seed["request"]
+    api_factory = APIRequestFactory()
+    factory = RequestFactory()
+    execute_view = views.ApiAdhocRequestView.as_view()
+    execute_payload = {
+        "method": api_request.method,
+        "url": api_request.url,
+        "headers": api_request.headers,
+        "json": api_request.body_json,
+        "environment": seed["environment"].pk,
+        "collection_id": seed["collection"].pk,
+        "request_id": api_request.pk,
+    }
+
+    def execute() -> None:
+        request = api_factory.post("/api/core/tester/execute/", execute_payload, format="json")
+        force_authenticate(request, user=user)
+        response = execute_view(request)
+        if response.status_code != 200:
+            raise RuntimeError(f"execute returned HTTP {response.status_code}")
+
+    def export(view: Callable) -> Callable[[], None]:
+        def run() -> None:
+            request = factory.get("/")
+            request.user = user
+            response = view(request)
+            if response.status_code != 200:
+                raise RuntimeError(f"export returned HTTP {response.status_code}")
+        return run
+
+    return {
+        "execute": execute,
+        "run_collection": lambda: services.run_collection(
+            collection=seed["collection"], environment=seed["environment"], user=user
+        ),
+        "recompute_report_totals": lambda: services.recompute_automation_report_totals(seed["report"]),
+        "prepare_automation_data": lambda: views._prepare_automation_data(),
+        "export_reports": export(views.automation_reports_export),
+        "export_testcase_reports": export(views.automation_testcase_reports_export),
+        "postman_import": lambda: services.import_postman_collection(postman_payload(requests_count=postman_requests)),
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run_benchmarks(
+    *,
+    scenarios: List[str] | None = None,
+    iterations: int = 20,
+    cases: int = 200,
+    requests_per_collection: int = 10,
+    postman_requests: int = 50,
+    upstream_delay_ms: float = 0.0,
+) -> Dict[str, Any]:
+    """Seed a dataset, run the selected scenarios against the stub upstream and return the results.
+
+    The caller is responsible for running this inside a transaction it rolls back.
+    """
+    selected = list(scenarios or SCENARIOS)
+    unknown = sorted(set(selected) - set(SCENARIOS))
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    # Admission limits would measure the throttle, not the handler.
+    with stub_upstream(delay_ms=upstream_delay_ms) as base_url, override_settings(
+        EXECUTE_RATE_PER_SECOND=0, EXECUTE_MAX_IN_FLIGHT_PER_USER=0, EXECUTE_MAX_IN_FLIGHT_PER_HOST=0
+    ):
+        seed = seed_dataset(base_url=base_url, cases=cases, requests_per_collection=requests_per_collection)
+        callables = _scenario_callables(seed, postman_requests=postman_requests)
+        for name in selected:
+            results[name] = measure(callables[name], iterations=iterations)
+
+    return {
+        "revision": _git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "parameters": {
+            "iterations": iterations,
+            "cases": cases,
+            "requests_per_collection": requests_per_collection,
+            "postman_requests": postman_requests,
+            "upstream_delay_ms": upstream_delay_ms,
+        },
+        "results": results,
+    }
@@ -0,0 +1,226 @@
+"""Per-upstream-host circuit breaker and retry budget for outbound test requests.
+
+After ``UPSTREAM_CIRCUIT_FAILURE_THRESHOLD`` consecutive connection errors or timeouts
+against one host, calls to that host fail fast with ``CircuitOpen`` for
+``UPSTREAM_CIRCUIT_COOLDOWN_SECONDS``. Once the cool-down passes a single probe call is
+let through: success closes the circuit, another failure opens it again. State lives in
+Redis when ``REDIS_URL`` is configured so every worker shares it; otherwise each process
+keeps its own.
+
+Failed calls may be retried up to ``UPSTREAM_RETRY_ATTEMPTS`` times with jittered
+exponential backoff, each retry drawing from the run's ``RetryBudget``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+try:  # avoid hard dependency at import time
+    from apps.accounts.services import _get_redis
+except Exception:  # pragma: no cover
+    def _get_redis():  # type: ignore[misc]
+        return None
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CIRCUIT_KEY = "core:circuit:{host}"
+
+# Returns seconds until the circuit may be probed, or 0 when the call may proceed.
+_ALLOW_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'failures', 'open_until')
+local failures = tonumber(state[1]) or 0
+local open_until = tonumber(state[2]) or 0
+local now = tonumber(ARGV[1])
+if failures < tonumber(ARGV[2]) then
+    return '0'
+end
+if now < open_until then
+    return tostring(open_until - now)
+end
+redis.call('HSET', KEYS[1], 'open_until', now + tonumber(ARGV[3]))
+return '0'
+"""
+
+_FAILURE_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'failures', 1)
+if failures >= tonumber(ARGV[2]) then
+    redis.call('HSET', KEYS[1], 'open_until', tonumber(ARGV[1]) + tonumber(ARGV[3]))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return failures
+"""
+
+_local_lock = threading.Lock()
+_local_circuits: Dict[str, List[float]] = {}
+
+
+class CircuitOpen(requests.ConnectionError):
+    """Raised instead of calling a host whose circuit is open."""
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return float(getattr(settings, name, default) or 0)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def host_of(url: Optional[str]) -> str:
+    parsed = urlparse(str(url or ""))
+    host = (parsed.hostname or "").lower()
+    return f"{host}:{parsed.port}" if host and parsed.port else host
+
+
+def _limits() -> tuple[int, float]:
+    return int(_setting("UPSTREAM_CIRCUIT_FAILURE_THRESHOLD", 5)), _setting("UPSTREAM_CIRCUIT_COOLDOWN_SECONDS", 30)
+
+
+def allow(host: str) -> None:
+    """Raise ``CircuitOpen`` if ``host`` is cooling down; otherwise admit the call (or the probe)."""
+    threshold, cooldown = _limits()
+    if threshold <= 0 or not host:
+        return
+    now = time.time()
+    wait = None
+    client = _get_redis()
+    if client is not None:
+        try:
+            wait = float(client.eval(_ALLOW_SCRIPT, 1, CIRCUIT_KEY.format(host=host), now, threshold, cooldown))
+        except Exception:
+            logger.warning("upstream circuit: redis unavailable, using local fallback", exc_info=True)
+    if wait is None:
+        with _local_lock:
+            failures, open_until = _local_circuits.get(host, (0, 0.0))
+            wait = 0.0
+            if failures >= threshold:
+                if now < open_until:
+                    wait = open_until - now
+                else:
+                    _local_circuits[host] = [failures, now + cooldown]
+    if wait > 0:
+        raise CircuitOpen(
+            f"Circuit open for {host} after {threshold} consecutive connection failures; "
+            f"failing fast for another {math.ceil(wait)}s."
+        )
+
+
+def record_failure(host: str) -> None:
+    threshold, cooldown = _limits()
+    if threshold <= 0 or not host:
+        return
+    now = time.time()
+    client = _get_redis()
+    if client is not None:
+        try:
+            ttl = int(cooldown) + 3600
+            client.eval(_FAILURE_SCRIPT, 1, CIRCUIT_KEY.format(host=host), now, threshold, cooldown, ttl)
+            return
+        except Exception:
+            logger.warning("upstream circuit: failed to record failure for %s", host, exc_info=True)
+    with _local_lock:
+        failures, open_until = _local_circuits.get(host, (0, 0.0))
+        failures += 1
+        if failures >= threshold:
+            open_until = now + cooldown
+        _local_circuits[host] = [failures, open_until]
+
+
+def record_success(host: str) -> None:
+    if _limits()[0] <= 0 or not host:
+        return
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.delete(CIRCUIT_KEY.format(host=host))
+            return
+        except Exception:
+            logger.warning("upstream circuit: failed to reset %s", host, exc_info=True)
+    with _local_lock:
+        _local_circuits.pop(host, None)
+
+
+class RetryBudget:
+    """Retries one run may spend across all of its requests; safe to share between threads."""
+
+    def __init__(self, retries: int | None = None) -> None:
+        self.remaining = int(_setting("UPSTREAM_RETRY_BUDGET", 10) if retries is None else retries)
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def _retry_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff in seconds for retry number ``attempt`` (1-based)."""
+    base = _setting("UPSTREAM_RETRY_BACKOFF_MS", 200) / 1000
+    cap = _setting("UPSTREAM_RETRY_BACKOFF_MAX_MS", 2000) / 1000
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+def _should_retry(attempt: int, budget: Optional[RetryBudget]) -> bool:
+    if attempt >= int(_setting("UPSTREAM_RETRY_ATTEMPTS", 0)):
+        return False
+    return budget is None or budget.take()
+
+
+def call(url: Optional[str], send: Callable[[], T], *, budget: Optional[RetryBudget] = None) -> T:
+    """Run ``send`` behind the circuit for ``url``'s host, retrying transport failures.
+
+    Only ``requests.ConnectionError`` and ``requests.Timeout`` count as failures; any
+    HTTP response closes the circuit. Without a ``budget`` retries are limited only by
+    ``UPSTREAM_RETRY_ATTEMPTS``.
+    """
+    host = host_of(url)
+    attempt = 0
+    while True:
+        allow(host)
+        try:
+            response = send()
+        except (requests.ConnectionError, requests.Timeout):
+            record_failure(host)
+            if not _should_retry(attempt, budget):
+                raise
+            attempt += 1
+            time.sleep(_retry_delay(attempt))
+            continue
+        record_success(host)
+        return response
+
+
+async def acall(
+    url: Optional[str], send: Callable[[], Awaitable[T]], *, budget: Optional[RetryBudget] = None
+) -> T:
+    """``call`` for coroutines; circuit state is read and written off the event loop."""
+    host = host_of(url)
+    attempt = 0
+    while True:
+        await sync_to_async(allow, thread_sensitive=False)(host)
+        try:
+            response = await send()
+        except (requests.ConnectionError, requests.Timeout):
+            await sync_to_async(record_failure, thread_sensitive=False)(host)
+            if not _should_retry(attempt, budget):
+                raise
+            attempt += 1
+            await asyncio.sleep(_retry_delay(attempt))
+            continue
+        await sync_to_async(record_success, thread_sensitive=False)(host)
+        return response
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.core import services
+
+
+class Command(BaseCommand):
+    help = 'Archive runs older than the retention policy to MEDIA storage and delete them in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Retention in days (default RUN_HISTORY_RETENTION_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=None, help='Runs per archive batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.RUN_HISTORY_RETENTION_DAYS
+        totals = services.archive_run_history(
+            older_than_days=days,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        prefix = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {totals['runs']} runs, {totals['results']} results, {totals['reports']} report rows "
+            f"older than {days} days ({totals['archives']} files)"
+        ))
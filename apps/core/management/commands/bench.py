@@ -0,0 +1,51 @@
+import json
+import sys
+from contextlib import redirect_stdout
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core import benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark execution, reporting, export and import paths against a local stub upstream; prints JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'scenarios', nargs='*', metavar='scenario',
+            help=f"Scenarios to run (default all): {', '.join(benchmarks.SCENARIOS)}",
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Measured calls per scenario')
+        parser.add_argument('--cases', type=int, default=200, help='Seeded test cases (and report rows)')
+        parser.add_argument('--requests', type=int, default=10, help='Seeded requests in the benchmark collection')
+        parser.add_argument('--postman-requests', type=int, default=50, help='Requests per imported Postman collection')
+        parser.add_argument('--upstream-delay-ms', type=float, default=0.0, help='Latency added by the stub upstream')
+        parser.add_argument('--output', help='Write the JSON result to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['cases'] < 1 or options['requests'] < 1:
+            raise CommandError('--iterations, --cases and --requests must be positive')
+        try:
+            # Seeded rows and everything the scenarios write are rolled back. Debug prints
+            # from the code under test go to stderr so stdout stays valid JSON.
+            with redirect_stdout(sys.stderr), transaction.atomic():
+                report = benchmarks.run_benchmarks(
+                    scenarios=options['scenarios'],
+                    iterations=options['iterations'],
+                    cases=options['cases'],
+                    requests_per_collection=options['requests'],
+                    postman_requests=options['postman_requests'],
+                    upstream_delay_ms=options['upstream_delay_ms'],
+                )
+                transaction.set_rollback(True)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        text = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(text + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Wrote benchmark results to {options['output']}"))
+        else:
+            self.stdout.write(text)
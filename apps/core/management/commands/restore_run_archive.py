@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.core import models, services
+
+
+class Command(BaseCommand):
+    help = 'Restore archived runs by archive id or by day (YYYY-MM-DD)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive_ids', nargs='*', type=int, help='ApiRunArchive ids to restore')
+        parser.add_argument('--day', type=str, default=None, help='Restore every pending archive for this day')
+
+    def handle(self, *args, **options):
+        archives = models.ApiRunArchive.objects.filter(restored_at__isnull=True)
+        if options['day']:
+            day = parse_date(options['day'])
+            if day is None:
+                raise CommandError('Day must be YYYY-MM-DD')
+            archives = archives.filter(day=day)
+        elif options['archive_ids']:
+            archives = archives.filter(pk__in=options['archive_ids'])
+        else:
+            raise CommandError('Provide archive ids or --day')
+
+        archives = list(archives.order_by('day', 'id'))
+        if not archives:
+            raise CommandError('No unrestored archives matched')
+        for archive in archives:
+            restored = services.restore_run_archive(archive)
+            self.stdout.write(self.style.SUCCESS(f'Restored {restored} rows from archive {archive.pk} ({archive.day})'))
@@ -0,0 +1,136 @@
+import json
+import sys
+from contextlib import redirect_stdout
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import models, plan_runner, selectors, services
+
+
+class Command(BaseCommand):
+    help = 'Run automated test cases in-process and stream NDJSON results (optionally writing JUnit XML)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, action='append', default=[], help='Project id (repeatable)')
+        parser.add_argument('--module', type=int, action='append', default=[], help='Module id (repeatable)')
+        parser.add_argument('--scenario', type=int, action='append', default=[], help='Scenario id (repeatable)')
+        parser.add_argument('--testcase', type=int, action='append', default=[], help='Test case id (repeatable)')
+        parser.add_argument('--environment', help='Environment id or name')
+        parser.add_argument('--overrides', help='JSON object of variable overrides')
+        parser.add_argument('--workers', type=int, default=None, help='Concurrent upstream calls (default API_BATCH_MAX_WORKERS)')
+        parser.add_argument('--user', help='Username recorded as the run trigger')
+        parser.add_argument('--triggered-in', default='CLI', help='Label stored on the automation report')
+        parser.add_argument('--deadline', type=float, help='Stop after this many seconds; unfinished cases are blocked')
+        parser.add_argument('--ndjson', default='-', help="NDJSON output file ('-' for stdout)")
+        parser.add_argument('--junit', help='Write a JUnit XML report to this file')
+        parser.add_argument(
+            '--shards', type=int, default=0,
+            help='Dispatch the plan to celery workers in this many shards and exit (NDJSON dispatch record only)',
+        )
+
+    def handle(self, *args, **options):
+        if not any(options[key] for key in ('project', 'module', 'scenario', 'testcase')):
+            raise CommandError('Select test cases with --project, --module, --scenario or --testcase')
+        test_cases = list(selectors.automated_test_case_list(
+            project_ids=options['project'],
+            module_ids=options['module'],
+            scenario_ids=options['scenario'],
+            testcase_ids=options['testcase'],
+        ))
+        if not test_cases:
+            raise CommandError('No automated test cases with a related request match the selection')
+
+        environment = self._environment(options['environment'])
+        overrides = self._overrides(options['overrides'])
+        user = None
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"User {options['user']!r} not found")
+        try:
+            deadline_at = services.run_deadline(options['deadline'])
+        except ValueError as exc:
+            raise CommandError(f'--deadline: {exc}') from exc
+
+        if options['shards'] > 1:
+            if options['junit']:
+                raise CommandError('--junit is not available with --shards; shards report asynchronously')
+            report, shards = services.dispatch_sharded_batch(
+                test_cases=test_cases,
+                shard_count=options['shards'],
+                environment=environment,
+                overrides=overrides,
+                user=user,
+                triggered_in=options['triggered_in'],
+                deadline_at=deadline_at,
+            )
+            self.stdout.write(json.dumps({
+                'type': 'dispatched',
+                'automation_report_id': report.pk,
+                'shards': shards,
+            }))
+            return
+
+        report = models.AutomationReport.objects.create(triggered_in=options['triggered_in'], triggered_by=user)
+        entries = []
+        stream = self.stdout if options['ndjson'] == '-' else open(options['ndjson'], 'w', encoding='utf-8')
+        try:
+            def emit(record):
+                stream.write(json.dumps(record, default=str) + '\n')
+                stream.flush()
+
+            def on_result(test_case, result):
+                entries.append((test_case, result))
+                emit(plan_runner.result_record(result.run, test_case, result))
+
+            # Stray prints from the code under test go to stderr so stdout stays valid NDJSON.
+            with redirect_stdout(sys.stderr):
+                run = services.run_test_case_batch(
+                    test_cases=test_cases,
+                    environment=environment,
+                    overrides=overrides,
+                    user=user,
+                    automation_report=report,
+                    max_workers=options['workers'],
+                    on_result=on_result,
+                    deadline_at=deadline_at,
+                )
+            report.refresh_from_db()
+            summary = plan_runner.summary_record(run, report, entries)
+            emit(summary)
+        finally:
+            if stream is not self.stdout:
+                stream.close()
+
+        if options['junit']:
+            with open(options['junit'], 'wb') as handle:
+                handle.write(plan_runner.junit_xml(run, entries))
+            self.stderr.write(f"Wrote JUnit report to {options['junit']}")
+        if summary['failed'] or summary['errors']:
+            raise CommandError(
+                f"{summary['failed'] + summary['errors']} of {summary['total']} test cases did not pass (run {run.pk})"
+            )
+
+    def _environment(self, value):
+        if value in (None, ''):
+            return None
+        environment = None
+        if str(value).isdigit():
+            environment = models.ApiEnvironment.objects.filter(pk=int(value)).first()
+        if environment is None:
+            environment = models.ApiEnvironment.objects.filter(name__iexact=str(value)).first()
+        if environment is None:
+            raise CommandError(f'Environment {value!r} not found')
+        return environment
+
+    def _overrides(self, value):
+        if not value:
+            return {}
+        try:
+            overrides = json.loads(value)
+        except ValueError as exc:
+            raise CommandError(f'--overrides is not valid JSON: {exc}') from exc
+        if not isinstance(overrides, dict):
+            raise CommandError('--overrides must be a JSON object')
+        return overrides
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0054_auto_20260226_0411'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiDataset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=150)),
+                ('source_format', models.CharField(choices=[('csv', 'CSV'), ('json', 'JSON')], default='json', max_length=10)),
+                ('rows', models.JSONField(blank=True, default=list)),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='datasets', to='core.apirequest')),
+                ('test_case', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='datasets', to='core.testcase')),
+            ],
+            options={
+                'ordering': ['name', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0055_api_dataset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiLatencySketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField(db_index=True)),
+                ('buckets', models.JSONField(blank=True, default=dict)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('min_ms', models.FloatField(blank=True, null=True)),
+                ('max_ms', models.FloatField(blank=True, null=True)),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latency_sketches', to='core.apirequest')),
+            ],
+            options={
+                'ordering': ['request', 'day'],
+                'unique_together': {('request', 'day')},
+            },
+        ),
+    ]
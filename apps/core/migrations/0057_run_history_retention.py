@@ -0,0 +1,52 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:45
+
+import apps.core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0056_api_latency_sketch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiRunArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField(db_index=True)),
+                ('file', models.FileField(max_length=500, upload_to=apps.core.models.run_archive_upload_path)),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('result_count', models.PositiveIntegerField(default=0)),
+                ('report_count', models.PositiveIntegerField(default=0)),
+                ('restored_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-day', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ApiRunDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField(unique=True)),
+                ('runs_total', models.PositiveIntegerField(default=0)),
+                ('runs_passed', models.PositiveIntegerField(default=0)),
+                ('runs_failed', models.PositiveIntegerField(default=0)),
+                ('results_total', models.PositiveIntegerField(default=0)),
+                ('results_passed', models.PositiveIntegerField(default=0)),
+                ('results_failed', models.PositiveIntegerField(default=0)),
+                ('results_error', models.PositiveIntegerField(default=0)),
+                ('response_time_ms_total', models.FloatField(default=0)),
+                ('response_time_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day'],
+            },
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:47
+
+import collections
+import itertools
+import operator
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+PAYLOAD_FIELDS = (
+    'response_status',
+    'response_headers',
+    'response_body',
+    'response_time_ms',
+    'assertions_passed',
+    'assertions_failed',
+    'error',
+)
+
+
+BATCH_SIZE = 500
+
+
+def _grouped_by_run(queryset):
+    rows = queryset.order_by('run_id', 'id').iterator(chunk_size=BATCH_SIZE)
+    return itertools.groupby(rows, key=operator.attrgetter('run_id'))
+
+
+def link_report_results(apps, schema_editor):
+    """Point each report row at its mirrored ApiRunResult, creating one when none matches.
+
+    Reports and results are each streamed once in run order. Within a run, reports are
+    paired on (request, order) with results in id order, so the work stays linear in the
+    size of both tables.
+    """
+    ApiRunResult = apps.get_model('core', 'ApiRunResult')
+    ApiRunResultReport = apps.get_model('core', 'ApiRunResultReport')
+
+    results = _grouped_by_run(ApiRunResult.objects.only('id', 'run_id', 'request_id', 'order'))
+    results_run, run_results = next(results, (None, ()))
+    linked = []
+    for run_id, reports in _grouped_by_run(ApiRunResultReport.objects.all()):
+        while results_run is not None and results_run < run_id:
+            results_run, run_results = next(results, (None, ()))
+        available = collections.defaultdict(collections.deque)
+        if results_run == run_id:
+            for result in run_results:
+                available[(result.request_id, result.order)].append(result.pk)
+
+        for report in reports:
+            candidates = available.get((report.request_id, report.order))
+            if candidates:
+                report.result_id = candidates.popleft()
+            else:
+                report.result_id = ApiRunResult.objects.create(
+                    run_id=report.run_id,
+                    request_id=report.request_id,
+                    order=report.order,
+                    status=report.status,
+                    **{field: getattr(report, field) for field in PAYLOAD_FIELDS},
+                ).pk
+            linked.append(report)
+
+        if len(linked) >= BATCH_SIZE:
+            ApiRunResultReport.objects.bulk_update(linked, ['result'])
+            linked = []
+    if linked:
+        ApiRunResultReport.objects.bulk_update(linked, ['result'])
+
+
+def copy_results_back(apps, schema_editor):
+    ApiRunResultReport = apps.get_model('core', 'ApiRunResultReport')
+    reports = ApiRunResultReport.objects.select_related('result').exclude(result__isnull=True)
+    batch = []
+    for report in reports.iterator(chunk_size=BATCH_SIZE):
+        for field in PAYLOAD_FIELDS:
+            setattr(report, field, getattr(report.result, field))
+        batch.append(report)
+        if len(batch) >= BATCH_SIZE:
+            ApiRunResultReport.objects.bulk_update(batch, list(PAYLOAD_FIELDS))
+            batch = []
+    if batch:
+        ApiRunResultReport.objects.bulk_update(batch, list(PAYLOAD_FIELDS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0057_run_history_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirunresultreport',
+            name='result',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='report', to='core.apirunresult'),
+        ),
+        migrations.RunPython(link_report_results, copy_results_back),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='assertions_failed',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='assertions_passed',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='error',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='response_body',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='response_headers',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='response_status',
+        ),
+        migrations.RemoveField(
+            model_name='apirunresultreport',
+            name='response_time_ms',
+        ),
+    ]
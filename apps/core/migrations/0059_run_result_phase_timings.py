@@ -0,0 +1,18 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0058_run_result_report_link'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirunresult',
+            name='phase_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.18 on 2026-10-19 09:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0059_run_result_phase_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apienvironment',
+            name='replay_match_keys',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='apienvironment',
+            name='replay_mode',
+            field=models.CharField(choices=[('live', 'Live'), ('record', 'Record'), ('replay', 'Replay')], default='live', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='ApiRecording',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('method', models.CharField(max_length=10)),
+                ('url_template', models.CharField(max_length=500)),
+                ('match_key', models.CharField(blank=True, max_length=64)),
+                ('response_status', models.IntegerField()),
+                ('response_headers', models.JSONField(blank=True, default=dict)),
+                ('response_body', models.TextField(blank=True)),
+                ('response_time_ms', models.FloatField(blank=True, null=True)),
+                ('environment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recordings', to='core.apienvironment')),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recordings', to='core.apirequest')),
+            ],
+            options={
+                'ordering': ['environment', 'method', 'url_template', '-updated_at'],
+                'unique_together': {('environment', 'method', 'url_template', 'match_key')},
+            },
+        ),
+    ]
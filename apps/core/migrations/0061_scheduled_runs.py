@@ -0,0 +1,42 @@
+# Generated by Django 3.2.18 on 2026-10-19 10:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('django_celery_beat', '0016_alter_crontabschedule_timezone'),
+        ('core', '0060_api_recordings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=180, unique=True)),
+                ('cron', models.CharField(default='0 2 * * *', help_text='minute hour day-of-month month day-of-week', max_length=120)),
+                ('selection', models.JSONField(blank=True, default=dict)),
+                ('overrides', models.JSONField(blank=True, default=dict)),
+                ('is_active', models.BooleanField(default=True)),
+                ('running_since', models.DateTimeField(blank=True, null=True)),
+                ('rerun_requested', models.BooleanField(default=False)),
+                ('coalesced_count', models.PositiveIntegerField(default=0)),
+                ('last_triggered_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scheduled_runs', to=settings.AUTH_USER_MODEL)),
+                ('environment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scheduled_runs', to='core.apienvironment')),
+                ('last_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.apirun')),
+                ('periodic_task', models.OneToOneField(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scheduled_run', to='django_celery_beat.periodictask')),
+            ],
+            options={
+                'ordering': ['name', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.18 on 2026-10-19 10:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0061_scheduled_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apirun',
+            name='cancel_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='apirun',
+            name='deadline_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='scheduledrun',
+            name='deadline_seconds',
+            field=models.PositiveIntegerField(blank=True, help_text='Stop each run after this many seconds; remaining cases are blocked.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='apirun',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('passed', 'Passed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.18 on 2026-10-19 10:24
+
+import json
+import re
+
+from django.db import migrations, models
+
+VARIABLE_PATTERN = re.compile(r"{{\s*([\w\.-]+)\s*}}")
+
+
+def index_variable_keys(apps, schema_editor):
+    """Fill the key indexes for rows saved before they existed."""
+    ApiEnvironment = apps.get_model('core', 'ApiEnvironment')
+    ApiRequest = apps.get_model('core', 'ApiRequest')
+
+    for environment in ApiEnvironment.objects.iterator():
+        variables = environment.variables
+        environment.variable_keys = sorted(variables) if isinstance(variables, dict) else []
+        environment.save(update_fields=['variable_keys'])
+
+    for api_request in ApiRequest.objects.exclude(body_transforms={}).iterator():
+        text = json.dumps(api_request.body_transforms or {}, default=str)
+        api_request.transform_variable_keys = sorted(set(VARIABLE_PATTERN.findall(text)))
+        api_request.save(update_fields=['transform_variable_keys'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0062_run_deadlines_and_cancellation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apienvironment',
+            name='variable_keys',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='apirequest',
+            name='transform_variable_keys',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(index_variable_keys, migrations.RunPython.noop),
+    ]
@@ -2,13 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import re
 import uuid
-from typing import Any
+from typing import Any, List
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
 
+TEMPLATE_VARIABLE_PATTERN = re.compile(r"{{\s*([\w\.-]+)\s*}}")
+
+
+def template_variable_keys(value: Any) -> List[str]:
+    """Sorted ``{{var}}`` names referenced anywhere inside a JSON-serializable ``value``."""
+    if not value:
+        return []
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return sorted(set(TEMPLATE_VARIABLE_PATTERN.findall(text)))
+
+
+def _with_update_field(kwargs: dict, trigger: str, field: str) -> dict:
+    """Add ``field`` to a partial save that writes ``trigger``, which ``field`` is derived from."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and trigger in update_fields and field not in update_fields:
+        kwargs["update_fields"] = [*update_fields, field]
+    return kwargs
+
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -21,10 +41,26 @@ class TimeStampedModel(models.Model):
 class ApiEnvironment(TimeStampedModel):
     """Stores reusable variables and headers for request execution."""
 
+    class ReplayModes(models.TextChoices):
+        LIVE = "live", "Live"
+        RECORD = "record", "Record"
+        REPLAY = "replay", "Replay"
+
     name = models.CharField(max_length=150, unique=True)
     description = models.TextField(blank=True)
     variables = models.JSONField(default=dict, blank=True)
     default_headers = models.JSONField(default=dict, blank=True)
+    # "record" stores upstream responses as ApiRecording rows; "replay" answers from them
+    # instead of calling the upstream.
+    replay_mode = models.CharField(max_length=10, choices=ReplayModes.choices, default=ReplayModes.LIVE)
+    # Dot paths into the JSON body that, with method and URL template, identify a recording.
+    replay_match_keys = models.JSONField(default=list, blank=True)
+    # Sorted keys of ``variables``, kept in step on save for environment auto-selection.
+    variable_keys = models.JSONField(default=list, blank=True, editable=False)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.variable_keys = sorted(self.variables) if isinstance(self.variables, dict) else []
+        super().save(*args, **_with_update_field(kwargs, "variables", "variable_keys"))
 
     def __str__(self) -> str:  # pragma: no cover - display helper
         return self.name
@@ -123,6 +159,8 @@ class ApiRequest(TimeStampedModel):
     body_raw = models.TextField(blank=True)
     body_raw_type = models.CharField(max_length=20, default="text")
     body_transforms = models.JSONField(default=dict, blank=True)
+    # ``{{var}}`` names referenced by ``body_transforms``, kept in step on save.
+    transform_variable_keys = models.JSONField(default=list, blank=True, editable=False)
 
     auth_type = models.CharField(max_length=10, choices=AuthTypes.choices, default=AuthTypes.NONE)
     auth_basic = models.JSONField(default=dict, blank=True)
@@ -134,6 +172,10 @@ class ApiRequest(TimeStampedModel):
     class Meta:
         ordering = ["collection", "order", "id"]
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.transform_variable_keys = template_variable_keys(self.body_transforms)
+        super().save(*args, **_with_update_field(kwargs, "body_transforms", "transform_variable_keys"))
+
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.collection.name}: {self.name}"
 
@@ -158,6 +200,74 @@ class ApiAssertion(TimeStampedModel):
         return f"{self.request.name}: {self.type}"
 
 
+class ApiRecording(TimeStampedModel):
+    """Upstream response captured for replay, keyed by method, URL template and body keys."""
+
+    environment = models.ForeignKey(ApiEnvironment, on_delete=models.CASCADE, related_name="recordings")
+    request = models.ForeignKey(ApiRequest, on_delete=models.SET_NULL, null=True, blank=True, related_name="recordings")
+    method = models.CharField(max_length=10)
+    url_template = models.CharField(max_length=500)
+    # Hash of the configured body key values; blank matches any body.
+    match_key = models.CharField(max_length=64, blank=True)
+    response_status = models.IntegerField()
+    response_headers = models.JSONField(default=dict, blank=True)
+    response_body = models.TextField(blank=True)
+    response_time_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["environment", "method", "url_template", "-updated_at"]
+        unique_together = ("environment", "method", "url_template", "match_key")
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.method} {self.url_template} [{self.match_key or '*'}]"
+
+
+class ApiDataset(TimeStampedModel):
+    """Rows of variables used to execute a request once per row."""
+
+    class Formats(models.TextChoices):
+        CSV = "csv", "CSV"
+        JSON = "json", "JSON"
+
+    name = models.CharField(max_length=150)
+    request = models.ForeignKey(ApiRequest, on_delete=models.CASCADE, null=True, blank=True, related_name="datasets")
+    test_case = models.ForeignKey("TestCase", on_delete=models.CASCADE, null=True, blank=True, related_name="datasets")
+    source_format = models.CharField(max_length=10, choices=Formats.choices, default=Formats.JSON)
+    rows = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["name", "id"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.name
+
+    def resolve_request(self) -> ApiRequest | None:
+        if self.request_id:
+            return self.request
+        if self.test_case_id:
+            return self.test_case.related_api_request
+        return None
+
+
+class ApiLatencySketch(TimeStampedModel):
+    """Mergeable log-bucketed latency histogram for one request on one day."""
+
+    request = models.ForeignKey(ApiRequest, on_delete=models.CASCADE, related_name="latency_sketches")
+    day = models.DateField(db_index=True)
+    buckets = models.JSONField(default=dict, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    min_ms = models.FloatField(null=True, blank=True)
+    max_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["request", "day"]
+        unique_together = ("request", "day")
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Latency {self.request_id} @ {self.day} ({self.count})"
+
+
 class ApiRun(TimeStampedModel):
     """Represents a collection execution."""
 
@@ -166,6 +276,7 @@ class ApiRun(TimeStampedModel):
         RUNNING = "running", "Running"
         PASSED = "passed", "Passed"
         FAILED = "failed", "Failed"
+        CANCELLED = "cancelled", "Cancelled"
 
     collection = models.ForeignKey(
         ApiCollection,
@@ -180,6 +291,9 @@ class ApiRun(TimeStampedModel):
     summary = models.JSONField(default=dict, blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     finished_at = models.DateTimeField(null=True, blank=True)
+    # The executing worker polls these; see apps.core.run_control.
+    deadline_at = models.DateTimeField(null=True, blank=True)
+    cancel_requested_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self) -> str:  # pragma: no cover
         collection_name = self.collection.name if self.collection else "Adhoc"
@@ -205,6 +319,8 @@ class ApiRunResult(TimeStampedModel):
     assertions_passed = models.JSONField(default=list, blank=True)
     assertions_failed = models.JSONField(default=list, blank=True)
     error = models.TextField(blank=True)
+    # Milliseconds spent per execution phase (see services.RUN_PHASES)
+    phase_timings = models.JSONField(default=dict, blank=True)
 
     class Meta:
         ordering = ["run", "order", "id"]
@@ -214,7 +330,11 @@ class ApiRunResult(TimeStampedModel):
 
 
 class ApiRunResultReport(TimeStampedModel):
-    """Report table mirroring ApiRunResult with an extra testcase id field."""
+    """Links an ApiRunResult to the test case and automation report it belongs to.
+
+    The response payload is stored once on ``result``; the payload attributes
+    below read through to it so existing serializers and exports keep working.
+    """
 
     class Status(models.TextChoices):
         PASSED = "passed", "Passed"
@@ -223,15 +343,15 @@ class ApiRunResultReport(TimeStampedModel):
 
     run = models.ForeignKey(ApiRun, on_delete=models.CASCADE, related_name="result_reports")
     request = models.ForeignKey(ApiRequest, on_delete=models.SET_NULL, null=True, related_name="result_reports")
+    result = models.OneToOneField(
+        ApiRunResult,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="report",
+    )
     order = models.PositiveIntegerField(default=0)
     status = models.CharField(max_length=10, choices=Status.choices)
-    response_status = models.IntegerField(null=True, blank=True)
-    response_headers = models.JSONField(default=dict, blank=True)
-    response_body = models.TextField(blank=True)
-    response_time_ms = models.FloatField(null=True, blank=True)
-    assertions_passed = models.JSONField(default=list, blank=True)
-    assertions_failed = models.JSONField(default=list, blank=True)
-    error = models.TextField(blank=True)
     # Extra field: link to TestCase primary key
     testcase = models.ForeignKey(
         "TestCase",
@@ -254,6 +374,85 @@ class ApiRunResultReport(TimeStampedModel):
     def __str__(self) -> str:  # pragma: no cover
         return f"ResultReport {self.pk} ({self.status})"
 
+    def _result_value(self, name: str, default: Any = None) -> Any:
+        result = self.result
+        return getattr(result, name) if result is not None else default
+
+    @property
+    def response_status(self) -> int | None:
+        return self._result_value("response_status")
+
+    @property
+    def response_headers(self) -> dict:
+        return self._result_value("response_headers", {})
+
+    @property
+    def response_body(self) -> str:
+        return self._result_value("response_body", "")
+
+    @property
+    def response_time_ms(self) -> float | None:
+        return self._result_value("response_time_ms")
+
+    @property
+    def phase_timings(self) -> dict:
+        return self._result_value("phase_timings", {})
+
+    @property
+    def assertions_passed(self) -> list:
+        return self._result_value("assertions_passed", [])
+
+    @property
+    def assertions_failed(self) -> list:
+        return self._result_value("assertions_failed", [])
+
+    @property
+    def error(self) -> str:
+        return self._result_value("error", "")
+
+
+def run_archive_upload_path(instance, filename):
+    day = instance.day
+    return f"archives/runs/{day:%Y/%m/%d}/{filename}"
+
+
+class ApiRunArchive(TimeStampedModel):
+    """Compressed export of runs (with results and report rows) removed by retention."""
+
+    day = models.DateField(db_index=True)
+    file = models.FileField(upload_to=run_archive_upload_path, max_length=500)
+    run_count = models.PositiveIntegerField(default=0)
+    result_count = models.PositiveIntegerField(default=0)
+    report_count = models.PositiveIntegerField(default=0)
+    restored_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-day", "-id"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Archive {self.day} ({self.run_count} runs)"
+
+
+class ApiRunDailyRollup(TimeStampedModel):
+    """Per-day totals kept for runs after their detail rows are archived."""
+
+    day = models.DateField(unique=True)
+    runs_total = models.PositiveIntegerField(default=0)
+    runs_passed = models.PositiveIntegerField(default=0)
+    runs_failed = models.PositiveIntegerField(default=0)
+    results_total = models.PositiveIntegerField(default=0)
+    results_passed = models.PositiveIntegerField(default=0)
+    results_failed = models.PositiveIntegerField(default=0)
+    results_error = models.PositiveIntegerField(default=0)
+    response_time_ms_total = models.FloatField(default=0)
+    response_time_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Rollup {self.day} ({self.runs_total} runs)"
+
 
 class AutomationReport(TimeStampedModel):
     """High level automation report grouping multiple API run reports."""
@@ -845,6 +1044,60 @@ class LoadTestRun(TimeStampedModel):
         return f"{label} ({self.status})"
 
 
+class ScheduledRun(TimeStampedModel):
+    """A test case selection run against an environment on a cron schedule (celery beat).
+
+    ``selection`` takes the same keys as load tests: project_ids, module_ids,
+    scenario_ids and testcase_ids; every non-empty list narrows the selection.
+    """
+
+    name = models.CharField(max_length=180, unique=True)
+    cron = models.CharField(
+        max_length=120,
+        default="0 2 * * *",
+        help_text="minute hour day-of-month month day-of-week",
+    )
+    selection = models.JSONField(default=dict, blank=True)
+    environment = models.ForeignKey(
+        ApiEnvironment, on_delete=models.SET_NULL, null=True, blank=True, related_name="scheduled_runs"
+    )
+    overrides = models.JSONField(default=dict, blank=True)
+    is_active = models.BooleanField(default=True)
+    deadline_seconds = models.PositiveIntegerField(
+        null=True, blank=True, help_text="Stop each run after this many seconds; remaining cases are blocked."
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="scheduled_runs",
+    )
+    periodic_task = models.OneToOneField(
+        "django_celery_beat.PeriodicTask",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="scheduled_run",
+    )
+
+    # Execution state: a trigger that arrives while the schedule is running (or while the
+    # global cap is reached) only sets ``rerun_requested``; one follow-up run picks it up.
+    running_since = models.DateTimeField(null=True, blank=True)
+    rerun_requested = models.BooleanField(default=False)
+    coalesced_count = models.PositiveIntegerField(default=0)
+    last_triggered_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_run = models.ForeignKey(ApiRun, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+
+    class Meta:
+        ordering = ["name", "id"]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name} ({self.cron})"
+
+
 class UITestingRecord(TimeStampedModel):
     """UI Testing record with flowchart steps and component tracking."""
 
@@ -0,0 +1,104 @@
+"""Streaming ``multipart/form-data`` bodies for upstream requests.
+
+``requests`` builds ``files=`` bodies fully in memory. ``MultipartStream`` instead
+reads each file in chunks as the connection consumes the body, so an upload that
+Django spooled to a temporary file is forwarded without ever being loaded whole.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from typing import IO, Any, AsyncIterator, Iterator, List, Mapping, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+
+# (filename, file object, content type, size in bytes)
+FilePart = Tuple[str, IO[bytes], str, int]
+_Part = Union[bytes, Tuple[IO[bytes], int]]
+
+
+def _quote(value: str) -> str:
+    """Escape a Content-Disposition parameter the way browsers (and urllib3) do."""
+    value = value.replace("\\", "\\\\").replace('"', "%22")
+    return "".join(char if char >= " " or char == "\t" else f"%{ord(char):02X}" for char in value)
+
+
+class MultipartStream:
+    """A readable, sized ``multipart/form-data`` body built from text fields and files.
+
+    ``len()`` is the exact body size, so ``requests`` sends ``Content-Length`` rather
+    than chunked encoding. Iterate (sync or async) or ``read()`` to consume it, and
+    ``reset()`` before sending it again.
+    """
+
+    def __init__(self, fields: Mapping[str, Any] | None = None, files: Mapping[str, FilePart] | None = None) -> None:
+        self.boundary = uuid.uuid4().hex
+        self._parts: List[_Part] = []
+        for name, value in (fields or {}).items():
+            self._parts.append(self._part_header(name) + str(value).encode("utf-8") + b"\r\n")
+        for name, (filename, fileobj, content_type, size) in (files or {}).items():
+            header = self._part_header(name, filename=filename, content_type=content_type)
+            self._parts.extend([header, (fileobj, int(size)), b"\r\n"])
+        self._parts.append(f"--{self.boundary}--\r\n".encode("ascii"))
+        self._length = sum(len(part) if isinstance(part, bytes) else part[1] for part in self._parts)
+        self.reset()
+
+    def _part_header(self, name: str, *, filename: str | None = None, content_type: str | None = None) -> bytes:
+        disposition = f'form-data; name="{_quote(str(name))}"'
+        if filename is not None:
+            disposition += f'; filename="{_quote(str(filename))}"'
+        lines = [f"--{self.boundary}", f"Content-Disposition: {disposition}"]
+        if content_type:
+            lines.append(f"Content-Type: {content_type}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def reset(self) -> None:
+        """Rewind to the start of the body (e.g. before a retry)."""
+        self._index = 0
+        self._offset = 0
+        for part in self._parts:
+            if not isinstance(part, bytes):
+                part[0].seek(0)
+
+    def read(self, size: int = -1) -> bytes:
+        chunks: List[bytes] = []
+        wanted = self._length if size is None or size < 0 else size
+        while wanted > 0 and self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                chunk = part[self._offset:self._offset + wanted]
+            else:
+                fileobj, part_size = part
+                chunk = fileobj.read(min(wanted, part_size - self._offset)) or b""
+            self._offset += len(chunk)
+            wanted -= len(chunk)
+            chunks.append(chunk)
+            part_size = len(part) if isinstance(part, bytes) else part[1]
+            if self._offset >= part_size or not chunk:
+                self._index += 1
+                self._offset = 0
+        return b"".join(chunks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # File reads block, so they run on the default executor rather than the event loop.
+        loop = asyncio.get_running_loop()
+        while True:
+            chunk = await loop.run_in_executor(None, self.read, CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
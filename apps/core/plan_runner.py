@@ -0,0 +1,102 @@
+"""Headless plan runs behind ``manage.py run_plan``.
+
+Selected test cases run in-process through ``services.run_test_case_batch``; this
+module only turns the results into NDJSON records and a JUnit XML report for CI.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Tuple
+from xml.etree import ElementTree as ET
+
+from . import models
+
+PlanEntry = Tuple[models.TestCase, models.ApiRunResult]
+
+
+def result_record(run: models.ApiRun, test_case: models.TestCase, result: models.ApiRunResult) -> Dict[str, Any]:
+    """One NDJSON line describing a finished test case."""
+    return {
+        "type": "result",
+        "run_id": run.pk,
+        "testcase": test_case.pk,
+        "testcase_id": test_case.testcase_id,
+        "title": test_case.title,
+        "scenario": test_case.scenario_id,
+        "status": result.status,
+        "response_status": result.response_status,
+        "response_time_ms": result.response_time_ms,
+        "assertions_failed": result.assertions_failed or [],
+        "error": result.error or "",
+    }
+
+
+def summary_record(run: models.ApiRun, automation_report: models.AutomationReport | None, entries: List[PlanEntry]) -> Dict[str, Any]:
+    statuses = [result.status for _case, result in entries]
+    return {
+        "type": "summary",
+        "run_id": run.pk,
+        "automation_report_id": getattr(automation_report, "pk", None),
+        "status": run.status,
+        "total": len(statuses),
+        "passed": statuses.count(models.ApiRunResult.Status.PASSED),
+        "failed": statuses.count(models.ApiRunResult.Status.FAILED),
+        "errors": statuses.count(models.ApiRunResult.Status.ERROR),
+        "duration_ms": _duration_ms(run),
+    }
+
+
+def _duration_ms(run: models.ApiRun) -> float | None:
+    if run.started_at and run.finished_at:
+        return round((run.finished_at - run.started_at).total_seconds() * 1000, 3)
+    return None
+
+
+def junit_xml(run: models.ApiRun, entries: List[PlanEntry]) -> bytes:
+    """JUnit XML with one ``testsuite`` per scenario, in the order results arrived."""
+    suites: Dict[Any, List[PlanEntry]] = {}
+    for test_case, result in entries:
+        suites.setdefault(test_case.scenario_id, []).append((test_case, result))
+
+    root = ET.Element("testsuites", name=f"Run {run.pk}")
+    totals = {"tests": 0, "failures": 0, "errors": 0, "time": 0.0}
+    for suite_entries in suites.values():
+        scenario = suite_entries[0][0].scenario
+        suite_name = f"{scenario.project.name} / {scenario.title}"
+        suite = ET.SubElement(root, "testsuite", name=suite_name)
+        counts = {"tests": 0, "failures": 0, "errors": 0, "time": 0.0}
+        for test_case, result in suite_entries:
+            seconds = (result.response_time_ms or 0) / 1000
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname=suite_name,
+                name=" ".join(part for part in (test_case.testcase_id, test_case.title) if part),
+                time=f"{seconds:.3f}",
+            )
+            counts["tests"] += 1
+            counts["time"] += seconds
+            if result.status == models.ApiRunResult.Status.FAILED:
+                counts["failures"] += 1
+                failed = result.assertions_failed or []
+                failure = ET.SubElement(
+                    case, "failure", message=f"{len(failed)} assertion(s) failed", type="AssertionError"
+                )
+                failure.text = json.dumps(failed, indent=2, default=str)
+            elif result.status == models.ApiRunResult.Status.ERROR:
+                counts["errors"] += 1
+                error = ET.SubElement(case, "error", message=(result.error or "Error")[:500], type="ExecutionError")
+                error.text = result.error or ""
+        suite.set("tests", str(counts["tests"]))
+        suite.set("failures", str(counts["failures"]))
+        suite.set("errors", str(counts["errors"]))
+        suite.set("time", f"{counts['time']:.3f}")
+        for key in totals:
+            totals[key] += counts[key]
+
+    root.set("tests", str(totals["tests"]))
+    root.set("failures", str(totals["failures"]))
+    root.set("errors", str(totals["errors"]))
+    root.set("time", f"{totals['time']:.3f}")
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,164 @@
+"""Deadlines and cancellation for collection and test case batch runs.
+
+A ``RunControl`` sends a run's upstream requests through its own ``requests.Session``
+and keeps track of every connection that session opens. A watcher thread wakes at
+the run's ``deadline_at`` and every ``API_RUN_CANCEL_POLL_SECONDS`` to look for
+``cancel_requested_at``; when either fires it shuts those sockets down, so calls that
+are still in flight fail immediately instead of waiting out their timeout. Callers
+stop dispatching new requests once ``stopped`` is set.
+"""
+
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+import weakref
+from typing import Any, Optional
+
+import requests
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+CANCELLED_REASON = "Run cancelled."
+DEADLINE_REASON = "Run deadline exceeded."
+
+
+class RunStopped(requests.RequestException):
+    """An upstream call abandoned because its run was cancelled or ran out of time."""
+
+
+def _tracking_pool(base: type, control: "RunControl") -> type:
+    class TrackingPool(base):  # type: ignore[misc, valid-type]
+        def _get_conn(self, timeout=None):
+            conn = super()._get_conn(timeout)
+            control._track(conn)
+            return conn
+
+    return TrackingPool
+
+
+class _TrackingAdapter(HTTPAdapter):
+    # Relies on urllib3 internals (``PoolManager.pool_classes_by_scheme`` and
+    # ``HTTPConnectionPool._get_conn``); verified against urllib3 1.26.20, which
+    # requirements.txt pins. Re-check both when upgrading urllib3.
+
+    def __init__(self, control: "RunControl", **kwargs: Any) -> None:
+        self._control = control
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _tracking_pool(pool_cls, self._control)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+
+class RunControl:
+    """Stops one ``ApiRun`` at its deadline or when cancellation is requested.
+
+    Use as a context manager around the run's dispatch loop; ``request`` is a drop-in
+    for ``requests.request`` that is safe to call from worker threads.
+    """
+
+    def __init__(self, run: models.ApiRun) -> None:
+        self.run_id = run.pk
+        self.deadline = run.deadline_at
+        self.reason: Optional[str] = None
+        self._lock = threading.Lock()
+        self._connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        self._closed = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.session = requests.Session()
+        adapter = _TrackingAdapter(self)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self) -> "RunControl":
+        self._watcher = threading.Thread(target=self._watch, name=f"run-control-{self.run_id}", daemon=True)
+        self._watcher.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._closed.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        self.session.close()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or ``None`` without one."""
+        if self.deadline is None:
+            return None
+        return (self.deadline - timezone.now()).total_seconds()
+
+    @property
+    def stopped(self) -> Optional[str]:
+        """Why the run must stop, or ``None`` while it may keep dispatching."""
+        if self.reason is None:
+            remaining = self.remaining()
+            if remaining is not None and remaining <= 0:
+                self.stop(DEADLINE_REASON)
+        return self.reason
+
+    def stop(self, reason: str) -> None:
+        """Record ``reason`` and abort every in-flight upstream call of this run."""
+        with self._lock:
+            if self.reason is not None:
+                return
+            self.reason = reason
+            connections = list(self._connections)
+        for conn in connections:
+            sock = getattr(conn, "sock", None)
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def cancel_requested(self) -> bool:
+        return models.ApiRun.objects.filter(pk=self.run_id, cancel_requested_at__isnull=False).exists()
+
+    def request(self, **kwargs: Any) -> requests.Response:
+        """``requests.request`` bounded by the deadline; raises ``RunStopped`` once stopped."""
+        if self.stopped:
+            raise RunStopped(self.reason)
+        remaining = self.remaining()
+        if remaining is not None and isinstance(kwargs.get("timeout"), (int, float)):
+            kwargs["timeout"] = max(0.001, min(float(kwargs["timeout"]), remaining))
+        try:
+            return self.session.request(**kwargs)
+        except requests.RequestException as exc:
+            if self.stopped:
+                raise RunStopped(self.reason) from exc
+            raise
+
+    def _track(self, conn: Any) -> None:
+        with self._lock:
+            self._connections.add(conn)
+
+    def _watch(self) -> None:
+        poll = float(getattr(settings, "API_RUN_CANCEL_POLL_SECONDS", 2) or 2)
+        try:
+            while True:
+                remaining = self.remaining()
+                wait = poll if remaining is None else max(0.0, min(poll, remaining))
+                if self._closed.wait(wait):
+                    return
+                if self.stopped:
+                    return
+                try:
+                    if self.cancel_requested():
+                        self.stop(CANCELLED_REASON)
+                        return
+                except Exception:
+                    logger.warning("run %s: cancellation check failed", self.run_id, exc_info=True)
+        finally:
+            connection.close()
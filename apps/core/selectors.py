@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from django.db.models import Prefetch, QuerySet
+from typing import Iterable
+
+from django.db.models import Avg, BooleanField, Count, Exists, FloatField, Max, OuterRef, Prefetch, QuerySet, Subquery, Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
 
 from . import models
 
@@ -40,6 +44,10 @@ def api_run_list() -> QuerySet[models.ApiRun]:
     )
 
 
+def scheduled_run_list() -> QuerySet[models.ScheduledRun]:
+    return models.ScheduledRun.objects.select_related("environment", "created_by", "last_run").order_by("name", "id")
+
+
 def api_run_get(pk: int) -> models.ApiRun | None:
     return api_run_list().filter(pk=pk).first()
 
@@ -79,3 +87,135 @@ def test_case_list() -> QuerySet[models.TestCase]:
         .select_related("scenario", "scenario__project", "test_case_dependency", "related_api_request")
         .order_by("scenario", "testcase_id", "id")
     )
+
+
+def automated_test_case_list(
+    *,
+    project_ids: Iterable[int] = (),
+    module_ids: Iterable[int] = (),
+    scenario_ids: Iterable[int] = (),
+    testcase_ids: Iterable[int] = (),
+) -> QuerySet[models.TestCase]:
+    """Automated test cases with a related request, narrowed by every non-empty id filter."""
+    queryset = models.TestCase.objects.select_related("scenario", "scenario__project", "related_api_request").filter(
+        scenario__is_automated=True, related_api_request__isnull=False
+    )
+    project_ids, module_ids, scenario_ids, testcase_ids = (
+        list(project_ids), list(module_ids), list(scenario_ids), list(testcase_ids)
+    )
+    if project_ids:
+        queryset = queryset.filter(scenario__project_id__in=project_ids)
+    if module_ids:
+        queryset = queryset.filter(scenario__module_id__in=module_ids)
+    if scenario_ids:
+        queryset = queryset.filter(scenario_id__in=scenario_ids)
+    if testcase_ids:
+        queryset = queryset.filter(pk__in=testcase_ids)
+    return queryset.order_by("scenario_id", "id")
+
+
+def test_case_duration_estimates(*, testcase_ids: Iterable[int], since=None) -> dict[int, float]:
+    """Average recorded response time (ms) per test case, optionally since a datetime."""
+    queryset = models.ApiRunResultReport.objects.filter(
+        testcase_id__in=list(testcase_ids), result__response_time_ms__isnull=False
+    )
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    rows = queryset.values("testcase_id").annotate(average=Avg("result__response_time_ms"))
+    return {row["testcase_id"]: row["average"] for row in rows}
+
+
+def _comment_thread_queryset(
+    *,
+    comment_model,
+    like_model,
+    attachment_model,
+    user=None,
+) -> QuerySet:
+    """Annotate like totals and the viewer's like flag, prefetching reactions/attachments.
+
+    Replies are prefetched with the same annotations so serializing a whole thread
+    costs a fixed number of queries regardless of comment count.
+    """
+
+    def _annotate(queryset: QuerySet) -> QuerySet:
+        if user is not None and getattr(user, "is_authenticated", False):
+            liked = Exists(like_model.objects.filter(comment_id=OuterRef("pk"), user_id=user.pk))
+        else:
+            liked = Value(False, output_field=BooleanField())
+        attachments_qs = attachment_model.objects.select_related("uploaded_by")
+        return (
+            queryset.select_related("user")
+            .annotate(likes_count=Count("likes", distinct=True), user_has_liked=liked)
+            .prefetch_related("reactions", Prefetch("attachments", queryset=attachments_qs))
+        )
+
+    replies_qs = _annotate(comment_model.objects.all())
+    return _annotate(comment_model.objects.all()).prefetch_related(Prefetch("replies", queryset=replies_qs))
+
+
+def scenario_comment_list(*, user=None) -> QuerySet[models.ScenarioComment]:
+    return _comment_thread_queryset(
+        comment_model=models.ScenarioComment,
+        like_model=models.CommentLike,
+        attachment_model=models.ScenarioCommentAttachment,
+        user=user,
+    ).select_related("scenario")
+
+
+def test_case_comment_list(*, user=None) -> QuerySet[models.TestCaseComment]:
+    return _comment_thread_queryset(
+        comment_model=models.TestCaseComment,
+        like_model=models.TestCaseCommentLike,
+        attachment_model=models.TestCaseCommentAttachment,
+        user=user,
+    ).select_related("test_case")
+
+
+def api_run_result_phase_summary(
+    *, phases, request_id: int | None = None, run_id: int | None = None, since=None
+) -> dict[str, dict]:
+    """Count, average and max milliseconds per execution phase across matching results."""
+    queryset = models.ApiRunResult.objects.exclude(phase_timings={})
+    if request_id is not None:
+        queryset = queryset.filter(request_id=request_id)
+    if run_id is not None:
+        queryset = queryset.filter(run_id=run_id)
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+
+    aggregates = {}
+    for phase in phases:
+        value = Cast(KeyTextTransform(phase, "phase_timings"), FloatField())
+        aggregates[f"{phase}__count"] = Count(KeyTextTransform(phase, "phase_timings"))
+        aggregates[f"{phase}__avg"] = Avg(value)
+        aggregates[f"{phase}__max"] = Max(value)
+    totals = queryset.aggregate(**aggregates)
+    return {
+        phase: {
+            "count": totals[f"{phase}__count"],
+            "avg_ms": round(totals[f"{phase}__avg"], 3) if totals[f"{phase}__avg"] is not None else None,
+            "max_ms": totals[f"{phase}__max"],
+        }
+        for phase in phases
+    }
+
+
+def api_latency_sketch_list(*, request_id: int, start=None, end=None) -> QuerySet[models.ApiLatencySketch]:
+    queryset = models.ApiLatencySketch.objects.filter(request_id=request_id)
+    if start is not None:
+        queryset = queryset.filter(day__gte=start)
+    if end is not None:
+        queryset = queryset.filter(day__lte=end)
+    return queryset.order_by("day")
+
+
+def latest_request_result_list(*, collection_id: int | None = None) -> QuerySet[models.ApiRunResult]:
+    """The most recent result with a response for each request (portable, no ``DISTINCT ON``)."""
+    responded = models.ApiRunResult.objects.filter(request__isnull=False, response_status__isnull=False)
+    latest = responded.filter(request_id=OuterRef("pk")).order_by("-created_at", "-id").values("id")[:1]
+    requests = models.ApiRequest.objects.annotate(latest_result_id=Subquery(latest))
+    if collection_id is not None:
+        requests = requests.filter(collection_id=collection_id)
+    latest_ids = requests.filter(latest_result_id__isnull=False).values("latest_result_id")
+    return models.ApiRunResult.objects.filter(pk__in=latest_ids).select_related("request").order_by("request_id")
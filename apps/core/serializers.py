@@ -9,7 +9,7 @@ from django.db.models import Max
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from . import models
+from . import models, services
 
 
 class ApiEnvironmentSerializer(serializers.ModelSerializer):
@@ -21,11 +21,96 @@ class ApiEnvironmentSerializer(serializers.ModelSerializer):
             "description",
             "variables",
             "default_headers",
+            "replay_mode",
+            "replay_match_keys",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
 
+    def validate_replay_match_keys(self, value):
+        if not isinstance(value, list) or not all(isinstance(key, str) and key.strip() for key in value):
+            raise serializers.ValidationError("Match keys must be a list of dot paths.")
+        return [key.strip() for key in value]
+
+
+class ScheduledRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ScheduledRun
+        fields = [
+            "id",
+            "name",
+            "cron",
+            "selection",
+            "environment",
+            "overrides",
+            "is_active",
+            "deadline_seconds",
+            "created_by",
+            "running_since",
+            "rerun_requested",
+            "coalesced_count",
+            "last_triggered_at",
+            "last_finished_at",
+            "last_run",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "id",
+            "created_by",
+            "running_since",
+            "rerun_requested",
+            "coalesced_count",
+            "last_triggered_at",
+            "last_finished_at",
+            "last_run",
+            "created_at",
+            "updated_at",
+        ]
+
+    def validate_cron(self, value):
+        try:
+            services.parse_cron_expression(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc)) from exc
+        return " ".join(value.split())
+
+    def validate_selection(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Selection must be an object.")
+        filters = services.plan_selection_filters(value)
+        if not filters:
+            raise serializers.ValidationError(
+                "Select at least one of project_ids, module_ids, scenario_ids or testcase_ids."
+            )
+        return filters
+
+    def validate_overrides(self, value):
+        if not isinstance(value, dict):
+            raise serializers.ValidationError("Overrides must be an object.")
+        return value
+
+
+class ApiRecordingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ApiRecording
+        fields = [
+            "id",
+            "environment",
+            "request",
+            "method",
+            "url_template",
+            "match_key",
+            "response_status",
+            "response_headers",
+            "response_body",
+            "response_time_ms",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
 
 class ApiAssertionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -165,6 +250,13 @@ class ApiRequestSerializer(serializers.ModelSerializer):
             self._sync_assertions(instance, assertions_data)
         return instance
 
+    def validate_body_transforms(self, value: Any) -> Any:
+        try:
+            services.compile_body_transforms(value)
+        except ValueError as exc:
+            raise ValidationError(str(exc)) from exc
+        return value
+
     def _sync_assertions(self, api_request: models.ApiRequest, assertions_data: Iterable[dict[str, Any]]) -> None:
         keep_ids: list[int] = []
         for assertion_data in assertions_data:
@@ -183,6 +275,50 @@ class ApiRequestSerializer(serializers.ModelSerializer):
         api_request.assertions.exclude(id__in=keep_ids).delete()
 
 
+class ApiDatasetSerializer(serializers.ModelSerializer):
+    content = serializers.CharField(write_only=True, required=False, allow_blank=True)
+    row_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = models.ApiDataset
+        fields = [
+            "id",
+            "name",
+            "request",
+            "test_case",
+            "source_format",
+            "rows",
+            "content",
+            "row_count",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "row_count", "created_at", "updated_at"]
+
+    def get_row_count(self, obj: models.ApiDataset) -> int:
+        return len(obj.rows or [])
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        content = attrs.pop("content", None)
+        if content is not None:
+            source_format = attrs.get("source_format") or getattr(self.instance, "source_format", models.ApiDataset.Formats.JSON)
+            try:
+                attrs["rows"] = services.parse_dataset_rows(content, source_format)
+            except ValueError as exc:
+                raise ValidationError({"content": str(exc)}) from exc
+        rows = attrs.get("rows")
+        if rows is not None and (not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows)):
+            raise ValidationError({"rows": "Rows must be a list of objects."})
+
+        api_request = attrs.get("request", getattr(self.instance, "request", None))
+        test_case = attrs.get("test_case", getattr(self.instance, "test_case", None))
+        if api_request is None and test_case is None:
+            raise ValidationError({"request": "Link the dataset to an API request or a test case."})
+        if api_request is None and test_case.related_api_request_id is None:
+            raise ValidationError({"test_case": "Test case has no related API request."})
+        return attrs
+
+
 class ApiCollectionSerializer(serializers.ModelSerializer):
     requests = ApiRequestSerializer(many=True)
     environments = ApiEnvironmentSerializer(many=True, read_only=True)
@@ -289,6 +425,7 @@ class ApiRunResultSerializer(serializers.ModelSerializer):
             "response_headers",
             "response_body",
             "response_time_ms",
+            "phase_timings",
             "assertions_passed",
             "assertions_failed",
             "error",
@@ -307,6 +444,7 @@ class ApiRunResultSerializer(serializers.ModelSerializer):
             "response_headers",
             "response_body",
             "response_time_ms",
+            "phase_timings",
             "assertions_passed",
             "assertions_failed",
             "error",
@@ -340,6 +478,8 @@ class ApiRunSerializer(serializers.ModelSerializer):
             "summary",
             "started_at",
             "finished_at",
+            "deadline_at",
+            "cancel_requested_at",
             "results",
             "created_at",
             "updated_at",
@@ -386,6 +526,7 @@ class ApiRunResultReportSerializer(serializers.ModelSerializer):
             "response_headers",
             "response_body",
             "response_time_ms",
+            "phase_timings",
             "assertions_passed",
             "assertions_failed",
             "error",
@@ -909,15 +1050,22 @@ class ScenarioCommentSerializer(serializers.ModelSerializer):
 
     def get_replies(self, obj):
         # Only include replies for top-level comments to avoid deep nesting
-        if obj.parent is None:
+        if obj.parent_id is None:
             replies = obj.replies.all()
             return ScenarioCommentSerializer(replies, many=True, context=self.context).data
         return []
 
     def get_likes_count(self, obj):
+        # Annotated by the comment selectors; fall back for freshly created instances.
+        annotated = getattr(obj, 'likes_count', None)
+        if annotated is not None:
+            return annotated
         return obj.likes.count()
 
     def get_user_has_liked(self, obj):
+        annotated = getattr(obj, 'user_has_liked', None)
+        if annotated is not None:
+            return bool(annotated)
         request = self.context.get('request')
         if request and request.user and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
@@ -933,6 +1081,8 @@ class ScenarioCommentSerializer(serializers.ModelSerializer):
                         return getattr(item, 'reaction', None) or None
             except Exception:
                 pass
+            if 'reactions' in getattr(obj, '_prefetched_objects_cache', {}):
+                return None
             reaction = obj.reactions.filter(user=request.user).values_list('reaction', flat=True).first()
             return reaction or None
         return None
@@ -1015,15 +1165,22 @@ class TestCaseCommentSerializer(serializers.ModelSerializer):
         return False
 
     def get_replies(self, obj):
-        if obj.parent is None:
+        if obj.parent_id is None:
             replies = obj.replies.all()
             return TestCaseCommentSerializer(replies, many=True, context=self.context).data
         return []
 
     def get_likes_count(self, obj):
+        # Annotated by the comment selectors; fall back for freshly created instances.
+        annotated = getattr(obj, 'likes_count', None)
+        if annotated is not None:
+            return annotated
         return obj.likes.count()
 
     def get_user_has_liked(self, obj):
+        annotated = getattr(obj, 'user_has_liked', None)
+        if annotated is not None:
+            return bool(annotated)
         request = self.context.get('request')
         if request and request.user and request.user.is_authenticated:
             return obj.likes.filter(user=request.user).exists()
@@ -1038,6 +1195,8 @@ class TestCaseCommentSerializer(serializers.ModelSerializer):
                         return getattr(item, 'reaction', None) or None
             except Exception:
                 pass
+            if 'reactions' in getattr(obj, '_prefetched_objects_cache', {}):
+                return None
             reaction = obj.reactions.filter(user=request.user).values_list('reaction', flat=True).first()
             return reaction or None
         return None
@@ -2,21 +2,49 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import base64
+import csv
+import gzip
 import hashlib
+import heapq
+import io
 import json
+import logging
+import math
 import os
 import re
+import threading
 import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
 from copy import deepcopy
-from typing import Any, Dict, Iterable, List, Tuple
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Tuple
 from xml.etree import ElementTree as ET
 
 import requests
-from django.db import transaction
+from requests.structures import CaseInsensitiveDict
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import serializers as django_serializers
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-from . import models
+from . import circuit, models, run_control, selectors
+
+try:  # optional: lets the async execute endpoint await upstream calls
+    import httpx
+except ImportError:  # pragma: no cover - falls back to requests on a worker thread
+    httpx = None
+
+logger = logging.getLogger(__name__)
 
 
 def recompute_automation_report_totals(automation_report: models.AutomationReport | None) -> None:
@@ -84,7 +112,7 @@ def recompute_automation_report_totals(automation_report: models.AutomationRepor
         return
 
 
-VARIABLE_PATTERN = re.compile(r"{{\s*([\w\.-]+)\s*}}")
+VARIABLE_PATTERN = models.TEMPLATE_VARIABLE_PATTERN
 
 
 def _resolve_variables(value: Any, variables: Dict[str, Any]) -> Any:
@@ -228,6 +256,237 @@ def _get_xml_node_text(root: ET.Element, path: str) -> str | None:
     return node.text
 
 
+@lru_cache(maxsize=4096)
+def _compile_xml_path(path: str) -> Tuple[Tuple[str, int], ...]:
+    return tuple(_parse_xml_segment(segment) for segment in _split_xml_path(path))
+
+
+def _build_xml_index(root: ET.Element) -> Dict[Tuple[Tuple[str, int], ...], ET.Element]:
+    """Map each element's (local name, sibling index) path below ``root`` to the element."""
+    index: Dict[Tuple[Tuple[str, int], ...], ET.Element] = {(): root}
+    stack: List[Tuple[Tuple[Tuple[str, int], ...], ET.Element]] = [((), root)]
+    while stack:
+        prefix, parent = stack.pop()
+        seen: Dict[str, int] = {}
+        for child in parent:
+            name = _xml_local_name(child.tag)
+            if not name:
+                continue
+            position = seen.get(name, 0)
+            seen[name] = position + 1
+            key = prefix + ((name, position),)
+            index[key] = child
+            stack.append((key, child))
+    return index
+
+
+def _lookup_xml_node(
+    root: ET.Element,
+    index: Dict[Tuple[Tuple[str, int], ...], ET.Element],
+    path: str,
+) -> ET.Element | None:
+    """Indexed equivalent of ``_locate_xml_node``."""
+    segments = _compile_xml_path(path)
+    if not segments:
+        return root
+    first_name, first_index = segments[0]
+    if first_name and _xml_local_name(root.tag) == first_name and first_index == 0:
+        segments = segments[1:]
+    return index.get(segments)
+
+
+def _normalize_char_limit(value: Any) -> int | None:
+    try:
+        char_limit = int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+    if char_limit is not None and char_limit <= 0:
+        return None
+    return char_limit
+
+
+def _parse_external_json(override: Dict[str, Any]) -> Any:
+    raw = override.get("external_json") if "external_json" in override else override.get("externalJson")
+    if raw is None:
+        # allow external_json to be provided as a serialized string in 'value'
+        candidate = override.get("value")
+        if candidate is None:
+            return {}
+        try:
+            return json.loads(str(candidate))
+        except Exception:
+            return {}
+    if isinstance(raw, dict):
+        return deepcopy(raw)
+    if isinstance(raw, str) and raw.strip():
+        try:
+            return json.loads(raw)
+        except ValueError as error:
+            raise ValueError(f"Invalid external_json for override '{override.get('path', '')}': {error}") from error
+    return {}
+
+
+def compile_body_transforms(transforms: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Normalize and validate a ``body_transforms`` config into an execution plan.
+
+    Raises ``ValueError`` for configuration errors so they can be reported when
+    the request is saved rather than on every run.
+    """
+    config = transforms or {}
+    if not isinstance(config, dict):
+        raise ValueError("Body transforms must be an object.")
+    raw_overrides = config.get("overrides") or []
+    raw_signatures = config.get("signatures") or []
+    if not isinstance(raw_overrides, list) or not isinstance(raw_signatures, list):
+        raise ValueError("Body transform overrides and signatures must be lists.")
+
+    overrides: List[Dict[str, Any]] = []
+    for override in raw_overrides:
+        if not isinstance(override, dict):
+            raise ValueError("Each body transform override must be an object.")
+        is_external = (
+            str(override.get("type") or "").lower() == "external"
+            or override.get("external_json") is not None
+        )
+        char_limit = override.get("charLimit") if override.get("charLimit") is not None else override.get("char_limit")
+        overrides.append({
+            "path": str(override.get("path", "") or "").strip(),
+            "value": str(override.get("value", "")),
+            "is_random": bool(override.get("isRandom") or override.get("is_random")),
+            "char_limit": _normalize_char_limit(char_limit),
+            "external": is_external,
+            "name": str(override.get("name") or override.get("externalName") or ""),
+            "external_obj": _parse_external_json(override) if is_external else None,
+            "encryption_key": override.get("encryption_key") or override.get("encryptionKey") or None,
+        })
+
+    signatures: List[Dict[str, Any]] = []
+    for signature in raw_signatures:
+        if not isinstance(signature, dict):
+            raise ValueError("Each body transform signature must be an object.")
+        target_path = str(
+            signature.get("target_path") or signature.get("targetPath") or signature.get("target") or ""
+        ).strip()
+        if not target_path:
+            continue
+        components = _parse_signature_components(str(signature.get("components", "")))
+        if not components:
+            continue
+        algorithm = str(signature.get("algorithm", "sha512")).lower()
+        try:
+            _compute_hash_hex(algorithm, "")
+        except ValueError as error:
+            raise ValueError(f"Unable to compute signature for '{target_path}': {error}") from error
+        signatures.append({
+            "target_path": target_path,
+            "algorithm": algorithm,
+            "components": components,
+            "store_as": str(signature.get("store_as") or signature.get("storeAs") or "").strip(),
+        })
+
+    return {"overrides": overrides, "signatures": signatures}
+
+
+# Plans keyed by the canonical JSON of the transform config, so any edit yields a new plan.
+_TRANSFORM_PLAN_CACHE: Dict[str, Dict[str, Any]] = {}
+_TRANSFORM_PLAN_CACHE_MAX = 512
+
+
+def get_body_transform_plan(transforms: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Return the cached execution plan for ``transforms``, compiling it on first use."""
+    try:
+        key = json.dumps(transforms or {}, sort_keys=True, default=str)
+    except (TypeError, ValueError):
+        return compile_body_transforms(transforms)
+    plan = _TRANSFORM_PLAN_CACHE.get(key)
+    if plan is None:
+        plan = compile_body_transforms(transforms)
+        if len(_TRANSFORM_PLAN_CACHE) >= _TRANSFORM_PLAN_CACHE_MAX:
+            _TRANSFORM_PLAN_CACHE.clear()
+        _TRANSFORM_PLAN_CACHE[key] = plan
+    return plan
+
+
+# Chosen environment pk keyed by the request version, the transform keys and every
+# candidate environment's version, so saving either side picks again.
+_ENVIRONMENT_CHOICE_CACHE: Dict[tuple, int | None] = {}
+_ENVIRONMENT_CHOICE_CACHE_MAX = 1024
+
+
+def choose_environment_for_request(
+    *,
+    collection: models.ApiCollection,
+    api_request: models.ApiRequest | None = None,
+    body_transforms: Dict[str, Any] | None = None,
+) -> models.ApiEnvironment | None:
+    """Pick the collection environment to run ``api_request`` in when none was given.
+
+    Prefers an environment defining every ``{{var}}`` the body transforms reference,
+    then one defining any of them, then the collection's first environment. Explicit
+    ``body_transforms`` replace the request's stored ones; otherwise the keys indexed
+    on ``ApiRequest.transform_variable_keys`` are used as-is.
+    """
+    candidates = sorted(collection.environments.all(), key=lambda env: env.pk)
+    if not candidates:
+        return None
+    if body_transforms is not None:
+        keys = frozenset(models.template_variable_keys(body_transforms))
+        request_version: tuple = (None, None)
+    elif api_request is not None:
+        keys = frozenset(api_request.transform_variable_keys or ())
+        request_version = (api_request.pk, api_request.updated_at)
+    else:
+        keys = frozenset()
+        request_version = (None, None)
+
+    cache_key = (
+        collection.pk,
+        *request_version,
+        keys,
+        tuple((env.pk, env.updated_at) for env in candidates),
+    )
+    by_pk = {env.pk: env for env in candidates}
+    if cache_key in _ENVIRONMENT_CHOICE_CACHE:
+        return by_pk.get(_ENVIRONMENT_CHOICE_CACHE[cache_key])
+
+    chosen = None
+    if keys:
+        available = [(env, set(env.variable_keys or ())) for env in candidates]
+        chosen = next((env for env, names in available if keys <= names), None)
+        if chosen is None:
+            chosen = next((env for env, names in available if not keys.isdisjoint(names)), None)
+    if chosen is None:
+        chosen = candidates[0]
+
+    if len(_ENVIRONMENT_CHOICE_CACHE) >= _ENVIRONMENT_CHOICE_CACHE_MAX:
+        _ENVIRONMENT_CHOICE_CACHE.clear()
+    _ENVIRONMENT_CHOICE_CACHE[cache_key] = chosen.pk
+    return chosen
+
+
+def _random_override_value(resolved_value: Any, char_limit: int | None) -> str:
+    # enforce base length 10
+    base = resolved_value if isinstance(resolved_value, str) else str(resolved_value)
+    if len(base) > 10:
+        base = base[:10]
+    # timestamp: use timezone.now() for server-local time + time.time_ns() for higher precision
+    now = timezone.now()
+    ms = f"{int(now.microsecond / 1000):03d}"
+    try:
+        ns = time.time_ns()
+        # include lower-order digits to emulate extra precision
+        extra = str(ns % 1000000).zfill(6)
+    except Exception:
+        extra = "000000"
+    timestamp = f"{now.year}{now.month:02d}{now.day:02d}-{now.hour:02d}{now.minute:02d}{now.second:02d}.{ms}{extra}"
+    combined = f"{base}{timestamp}"
+    if char_limit is not None and len(combined) > char_limit:
+        allowed_ts_len = max(0, char_limit - len(base))
+        truncated_ts = timestamp[:allowed_ts_len] if allowed_ts_len > 0 else ""
+        combined = f"{base}{truncated_ts}"
+    return combined
+
+
 def _apply_body_transforms(
     json_payload: Any,
     transforms: Dict[str, Any] | None,
@@ -236,116 +495,42 @@ def _apply_body_transforms(
     if not isinstance(json_payload, dict):
         return {}
     overrides: Dict[str, str] = {}
-    config = transforms or {}
+    plan = get_body_transform_plan(transforms)
 
-    # First, separate external overrides from simple overrides so we can
-    # build external objects, allow signatures to reference them, and
-    # finally encrypt them and place the encrypted string into the
-    # configured payload path.
-    external_overrides: List[dict] = []
-    simple_overrides: List[dict] = []
-    for override in config.get("overrides", []) or []:
-        if isinstance(override, dict) and (str(override.get("type") or "").lower() == "external" or override.get("external_json") is not None):
-            external_overrides.append(override)
-        else:
-            simple_overrides.append(override)
+    # External overrides build objects that signatures may reference; they are
+    # encrypted and placed into the payload only after signatures are computed.
+    external_overrides = [override for override in plan["overrides"] if override["external"]]
 
-    # Apply simple overrides (existing behavior)
-    for override in simple_overrides:
-        path = str(override.get("path", "")).strip()
-        if not path:
+    for override in plan["overrides"]:
+        if override["external"] or not override["path"]:
             continue
-        raw_value = override.get("value", "")
         # Resolve template variables first
-        resolved_value = _resolve_variables(str(raw_value), variables)
-
-        # Server-side handling for runtime-only helpers: isRandom / is_random and charLimit / char_limit
-        is_random = bool(override.get("isRandom") or override.get("is_random"))
-        char_limit = override.get("charLimit") if override.get("charLimit") is not None else override.get("char_limit")
-
+        resolved_value = _resolve_variables(override["value"], variables)
         # If a non-empty value is already provided by the client, respect it and do
         # not synthesize a random value even if isRandom is true. Only synthesize
         # when isRandom is requested and the provided value is missing or empty.
         provided_value_present = resolved_value is not None and str(resolved_value) != ""
-
-        try:
-            char_limit = int(char_limit) if char_limit is not None else None
-            if char_limit is not None and char_limit <= 0:
-                char_limit = None
-        except (TypeError, ValueError):
-            char_limit = None
-
-        if is_random and not provided_value_present:
-            # enforce base length 10
-            base = resolved_value if isinstance(resolved_value, str) else str(resolved_value)
-            if len(base) > 10:
-                base = base[:10]
-            # timestamp: use timezone.now() for server-local time + time.time_ns() for higher precision
-            now = timezone.now()
-            ms = f"{int(now.microsecond / 1000):03d}"
-            try:
-                ns = time.time_ns()
-                # include lower-order digits to emulate extra precision
-                extra = str(ns % 1000000).zfill(6)
-            except Exception:
-                extra = "000000"
-            timestamp = f"{now.year}{now.month:02d}{now.day:02d}-{now.hour:02d}{now.minute:02d}{now.second:02d}.{ms}{extra}"
-            combined = f"{base}{timestamp}"
-            if char_limit is not None and len(combined) > char_limit:
-                allowed_ts_len = max(0, char_limit - len(base))
-                truncated_ts = timestamp[:allowed_ts_len] if allowed_ts_len > 0 else ""
-                combined = f"{base}{truncated_ts}"
-            resolved_value = combined
-
-        _set_nested_value(json_payload, path, resolved_value)
-
-    # Build a map of external objects: support named external objects via 'name' or anonymous list
-    external_map: Dict[str, dict] = {}
-    anonymous_externals: List[dict] = []
+        if override["is_random"] and not provided_value_present:
+            resolved_value = _random_override_value(resolved_value, override["char_limit"])
+        _set_nested_value(json_payload, override["path"], resolved_value)
+
+    # Build a map of external objects: support named external objects via 'name' or anonymous list.
+    # Copies are taken because signatures may write into them.
+    external_map: Dict[str, Any] = {}
+    anonymous_externals: List[Any] = []
     for override in external_overrides:
-        # expected shape: { path, name?, external_json }
-        name = (override.get("name") or override.get("externalName") or "")
-        raw = override.get("external_json") if "external_json" in override else override.get("externalJson")
-        if raw is None:
-            # allow external_json to be provided as a serialized string in 'value'
-            candidate = override.get("value")
-            if candidate is not None:
-                try:
-                    parsed = json.loads(str(candidate))
-                except Exception:
-                    parsed = None
-            else:
-                parsed = None
-        else:
-            parsed = raw if isinstance(raw, dict) else (json.loads(str(raw)) if isinstance(raw, str) and str(raw).strip() else None)
-
-        if parsed is None:
-            parsed = {}
-
-        if name:
-            external_map[str(name)] = parsed
+        parsed = deepcopy(override["external_obj"])
+        if override["name"]:
+            external_map[override["name"]] = parsed
         else:
             anonymous_externals.append(parsed)
 
-    for signature in config.get("signatures", []) or []:
-        target_path = (
-            signature.get("target_path")
-            or signature.get("targetPath")
-            or signature.get("target")
-            or ""
-        )
-        target_path = str(target_path).strip()
-        if not target_path:
-            continue
-        algorithm = str(signature.get("algorithm", "sha512")).lower()
-        components = _parse_signature_components(str(signature.get("components", "")))
-        if not components:
-            continue
+    for signature in plan["signatures"]:
+        target_path = signature["target_path"]
         parts: list[str] = []
-        for component in components:
+        for component in signature["components"]:
             if component.get("type") == "literal":
-                literal_raw = component.get("value", "")
-                parts.append(_resolve_variables(str(literal_raw), variables))
+                parts.append(_resolve_variables(str(component.get("value", "")), variables))
             else:
                 comp_path = str(component.get("value", "") or "").strip()
                 # support external.<name>.<path> or external.<path> references
@@ -354,26 +539,19 @@ def _apply_body_transforms(
                     segs = _split_path(ext_ref)
                     value = None
                     if segs and segs[0] in external_map:
-                        name = segs[0]
                         inner_path = ".".join(segs[1:])
-                        value = _get_nested_value(external_map.get(name, {}), inner_path)
+                        value = _get_nested_value(external_map.get(segs[0], {}), inner_path)
                     else:
                         # try anonymous or first external
-                        inner_path = ext_ref
                         if anonymous_externals:
-                            value = _get_nested_value(anonymous_externals[0], inner_path)
+                            value = _get_nested_value(anonymous_externals[0], ext_ref)
                         elif external_map:
-                            # pick first external
-                            first = next(iter(external_map.values()))
-                            value = _get_nested_value(first, inner_path)
+                            value = _get_nested_value(next(iter(external_map.values())), ext_ref)
                     parts.append("" if value is None else str(value))
                 else:
                     value = _get_nested_value(json_payload, component.get("value", ""))
                     parts.append("" if value is None else str(value))
-        try:
-            signature_value = _compute_hash_hex(algorithm, "".join(parts))
-        except ValueError as error:  # pragma: no cover - configuration error path
-            raise ValueError(f"Unable to compute signature for '{target_path}': {error}") from error
+        signature_value = _compute_hash_hex(signature["algorithm"], "".join(parts))
         # If target_path refers to external, set inside that external object
         if target_path.startswith("external."):
             ext_ref = target_path[len("external."):]
@@ -384,7 +562,6 @@ def _apply_body_transforms(
                 if inner_path:
                     _set_nested_value(external_map[name], inner_path, signature_value)
                 else:
-                    # set root
                     external_map[name] = signature_value
             else:
                 inner_path = ext_ref
@@ -401,28 +578,22 @@ def _apply_body_transforms(
                         external_map[first_name] = signature_value
         else:
             _set_nested_value(json_payload, target_path, signature_value)
-        store_name = signature.get("store_as") or signature.get("storeAs")
-        if store_name:
-            normalized = str(store_name).strip()
-            if normalized:
-                overrides[normalized] = signature_value
-                variables[normalized] = signature_value
-    # After signatures are computed and possibly placed into external objects,
-    # encrypt external objects and set the encrypted string into the payload
+        if signature["store_as"]:
+            overrides[signature["store_as"]] = signature_value
+            variables[signature["store_as"]] = signature_value
+
+    # Encrypt external objects and set the encrypted string into the payload
     # at the configured override paths.
     for override in external_overrides:
         try:
-            path = str(override.get("path", "") or "").strip()
-            if not path:
+            if not override["path"]:
                 continue
-            name = (override.get("name") or override.get("externalName") or "")
-            if name:
-                obj = external_map.get(str(name), {})
+            if override["name"]:
+                obj = external_map.get(override["name"], {})
             else:
                 obj = anonymous_externals.pop(0) if anonymous_externals else {}
-            key = override.get("encryption_key") or override.get("encryptionKey") or override.get("encryption_key")
-            encrypted = _encrypt_external_obj(obj, key if key else None)
-            _set_nested_value(json_payload, path, encrypted)
+            encrypted = _encrypt_external_obj(obj, override["encryption_key"])
+            _set_nested_value(json_payload, override["path"], encrypted)
         except Exception:
             # ignore encryption errors per-override and continue
             continue
@@ -469,93 +640,48 @@ def _apply_xml_body_transforms(
         root = ET.fromstring(xml_text)
     except ET.ParseError:
         return xml_text
+    # Transforms only rewrite node text, so one index serves every lookup below.
+    index = _build_xml_index(root)
+    plan = get_body_transform_plan(transforms)
 
-    config = transforms or {}
-
-    for override in config.get("overrides", []) or []:
-        path = str(override.get("path", "")).strip()
-        if not path:
+    for override in plan["overrides"]:
+        if not override["path"]:
             continue
-        raw_value = override.get("value", "")
-        resolved_value = _resolve_variables(str(raw_value), variables)
-        # isRandom / charLimit support for XML transforms as well
-        is_random = bool(override.get("isRandom") or override.get("is_random"))
-        char_limit = override.get("charLimit") if override.get("charLimit") is not None else override.get("char_limit")
-        try:
-            char_limit = int(char_limit) if char_limit is not None else None
-            if char_limit is not None and char_limit <= 0:
-                char_limit = None
-        except (TypeError, ValueError):
-            char_limit = None
-
-        if is_random:
-            base = resolved_value if isinstance(resolved_value, str) else str(resolved_value)
-            if len(base) > 10:
-                base = base[:10]
-            now = timezone.now()
-            ms = f"{int(now.microsecond / 1000):03d}"
-            try:
-                ns = time.time_ns()
-                extra = str(ns % 1000000).zfill(6)
-            except Exception:
-                extra = "000000"
-            timestamp = f"{now.year}{now.month:02d}{now.day:02d}-{now.hour:02d}{now.minute:02d}{now.second:02d}.{ms}{extra}"
-            combined = f"{base}{timestamp}"
-            if char_limit is not None and len(combined) > char_limit:
-                allowed_ts_len = max(0, char_limit - len(base))
-                truncated_ts = timestamp[:allowed_ts_len] if allowed_ts_len > 0 else ""
-                combined = f"{base}{truncated_ts}"
-            resolved_value = combined
-
-        target = _locate_xml_node(root, path)
+        resolved_value = _resolve_variables(override["value"], variables)
+        # XML overrides flagged isRandom always receive a fresh value
+        if override["is_random"]:
+            resolved_value = _random_override_value(resolved_value, override["char_limit"])
+        target = _lookup_xml_node(root, index, override["path"])
         if target is None:
             continue
         target.text = resolved_value
 
-    for signature in config.get("signatures", []) or []:
-        target_path = (
-            signature.get("target_path")
-            or signature.get("targetPath")
-            or signature.get("target")
-            or ""
-        )
-        target_path = str(target_path).strip()
-        if not target_path:
-            continue
-        algorithm = str(signature.get("algorithm", "sha512")).lower()
-        components = _parse_signature_components(str(signature.get("components", "")))
-        if not components:
-            continue
+    for signature in plan["signatures"]:
         parts: list[str] = []
-        for component in components:
+        for component in signature["components"]:
             if component.get("type") == "literal":
-                literal_raw = component.get("value", "")
-                parts.append(_resolve_variables(str(literal_raw), variables))
+                parts.append(_resolve_variables(str(component.get("value", "")), variables))
             else:
-                value = _get_xml_node_text(root, component.get("value", ""))
+                node = _lookup_xml_node(root, index, component.get("value", ""))
+                value = None if node is None else node.text
                 parts.append("" if value is None else str(value))
-        try:
-            signature_value = _compute_hash_hex(algorithm, "".join(parts))
-        except ValueError as error:  # pragma: no cover - configuration error path
-            raise ValueError(f"Unable to compute signature for '{target_path}': {error}") from error
-        target_node = _locate_xml_node(root, target_path)
+        signature_value = _compute_hash_hex(signature["algorithm"], "".join(parts))
+        target_node = _lookup_xml_node(root, index, signature["target_path"])
         if target_node is None:
             continue
         target_node.text = signature_value
-        store_name = signature.get("store_as") or signature.get("storeAs")
-        if store_name:
-            normalized = str(store_name).strip()
-            if normalized:
-                variables[normalized] = signature_value
+        if signature["store_as"]:
+            variables[signature["store_as"]] = signature_value
 
     return ET.tostring(root, encoding="unicode")
 
 
-def _extract_json_path(data: Any, path: str) -> Any:
-    if not path:
-        return data
+def _split_json_path(path: str) -> Tuple[str, ...]:
+    return tuple(segment for segment in (path or "").strip(".").split(".") if segment)
+
+
+def _extract_json_segments(data: Any, segments: Iterable[str]) -> Any:
     current = data
-    segments = [segment for segment in path.strip(".").split(".") if segment]
     for segment in segments:
         if isinstance(current, dict):
             current = current.get(segment)
@@ -572,26 +698,38 @@ def _extract_json_path(data: Any, path: str) -> Any:
     return current
 
 
-def _compare_values(actual: Any, expected: Any, assertion: models.ApiAssertion) -> bool:
-    comparator = (assertion.comparator or "equals").lower()
+def _extract_json_path(data: Any, path: str) -> Any:
+    if not path:
+        return data
+    return _extract_json_segments(data, _split_json_path(path))
+
+
+def _coerce_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_NUMERIC_COMPARATORS = {
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+}
+
+
+def _compare_with(comparator: str, actual: Any, expected: Any, expected_float: float | None) -> bool:
     if comparator == "equals":
         return actual == expected
     if comparator == "contains" and isinstance(actual, str):
         return str(expected) in actual
 
-    numeric_comparators = {
-        "lt": lambda a, b: a < b,
-        "lte": lambda a, b: a <= b,
-        "gt": lambda a, b: a > b,
-        "gte": lambda a, b: a >= b,
-    }
-    if comparator in numeric_comparators:
-        try:
-            actual_float = float(actual)
-            expected_float = float(expected)
-        except (TypeError, ValueError):
+    if comparator in _NUMERIC_COMPARATORS:
+        actual_float = _coerce_float(actual)
+        if actual_float is None or expected_float is None:
             return False
-        return numeric_comparators[comparator](actual_float, expected_float)
+        return _NUMERIC_COMPARATORS[comparator](actual_float, expected_float)
 
     if comparator == "subset" and isinstance(actual, dict) and isinstance(expected, dict):
         return all(actual.get(key) == value for key, value in expected.items())
@@ -599,44 +737,203 @@ def _compare_values(actual: Any, expected: Any, assertion: models.ApiAssertion)
     return False
 
 
-def _evaluate_assertions(
-    assertions: Iterable[models.ApiAssertion],
-    response: requests.Response,
-    response_time_ms: float,
+def _compare_values(actual: Any, expected: Any, assertion: models.ApiAssertion) -> bool:
+    comparator = (assertion.comparator or "equals").lower()
+    return _compare_with(comparator, actual, expected, _coerce_float(expected))
+
+
+RUN_PHASES = (
+    "resolve",
+    "transforms",
+    "encryption",
+    "upstream",
+    "parse",
+    "assertions",
+    "decryption",
+    "persist",
+)
+
+
+class PhaseTimer:
+    """Accumulates wall-clock milliseconds per execution phase.
+
+    Nested ``phase`` blocks are exclusive: time spent in an inner phase is not
+    also counted against the enclosing one.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self._children: List[float] = []
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + max(0.0, elapsed_ms)
+
+    def add_since(self, name: str, started: float) -> None:
+        """Charge the time since ``started`` (a ``time.perf_counter()`` value) to ``name``."""
+        elapsed = time.perf_counter() - started
+        if self._children:
+            self._children[-1] += elapsed
+        self.add(name, elapsed * 1000)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        self._children.append(0.0)
+        try:
+            yield
+        finally:
+            child = self._children.pop()
+            elapsed = time.perf_counter() - started
+            if self._children:
+                self._children[-1] += elapsed
+            self.add(name, (elapsed - child) * 1000)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(value, 3) for name, value in self.phases.items()}
+
+
+def _timed(timer: PhaseTimer | None, name: str):
+    return timer.phase(name) if timer is not None else nullcontext()
+
+
+RESPONSE_BODY_MAX_CHARS = 20000
+
+
+def json_snapshot(value: Any) -> str:
+    """``value`` serialized for logs and previews; falls back to ``str`` when not JSON-serializable."""
+    try:
+        return json.dumps(value, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class ParsedResponse:
+    """Read-only view over an upstream response, shared by everything that inspects it.
+
+    Assertions, dependency extraction, decryption and persistence all read from one
+    instance, so the body is decoded once, JSON is parsed at most once (from the
+    decoded text) and the serialized snapshot is built at most once.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, response: requests.Response) -> None:
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.ok = response.status_code < 400
+        self._response = response
+        self._text: Any = self._UNSET
+        self._json: Any = self._UNSET
+        self._snapshot: Any = self._UNSET
+        self._headers_dict: Dict[str, Any] | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is self._UNSET:
+            self._text = self._response.text
+        return self._text
+
+    @property
+    def body(self) -> str:
+        """Decoded body truncated to what results store."""
+        return self.text[:RESPONSE_BODY_MAX_CHARS]
+
+    @property
+    def headers_dict(self) -> Dict[str, Any]:
+        if self._headers_dict is None:
+            self._headers_dict = dict(self.headers)
+        return self._headers_dict
+
+    @property
+    def json(self) -> Any:
+        """Decoded JSON body, or ``None`` when the body is not JSON."""
+        if self._json is self._UNSET:
+            try:
+                if isinstance(self._response, requests.Response) and self._response.encoding:
+                    # ``Response.json()`` would decode the body a second time.
+                    self._json = json.loads(self.text)
+                else:
+                    self._json = self._response.json()
+            except ValueError:
+                self._json = None
+        return self._json
+
+    @property
+    def snapshot(self) -> str | None:
+        """The JSON body serialized once for logging, or ``None`` when the body is not JSON."""
+        if self._snapshot is self._UNSET:
+            self._snapshot = None if self.json is None else json_snapshot(self.json)
+        return self._snapshot
+
+
+# Compiled plans keyed by the assertions' (pk, updated_at) so edits invalidate them.
+_ASSERTION_PLAN_CACHE: Dict[tuple, Tuple[Dict[str, Any], ...]] = {}
+_ASSERTION_PLAN_CACHE_MAX = 1024
+
+
+def _compile_assertion(assertion: models.ApiAssertion) -> Dict[str, Any]:
+    expected: Any = assertion.expected_value
+    if assertion.type == models.ApiAssertion.AssertionTypes.STATUS_CODE:
+        try:
+            expected = int(expected)
+        except (TypeError, ValueError):
+            pass
+    return {
+        "id": assertion.id,
+        "type": assertion.type,
+        "field": assertion.field,
+        "segments": _split_json_path(assertion.field) if assertion.field else (),
+        "comparator": (assertion.comparator or "equals").lower(),
+        "expected": expected,
+        "expected_float": _coerce_float(expected),
+    }
+
+
+def compile_assertion_plan(assertions: Iterable[models.ApiAssertion]) -> Tuple[Dict[str, Any], ...]:
+    """Return the evaluation plan for ``assertions``, reusing a cached plan when unchanged."""
+    assertions = list(assertions)
+    if any(assertion.pk is None for assertion in assertions):
+        return tuple(_compile_assertion(assertion) for assertion in assertions)
+    key = tuple((assertion.pk, assertion.updated_at) for assertion in assertions)
+    plan = _ASSERTION_PLAN_CACHE.get(key)
+    if plan is None:
+        plan = tuple(_compile_assertion(assertion) for assertion in assertions)
+        if len(_ASSERTION_PLAN_CACHE) >= _ASSERTION_PLAN_CACHE_MAX:
+            _ASSERTION_PLAN_CACHE.clear()
+        _ASSERTION_PLAN_CACHE[key] = plan
+    return plan
+
+
+def _run_assertion_plan(
+    plan: Iterable[Dict[str, Any]],
+    response: ParsedResponse,
 ) -> Tuple[bool, list[dict[str, Any]], list[dict[str, Any]]]:
     passed: list[dict[str, Any]] = []
     failed: list[dict[str, Any]] = []
 
-    try:
-        json_body = response.json()
-    except ValueError:
-        json_body = None
-
-    for assertion in assertions:
-        result = {"id": assertion.id, "type": assertion.type, "field": assertion.field}
+    for compiled in plan:
+        result = {"id": compiled["id"], "type": compiled["type"], "field": compiled["field"]}
         success = False
         actual_value: Any = None
-        expected_value: Any = assertion.expected_value
+        expected_value: Any = compiled["expected"]
+        assertion_type = compiled["type"]
 
-        if assertion.type == models.ApiAssertion.AssertionTypes.STATUS_CODE:
+        if assertion_type == models.ApiAssertion.AssertionTypes.STATUS_CODE:
             actual_value = response.status_code
-            try:
-                expected_value = int(expected_value)
-            except (TypeError, ValueError):
-                pass
             success = actual_value == expected_value
-        elif assertion.type == models.ApiAssertion.AssertionTypes.JSON_PATH:
+        elif assertion_type == models.ApiAssertion.AssertionTypes.JSON_PATH:
+            json_body = response.json
             if json_body is not None:
-                actual_value = _extract_json_path(json_body, assertion.field)
-                success = _compare_values(actual_value, expected_value, assertion)
+                actual_value = _extract_json_segments(json_body, compiled["segments"])
+                success = _compare_with(compiled["comparator"], actual_value, expected_value, compiled["expected_float"])
             else:
                 result["message"] = "Response body is not JSON"
-        elif assertion.type == models.ApiAssertion.AssertionTypes.HEADER:
-            actual_value = response.headers.get(assertion.field or "")
-            success = _compare_values(actual_value, expected_value, assertion)
-        elif assertion.type == models.ApiAssertion.AssertionTypes.BODY_CONTAINS:
-            actual_value = assertion.expected_value
-            success = assertion.expected_value in response.text
+        elif assertion_type == models.ApiAssertion.AssertionTypes.HEADER:
+            actual_value = response.headers.get(compiled["field"] or "")
+            success = _compare_with(compiled["comparator"], actual_value, expected_value, compiled["expected_float"])
+        elif assertion_type == models.ApiAssertion.AssertionTypes.BODY_CONTAINS:
+            actual_value = expected_value
+            success = expected_value in response.text
         else:
             result["message"] = "Unsupported assertion type"
 
@@ -652,10 +949,21 @@ def _evaluate_assertions(
     return len(failed) == 0, passed, failed
 
 
+def _evaluate_assertions(
+    assertions: Iterable[models.ApiAssertion],
+    response: requests.Response | ParsedResponse,
+    response_time_ms: float,
+) -> Tuple[bool, list[dict[str, Any]], list[dict[str, Any]]]:
+    if not isinstance(response, ParsedResponse):
+        response = ParsedResponse(response)
+    return _run_assertion_plan(compile_assertion_plan(assertions), response)
+
+
 def _build_request_payload(
     api_request: models.ApiRequest,
     variables: Dict[str, Any],
     environment: models.ApiEnvironment | None,
+    timer: PhaseTimer | None = None,
 ) -> Dict[str, Any]:
     merged_headers: Dict[str, Any] = {}
     if environment:
@@ -672,7 +980,8 @@ def _build_request_payload(
     if api_request.body_type == models.ApiRequest.BodyTypes.JSON:
         json_payload = _resolve_variables(deepcopy(api_request.body_json), variables)
         if isinstance(json_payload, dict):
-            _apply_body_transforms(json_payload, api_request.body_transforms, variables)
+            with _timed(timer, "transforms"):
+                _apply_body_transforms(json_payload, api_request.body_transforms, variables)
     elif api_request.body_type == models.ApiRequest.BodyTypes.FORM:
         data = _resolve_variables(deepcopy(api_request.body_form), variables)
     elif api_request.body_type == models.ApiRequest.BodyTypes.RAW:
@@ -680,7 +989,8 @@ def _build_request_payload(
         if isinstance(raw_body, str):
             raw_type = (api_request.body_raw_type or "").lower()
             if raw_type == "xml":
-                raw_body = _apply_xml_body_transforms(raw_body, api_request.body_transforms, variables)
+                with _timed(timer, "transforms"):
+                    raw_body = _apply_xml_body_transforms(raw_body, api_request.body_transforms, variables)
         data = raw_body
 
     auth = None
@@ -715,6 +1025,44 @@ def _summarize_run(total: int, passed: int) -> Dict[str, Any]:
     }
 
 
+def _final_run_status(passed: bool, control: run_control.RunControl) -> str:
+    if control.reason == run_control.CANCELLED_REASON:
+        return models.ApiRun.Status.CANCELLED
+    return models.ApiRun.Status.PASSED if passed else models.ApiRun.Status.FAILED
+
+
+def run_deadline(seconds: Any, *, start: datetime | None = None) -> datetime | None:
+    """Absolute deadline ``seconds`` after ``start`` (default now); ``None`` for no deadline.
+
+    Raises ``ValueError`` unless ``seconds`` is empty or a positive number.
+    """
+    if seconds in (None, ""):
+        return None
+    try:
+        seconds = float(seconds)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Deadline must be a number of seconds.") from exc
+    if not math.isfinite(seconds) or seconds <= 0:
+        raise ValueError("Deadline must be a positive number of seconds.")
+    return (start or timezone.now()) + timedelta(seconds=seconds)
+
+
+def cancel_run(run: models.ApiRun) -> models.ApiRun:
+    """Ask the worker executing ``run`` to stop; it notices within ``API_RUN_CANCEL_POLL_SECONDS``.
+
+    Raises ``ValueError`` when the run has already finished.
+    """
+    active = (models.ApiRun.Status.PENDING, models.ApiRun.Status.RUNNING)
+    if run.status not in active:
+        raise ValueError("Run has already finished.")
+    if run.cancel_requested_at is None:
+        run.cancel_requested_at = timezone.now()
+        models.ApiRun.objects.filter(pk=run.pk, cancel_requested_at__isnull=True).update(
+            cancel_requested_at=run.cancel_requested_at, updated_at=run.cancel_requested_at
+        )
+    return run
+
+
 def _extract_postman_scripts(events: Iterable[dict[str, Any]] | None) -> Tuple[str, str]:
     pre_script_lines: List[str] = []
     test_script_lines: List[str] = []
@@ -891,131 +1239,651 @@ def _flatten_postman_items(items: Iterable[dict[str, Any]] | None, parents: Iter
     return requests
 
 
-@transaction.atomic
-def run_collection(
-    *,
-    collection: models.ApiCollection,
-    environment: models.ApiEnvironment | None = None,
-    overrides: Dict[str, Any] | None = None,
-    user: Any = None,
-) -> models.ApiRun:
-    variables: Dict[str, Any] = {}
-    if environment:
-        variables.update(environment.variables or {})
-    if overrides:
-        variables.update(overrides)
+# Latency sketches use log-spaced buckets (~1% relative error); bucket counts
+# from any number of sketches can be summed to answer quantiles over a range.
+_LATENCY_RELATIVE_ACCURACY = 0.01
+_LATENCY_GAMMA = (1 + _LATENCY_RELATIVE_ACCURACY) / (1 - _LATENCY_RELATIVE_ACCURACY)
+_LATENCY_LOG_GAMMA = math.log(_LATENCY_GAMMA)
+_LATENCY_MIN_MS = 0.01
 
-    run = models.ApiRun.objects.create(
-        collection=collection,
-        environment=environment,
-        triggered_by=user,
-        status=models.ApiRun.Status.RUNNING,
-        started_at=timezone.now(),
-    )
 
-    total_requests = 0
-    passed_requests = 0
+def _latency_bucket(value_ms: float) -> int:
+    return int(math.ceil(math.log(max(float(value_ms), _LATENCY_MIN_MS)) / _LATENCY_LOG_GAMMA))
 
-    for order, api_request in enumerate(collection.requests.all(), start=1):
-        total_requests += 1
-        result = models.ApiRunResult.objects.create(
-            run=run,
-            request=api_request,
-            order=order,
-            status=models.ApiRunResult.Status.ERROR,
-        )
-        try:
-            payload = _build_request_payload(api_request, variables, environment)
-        except ValueError as exc:
-            result.error = str(exc)
-            result.save(update_fields=["error", "updated_at"])
+
+def _latency_bucket_value(bucket: int) -> float:
+    return 2 * _LATENCY_GAMMA ** bucket / (_LATENCY_GAMMA + 1)
+
+
+def merge_latency_sketches(sketches: Iterable[models.ApiLatencySketch]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {"buckets": {}, "count": 0, "total_ms": 0.0, "min_ms": None, "max_ms": None}
+    for sketch in sketches:
+        for bucket, count in (sketch.buckets or {}).items():
+            key = int(bucket)
+            merged["buckets"][key] = merged["buckets"].get(key, 0) + int(count)
+        merged["count"] += sketch.count
+        merged["total_ms"] += sketch.total_ms
+        if sketch.min_ms is not None and (merged["min_ms"] is None or sketch.min_ms < merged["min_ms"]):
+            merged["min_ms"] = sketch.min_ms
+        if sketch.max_ms is not None and (merged["max_ms"] is None or sketch.max_ms > merged["max_ms"]):
+            merged["max_ms"] = sketch.max_ms
+    return merged
+
+
+def latency_quantiles(merged: Dict[str, Any], quantiles: Iterable[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+    """Summarize a merged sketch as count/avg/min/max plus ``p<NN>`` estimates."""
+    count = merged.get("count") or 0
+    summary: Dict[str, Any] = {
+        "count": count,
+        "avg_ms": (merged["total_ms"] / count) if count else None,
+        "min_ms": merged.get("min_ms"),
+        "max_ms": merged.get("max_ms"),
+    }
+    ordered = sorted(merged.get("buckets", {}).items())
+    for quantile in quantiles:
+        label = f"p{int(round(quantile * 100))}"
+        if not count:
+            summary[label] = None
             continue
-        try:
-            start = time.perf_counter()
-            response = requests.request(
-                method=payload["method"],
-                url=payload["url"],
-                headers=payload["headers"],
-                params=payload["params"],
-                data=payload["data"],
-                json=payload["json"],
-                auth=payload["auth"],
-                timeout=payload["timeout"],
-            )
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            success, passed, failed = _evaluate_assertions(api_request.assertions.all(), response, elapsed_ms)
-
-            result.response_status = response.status_code
-            result.response_headers = dict(response.headers)
-            result.response_body = response.text[:20000]
-            result.response_time_ms = elapsed_ms
-            result.assertions_passed = passed
-            result.assertions_failed = failed
-            result.status = models.ApiRunResult.Status.PASSED if success else models.ApiRunResult.Status.FAILED
-            if success:
-                passed_requests += 1
-        except requests.RequestException as exc:
-            result.error = str(exc)
-            result.status = models.ApiRunResult.Status.ERROR
+        rank = quantile * (count - 1)
+        cumulative = 0
+        estimate = None
+        for bucket, bucket_count in ordered:
+            cumulative += bucket_count
+            if cumulative > rank:
+                estimate = _latency_bucket_value(bucket)
+                break
+        if estimate is None and ordered:
+            estimate = _latency_bucket_value(ordered[-1][0])
+        if estimate is not None:
+            if summary["min_ms"] is not None:
+                estimate = max(estimate, summary["min_ms"])
+            if summary["max_ms"] is not None:
+                estimate = min(estimate, summary["max_ms"])
+        summary[label] = estimate
+    return summary
+
+
+def record_request_latencies(request_id: int | None, latencies_ms: Iterable[float], day: Any = None) -> None:
+    """Fold response times for ``request_id`` into that day's latency sketch."""
+    values = [float(value) for value in latencies_ms if value is not None]
+    if request_id is None or not values:
+        return
+    day = day or timezone.localdate()
+    with transaction.atomic():
+        sketch, _ = models.ApiLatencySketch.objects.select_for_update().get_or_create(request_id=request_id, day=day)
+        buckets = dict(sketch.buckets or {})
+        for value in values:
+            key = str(_latency_bucket(value))
+            buckets[key] = buckets.get(key, 0) + 1
+        sketch.buckets = buckets
+        sketch.count += len(values)
+        sketch.total_ms += sum(values)
+        low, high = min(values), max(values)
+        sketch.min_ms = low if sketch.min_ms is None else min(sketch.min_ms, low)
+        sketch.max_ms = high if sketch.max_ms is None else max(sketch.max_ms, high)
+        sketch.save(update_fields=["buckets", "count", "total_ms", "min_ms", "max_ms", "updated_at"])
+
+
+class LatencyBuffer:
+    """Queue execute response times and fold them into the daily sketches in batches.
+
+    Samples are grouped per (request, day) and written by ``flush`` once ``size`` of them
+    are queued or ``interval`` seconds after the first one, so single execute calls do not
+    each take the sketch row lock. ``size``/``interval`` default to API_LATENCY_BUFFER_SIZE
+    and API_LATENCY_FLUSH_INTERVAL; a size of 1 writes every sample directly.
+    """
 
-        result.save()
-        # mirror saved result into report table (non-blocking)
-        try:
-            tc = None
-            try:
-                tc = api_request.test_cases.first()
-            except Exception:
-                tc = None
-            # find or create an AutomationReport for this run
-            automation_report = None
-            try:
-                # prefer an AutomationReport already linked to this run
-                automation_report = models.AutomationReport.objects.filter(report_id__isnull=False, started=run.started_at).first()
-                if not automation_report:
-                    # try to find by same triggered_by and collection name
-                    if run.triggered_by or run.collection:
-                        triggered_in = run.collection.name if run.collection else ""
-                        automation_report = models.AutomationReport.objects.filter(triggered_by=run.triggered_by, triggered_in=triggered_in, started__date=run.started_at.date() if run.started_at else None).first()
-                if not automation_report:
-                    automation_report = models.AutomationReport.objects.create(
-                        triggered_in=(run.collection.name if run.collection else ""),
-                        triggered_by=run.triggered_by,
-                        started=run.started_at,
-                    )
-            except Exception:
-                automation_report = None
+    def __init__(self, size: int | None = None, interval: float | None = None) -> None:
+        self.size = size
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[int, Any], List[float]] = {}
+        self._timer: threading.Timer | None = None
 
-            models.ApiRunResultReport.objects.create(
-                run=run,
-                request=api_request,
-                order=result.order,
-                status=result.status,
-                response_status=result.response_status,
-                response_headers=result.response_headers,
-                response_body=result.response_body,
-                response_time_ms=result.response_time_ms,
-                assertions_passed=result.assertions_passed,
-                assertions_failed=result.assertions_failed,
-                error=result.error,
-                testcase=tc,
-                automation_report=automation_report,
-            )
-            # recompute report totals based on test case results
+    def add(self, request_id: int | None, latency_ms: float | None) -> None:
+        if request_id is None or latency_ms is None:
+            return
+        size = self.size if self.size is not None else int(getattr(settings, "API_LATENCY_BUFFER_SIZE", 200) or 0)
+        if size <= 1:
+            record_request_latencies(request_id, [latency_ms])
+            return
+        with self._lock:
+            self._samples.setdefault((request_id, timezone.localdate()), []).append(float(latency_ms))
+            full = sum(len(values) for values in self._samples.values()) >= size
+            if not full and self._timer is None:
+                interval = self.interval
+                if interval is None:
+                    interval = float(getattr(settings, "API_LATENCY_FLUSH_INTERVAL", 5) or 0)
+                self._timer = threading.Timer(interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write the queued latencies to their sketches; returns the samples handed off."""
+        with self._lock:
+            groups = self._samples
+            self._samples = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for (request_id, day), values in groups.items():
             try:
-                recompute_automation_report_totals(automation_report)
+                record_request_latencies(request_id, values, day=day)
             except Exception:
-                pass
-        except Exception:
-            # don't let reporting failures interrupt the main run
-            pass
+                logger.exception("failed to record %s latencies for request %s", len(values), request_id)
+        return sum(len(values) for values in groups.values())
 
-    run.finished_at = timezone.now()
-    run.summary = _summarize_run(total_requests, passed_requests)
-    run.status = models.ApiRun.Status.PASSED if passed_requests == total_requests else models.ApiRun.Status.FAILED
-    run.save(update_fields=["finished_at", "summary", "status", "updated_at"])
-    # ensure any AutomationReport linked to this run has finished timestamp updated
-    try:
-        reports = models.AutomationReport.objects.filter(result_reports__run=run).distinct()
+    def _flush_from_timer(self) -> None:
+        try:
+            self.flush()
+        finally:
+            close_old_connections()
+
+
+_execute_latencies = LatencyBuffer()
+atexit.register(_execute_latencies.flush)
+
+
+def flush_request_latencies() -> int:
+    """Write the execute latencies queued in this process; returns the samples handed off."""
+    return _execute_latencies.flush()
+
+
+def buffer_request_latency(request_id: int | None, latency_ms: float | None) -> None:
+    """Queue one execute's response time for ``record_request_latencies``."""
+    _execute_latencies.add(request_id, latency_ms)
+
+
+def _recording_match_key(json_body: Any, keys: Iterable[str] | None) -> str:
+    """Hash the values at ``keys`` in ``json_body``; blank when no keys are configured."""
+    keys = [key for key in (keys or []) if key]
+    if not keys:
+        return ""
+    values = [_extract_json_segments(json_body, _split_json_path(key)) for key in keys]
+    encoded = json.dumps(values, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def find_recording(
+    *, environment: models.ApiEnvironment, method: str, url_template: str, json_body: Any = None
+) -> models.ApiRecording | None:
+    """Return the recording for this call, preferring an exact body match over a wildcard one."""
+    match_key = _recording_match_key(json_body, environment.replay_match_keys)
+    candidates = models.ApiRecording.objects.filter(
+        environment=environment,
+        method=method.upper(),
+        url_template=url_template,
+        match_key__in={match_key, ""},
+    )
+    recordings = {recording.match_key: recording for recording in candidates}
+    return recordings.get(match_key) or recordings.get("")
+
+
+def _replayed_response(recording: models.ApiRecording, url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = recording.response_status
+    response.headers = CaseInsensitiveDict(recording.response_headers or {})
+    response._content = (recording.response_body or "").encode("utf-8")
+    response.encoding = "utf-8"
+    response.reason = "Replayed"
+    response.url = url
+    response.elapsed = timedelta(milliseconds=recording.response_time_ms or 0)
+    return response
+
+
+def save_recording(
+    *,
+    environment: models.ApiEnvironment,
+    method: str,
+    url_template: str,
+    response: requests.Response,
+    elapsed_ms: float | None = None,
+    json_body: Any = None,
+    api_request: models.ApiRequest | None = None,
+) -> models.ApiRecording:
+    recording, _created = models.ApiRecording.objects.update_or_create(
+        environment=environment,
+        method=method.upper(),
+        url_template=url_template,
+        match_key=_recording_match_key(json_body, environment.replay_match_keys),
+        defaults={
+            "request": api_request,
+            "response_status": response.status_code,
+            "response_headers": dict(response.headers),
+            "response_body": response.text,
+            "response_time_ms": elapsed_ms,
+        },
+    )
+    return recording
+
+
+def send_or_replay(
+    send: Callable[[], requests.Response],
+    *,
+    environment: models.ApiEnvironment | None,
+    method: str,
+    url: str,
+    url_template: str,
+    json_body: Any = None,
+    api_request: models.ApiRequest | None = None,
+) -> requests.Response:
+    """Call ``send`` or answer from recordings, depending on the environment's replay mode.
+
+    In replay mode a missing recording raises ``requests.ConnectionError`` so callers
+    record it like any other upstream failure.
+    """
+    mode = getattr(environment, "replay_mode", models.ApiEnvironment.ReplayModes.LIVE)
+    if mode == models.ApiEnvironment.ReplayModes.REPLAY:
+        recording = find_recording(
+            environment=environment, method=method, url_template=url_template, json_body=json_body
+        )
+        if recording is None:
+            raise requests.ConnectionError(f"No recorded response for {method.upper()} {url_template}")
+        return _replayed_response(recording, url)
+
+    start = time.perf_counter()
+    response = send()
+    if mode == models.ApiEnvironment.ReplayModes.RECORD:
+        try:
+            save_recording(
+                environment=environment,
+                method=method,
+                url_template=url_template,
+                response=response,
+                elapsed_ms=(time.perf_counter() - start) * 1000,
+                json_body=json_body,
+                api_request=api_request,
+            )
+        except Exception:
+            logger.exception("failed to record response for %s %s", method, url_template)
+    return response
+
+
+# One pooled AsyncClient per event loop (a client's connections belong to the loop that
+# opened them), kept for the loop's lifetime so async executes reuse keep-alive connections.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def _async_client() -> Any:
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(follow_redirects=True)
+            _async_clients[loop] = client
+    return client
+
+
+async def asend_request(
+    *,
+    method: str,
+    url: str,
+    headers: Dict[str, Any] | None = None,
+    params: Dict[str, Any] | None = None,
+    data: Any = None,
+    json: Any = None,
+    files: Dict[str, Any] | None = None,
+    timeout: float = 30.0,
+) -> requests.Response:
+    """Send one upstream request without blocking the event loop.
+
+    Uses the event loop's pooled ``httpx`` client when installed, otherwise ``requests`` on
+    a worker thread. The reply is returned as a ``requests.Response`` and transport failures
+    are raised as ``requests.RequestException`` so callers share the synchronous handling.
+    """
+    if httpx is None:
+        return await sync_to_async(requests.request, thread_sensitive=False)(
+            method=method, url=url, headers=headers, params=params, data=data, json=json, files=files, timeout=timeout
+        )
+
+    content = None
+    if isinstance(data, (str, bytes)) or hasattr(data, "__aiter__"):
+        # Raw and streamed bodies (e.g. ``multipart.MultipartStream``) go out as-is.
+        content, data = data, None
+    try:
+        upstream = await _async_client().request(
+            method, url, headers=headers, params=params, data=data, content=content, json=json, files=files,
+            timeout=timeout,
+        )
+    except httpx.TimeoutException as exc:
+        raise requests.Timeout(str(exc)) from exc
+    except httpx.HTTPError as exc:
+        raise requests.ConnectionError(str(exc)) from exc
+
+    response = requests.Response()
+    response.status_code = upstream.status_code
+    response.headers = CaseInsensitiveDict(upstream.headers.items())
+    response._content = upstream.content
+    response.encoding = upstream.encoding
+    response.reason = upstream.reason_phrase
+    response.url = str(upstream.url)
+    return response
+
+
+def import_recordings_from_results(
+    *, environment: models.ApiEnvironment, collection: models.ApiCollection | None = None
+) -> int:
+    """Seed wildcard recordings from the latest stored result of each request.
+
+    Stored results do not keep the outbound body, so these recordings match any body;
+    recordings captured in record mode take precedence when body keys are configured.
+    """
+    results = selectors.latest_request_result_list(collection_id=collection.pk if collection is not None else None)
+    count = 0
+    for result in results:
+        models.ApiRecording.objects.update_or_create(
+            environment=environment,
+            method=result.request.method.upper(),
+            url_template=result.request.url,
+            match_key="",
+            defaults={
+                "request": result.request,
+                "response_status": result.response_status,
+                "response_headers": result.response_headers or {},
+                "response_body": result.response_body,
+                "response_time_ms": result.response_time_ms,
+            },
+        )
+        count += 1
+    return count
+
+
+_RESULT_OUTCOME_FIELDS = (
+    "status",
+    "error",
+    "response_status",
+    "response_headers",
+    "response_body",
+    "response_time_ms",
+    "assertions_passed",
+    "assertions_failed",
+)
+
+
+def _transmit_run_request(
+    payload: Dict[str, Any],
+    plan: Tuple[Dict[str, Any], ...],
+    timer: PhaseTimer,
+    send: Callable[[Callable[[], requests.Response]], requests.Response] | None = None,
+    retry_budget: circuit.RetryBudget | None = None,
+    control: run_control.RunControl | None = None,
+) -> Dict[str, Any]:
+    """Send a built payload and evaluate ``plan`` against the response.
+
+    The upstream call goes through the host's circuit breaker and may spend retries
+    from ``retry_budget``; with a ``control`` it is also bounded by the run's deadline
+    and aborted on cancellation. Touches the database only through ``send`` (e.g.
+    ``send_or_replay``), so it can run on a worker thread when ``send`` is omitted.
+    """
+    http = control.request if control is not None else requests.request
+
+    def request() -> requests.Response:
+        return circuit.call(
+            payload["url"],
+            lambda: http(
+                method=payload["method"],
+                url=payload["url"],
+                headers=payload["headers"],
+                params=payload["params"],
+                data=payload["data"],
+                json=payload["json"],
+                auth=payload["auth"],
+                timeout=payload["timeout"],
+            ),
+            budget=retry_budget,
+        )
+
+    start = time.perf_counter()
+    try:
+        response = send(request) if send is not None else request()
+    except requests.RequestException as exc:
+        timer.add_since("upstream", start)
+        return {"status": models.ApiRunResult.Status.ERROR, "error": str(exc), "success": False}
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    timer.add("upstream", elapsed_ms)
+    with timer.phase("parse"):
+        parsed = ParsedResponse(response)
+        response_body = parsed.body
+    with timer.phase("assertions"):
+        success, passed, failed = _run_assertion_plan(plan, parsed)
+    return {
+        "status": models.ApiRunResult.Status.PASSED if success else models.ApiRunResult.Status.FAILED,
+        "success": success,
+        "parsed": parsed,
+        "response_status": response.status_code,
+        "response_headers": parsed.headers_dict,
+        "response_body": response_body,
+        "response_time_ms": elapsed_ms,
+        "assertions_passed": passed,
+        "assertions_failed": failed,
+    }
+
+
+def _send_or_replay_payload(
+    request: Callable[[], requests.Response],
+    *,
+    payload: Dict[str, Any],
+    environment: models.ApiEnvironment | None,
+    api_request: models.ApiRequest,
+) -> requests.Response:
+    return send_or_replay(
+        request,
+        environment=environment,
+        method=payload["method"],
+        url=payload["url"],
+        url_template=api_request.url,
+        json_body=payload["json"],
+        api_request=api_request,
+    )
+
+
+def _apply_run_outcome(result: models.ApiRunResult, outcome: Dict[str, Any]) -> None:
+    for field in _RESULT_OUTCOME_FIELDS:
+        if field in outcome:
+            setattr(result, field, outcome[field])
+
+
+def _send_run_request(
+    *,
+    result: models.ApiRunResult,
+    api_request: models.ApiRequest,
+    variables: Dict[str, Any],
+    environment: models.ApiEnvironment | None,
+    timer: PhaseTimer,
+    retry_budget: circuit.RetryBudget | None = None,
+    control: run_control.RunControl | None = None,
+) -> Tuple[ParsedResponse | None, bool, float | None]:
+    """Send ``api_request`` and fill ``result`` (unsaved) with the response and assertion outcome.
+
+    Returns the parsed response, whether the assertions passed and the upstream time;
+    the response is ``None`` on transport errors. Raises ``ValueError`` when the
+    request payload cannot be built.
+    """
+    with timer.phase("resolve"):
+        payload = _build_request_payload(api_request, variables, environment, timer)
+    with timer.phase("assertions"):
+        plan = compile_assertion_plan(api_request.assertions.all())
+    outcome = _transmit_run_request(
+        payload,
+        plan,
+        timer,
+        send=partial(_send_or_replay_payload, payload=payload, environment=environment, api_request=api_request),
+        retry_budget=retry_budget,
+        control=control,
+    )
+    _apply_run_outcome(result, outcome)
+    return outcome.get("parsed"), outcome["success"], outcome.get("response_time_ms")
+
+
+def run_collection(
+    *,
+    collection: models.ApiCollection,
+    environment: models.ApiEnvironment | None = None,
+    overrides: Dict[str, Any] | None = None,
+    user: Any = None,
+    deadline_at: datetime | None = None,
+) -> models.ApiRun:
+    """Run every request of ``collection`` in order on a new ``ApiRun``.
+
+    Once the run is cancelled (see ``cancel_run``) or passes ``deadline_at``, in-flight
+    calls are aborted and the remaining requests are recorded as errors without being sent.
+
+    The ``ApiRun`` row is committed up front so the cancel endpoint and the run's watcher
+    can see it; the result writes happen in one transaction, and if the run crashes they
+    are rolled back and the run is closed as failed instead of being left running.
+    """
+    variables: Dict[str, Any] = {}
+    if environment:
+        variables.update(environment.variables or {})
+    if overrides:
+        variables.update(overrides)
+
+    run = models.ApiRun.objects.create(
+        collection=collection,
+        environment=environment,
+        triggered_by=user,
+        status=models.ApiRun.Status.RUNNING,
+        started_at=timezone.now(),
+        deadline_at=deadline_at,
+    )
+
+    try:
+        return _execute_collection_run(run, collection=collection, variables=variables, environment=environment)
+    except Exception as exc:
+        _close_crashed_run(run, exc)
+        raise
+
+
+def _close_crashed_run(run: models.ApiRun, exc: Exception) -> None:
+    models.ApiRun.objects.filter(pk=run.pk, status=models.ApiRun.Status.RUNNING).update(
+        status=models.ApiRun.Status.FAILED,
+        finished_at=timezone.now(),
+        summary={"error": str(exc) or exc.__class__.__name__},
+        updated_at=timezone.now(),
+    )
+
+
+@transaction.atomic
+def _execute_collection_run(
+    run: models.ApiRun,
+    *,
+    collection: models.ApiCollection,
+    variables: Dict[str, Any],
+    environment: models.ApiEnvironment | None,
+) -> models.ApiRun:
+    total_requests = 0
+    passed_requests = 0
+    latencies: Dict[int, List[float]] = {}
+    timed_results: List[models.ApiRunResult] = []
+    retry_budget = circuit.RetryBudget()
+
+    with run_control.RunControl(run) as control:
+        for order, api_request in enumerate(collection.requests.all(), start=1):
+            total_requests += 1
+            timer = PhaseTimer()
+            with timer.phase("persist"):
+                result = models.ApiRunResult.objects.create(
+                    run=run,
+                    request=api_request,
+                    order=order,
+                    status=models.ApiRunResult.Status.ERROR,
+                )
+            timed_results.append(result)
+            if control.stopped:
+                result.error = control.reason
+            else:
+                try:
+                    _parsed, success, elapsed_ms = _send_run_request(
+                        result=result,
+                        api_request=api_request,
+                        variables=variables,
+                        environment=environment,
+                        timer=timer,
+                        retry_budget=retry_budget,
+                        control=control,
+                    )
+                except ValueError as exc:
+                    result.error = str(exc)
+                    result.phase_timings = timer.as_dict()
+                    result.save(update_fields=["error", "phase_timings", "updated_at"])
+                    continue
+                if elapsed_ms is not None:
+                    latencies.setdefault(api_request.pk, []).append(elapsed_ms)
+                if success:
+                    passed_requests += 1
+
+            persist_started = time.perf_counter()
+            result.save()
+            # mirror saved result into report table (non-blocking)
+            try:
+                tc = None
+                try:
+                    tc = api_request.test_cases.first()
+                except Exception:
+                    tc = None
+                # find or create an AutomationReport for this run
+                automation_report = None
+                try:
+                    # prefer an AutomationReport already linked to this run
+                    automation_report = models.AutomationReport.objects.filter(report_id__isnull=False, started=run.started_at).first()
+                    if not automation_report:
+                        # try to find by same triggered_by and collection name
+                        if run.triggered_by or run.collection:
+                            triggered_in = run.collection.name if run.collection else ""
+                            automation_report = models.AutomationReport.objects.filter(triggered_by=run.triggered_by, triggered_in=triggered_in, started__date=run.started_at.date() if run.started_at else None).first()
+                    if not automation_report:
+                        automation_report = models.AutomationReport.objects.create(
+                            triggered_in=(run.collection.name if run.collection else ""),
+                            triggered_by=run.triggered_by,
+                            started=run.started_at,
+                        )
+                except Exception:
+                    automation_report = None
+
+                models.ApiRunResultReport.objects.create(
+                    run=run,
+                    request=api_request,
+                    result=result,
+                    order=result.order,
+                    status=result.status,
+                    testcase=tc,
+                    automation_report=automation_report,
+                )
+                # recompute report totals based on test case results
+                try:
+                    recompute_automation_report_totals(automation_report)
+                except Exception:
+                    pass
+            except Exception:
+                # don't let reporting failures interrupt the main run
+                pass
+            timer.add_since("persist", persist_started)
+            result.phase_timings = timer.as_dict()
+
+    # Timings include the report writes above, so they are stored in one pass at the end.
+    models.ApiRunResult.objects.bulk_update(timed_results, ["phase_timings"])
+
+    for request_id, values in latencies.items():
+        try:
+            record_request_latencies(request_id, values)
+        except Exception:
+            # latency history is best-effort and must not fail the run
+            pass
+
+    run.finished_at = timezone.now()
+    run.summary = _summarize_run(total_requests, passed_requests)
+    if control.reason:
+        run.summary["stopped"] = control.reason
+    run.status = _final_run_status(passed_requests == total_requests, control)
+    run.save(update_fields=["finished_at", "summary", "status", "updated_at"])
+    # ensure any AutomationReport linked to this run has finished timestamp updated
+    try:
+        reports = models.AutomationReport.objects.filter(result_reports__run=run).distinct()
         for r in reports:
             try:
                 if run.finished_at and (not r.finished or run.finished_at > r.finished):
@@ -1029,6 +1897,1023 @@ def run_collection(
     return run
 
 
+def _split_dependency_path(path: str) -> List[str]:
+    """Split ``data.items[0].token`` style paths the same way the UI runner does."""
+    segments: List[str] = []
+    for segment in (path or "").split("."):
+        segment = segment.strip()
+        if not segment:
+            continue
+        parts = [part.strip() for part in re.split(r"\[|\]", segment) if part.strip()]
+        segments.extend(parts or [segment])
+    return segments
+
+
+def _dependency_override_key(path: str) -> str:
+    segments = _split_dependency_path(path)
+    if not segments:
+        return "dependency_value"
+
+    def clean(segment: str) -> str:
+        return re.sub(r"[^a-zA-Z0-9_]", "_", segment).strip("_")
+
+    candidate = clean(segments[-1])
+    if not candidate or candidate.isdigit():
+        candidate = "_".join(part for part in (clean(segment) for segment in segments) if part)
+    return candidate or "dependency_value"
+
+
+def dependency_overrides(key_path: str, response_json: Any) -> Dict[str, Any] | None:
+    """Overrides handed to a dependent case: ``dependency_value`` plus a key named after the path.
+
+    Returns ``None`` when ``key_path`` is not present in ``response_json``.
+    """
+    current = response_json
+    for segment in _split_dependency_path(key_path):
+        if isinstance(current, list):
+            try:
+                index = int(segment)
+            except ValueError:
+                return None
+            if index < 0 or index >= len(current):
+                return None
+            current = current[index]
+        elif isinstance(current, dict) and segment in current:
+            current = current[segment]
+        else:
+            return None
+    if not _split_dependency_path(key_path):
+        return None
+    value = current
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return {"dependency_value": value, _dependency_override_key(key_path): value}
+
+
+class _BatchOutcome:
+    __slots__ = ("result", "parsed", "success")
+
+    def __init__(self, result: models.ApiRunResult, parsed: ParsedResponse | None, success: bool) -> None:
+        self.result = result
+        self.parsed = parsed
+        self.success = success
+
+
+def _batch_closure(selected: List[models.TestCase]) -> List[models.TestCase]:
+    """``selected`` plus every transitive dependency, dependencies first."""
+    cases_by_id: Dict[int, models.TestCase] = {case.pk: case for case in selected}
+    ordered: List[models.TestCase] = []
+    seen: set[int] = set()
+    for case in selected:
+        chain: List[models.TestCase] = []
+        current: models.TestCase | None = case
+        while current is not None and current.pk not in seen:
+            seen.add(current.pk)
+            chain.append(current)
+            dependency_id = current.test_case_dependency_id
+            if not dependency_id:
+                break
+            if dependency_id not in cases_by_id:
+                dependency = (
+                    models.TestCase.objects.select_related("related_api_request").filter(pk=dependency_id).first()
+                )
+                if dependency is None:
+                    break
+                cases_by_id[dependency_id] = dependency
+            current = cases_by_id[dependency_id]
+        ordered.extend(reversed(chain))
+    return ordered
+
+
+def batch_duration_estimates(test_cases: Iterable[models.TestCase]) -> Dict[int, float]:
+    """Expected milliseconds per test case from recent results; unseen cases get a default."""
+    test_cases = list(test_cases)
+    window = getattr(settings, "API_BATCH_ESTIMATE_WINDOW_DAYS", 30)
+    history = selectors.test_case_duration_estimates(
+        testcase_ids=[case.pk for case in test_cases],
+        since=timezone.now() - timedelta(days=window) if window else None,
+    )
+    default = float(getattr(settings, "API_BATCH_DEFAULT_ESTIMATE_MS", 1000))
+    return {case.pk: history.get(case.pk, default) for case in test_cases}
+
+
+def _critical_path_lengths(test_cases: List[models.TestCase], estimates: Dict[int, float]) -> Dict[int, float]:
+    """Each case's estimate plus the longest chain of dependents that waits on it."""
+    dependents: Dict[int, List[int]] = {}
+    for case in test_cases:
+        if case.test_case_dependency_id is not None:
+            dependents.setdefault(case.test_case_dependency_id, []).append(case.pk)
+    lengths: Dict[int, float] = {}
+
+    def length(pk: int, visiting: set[int]) -> float:
+        if pk in lengths:
+            return lengths[pk]
+        if pk in visiting:  # cycles are blocked by the scheduler; stop the walk here
+            return 0.0
+        visiting.add(pk)
+        tail = max((length(child, visiting) for child in dependents.get(pk, ())), default=0.0)
+        visiting.discard(pk)
+        lengths[pk] = estimates.get(pk, 0.0) + tail
+        return lengths[pk]
+
+    for case in test_cases:
+        length(case.pk, set())
+    return lengths
+
+
+def run_test_case_batch(
+    *,
+    test_cases: Iterable[models.TestCase],
+    environment: models.ApiEnvironment | None = None,
+    overrides: Dict[str, Any] | None = None,
+    user: Any = None,
+    automation_report: models.AutomationReport | None = None,
+    triggered_in: str = "",
+    max_workers: int | None = None,
+    on_result: Callable[[models.TestCase, models.ApiRunResult], None] | None = None,
+    finalize_report: bool = True,
+    deadline_at: datetime | None = None,
+) -> models.ApiRun:
+    """Run test cases through their related API requests on one ``ApiRun``.
+
+    A case with a ``test_case_dependency`` runs after that dependency and
+    receives the value at ``dependency_response_key`` as overrides. Every case runs
+    at most once per batch, so a dependency shared by many cases (a login call, say)
+    runs once and its outcome fans out to every dependent; ``shared_executions`` in
+    the summary counts the dependents served that way. Dependencies outside the
+    selection are pulled in automatically.
+
+    Cases whose dependencies are settled run on a pool of ``max_workers`` threads
+    (default ``API_BATCH_MAX_WORKERS``), longest remaining critical path first by
+    historical duration (see ``batch_duration_estimates``). Only the upstream calls
+    run on the pool; all database work stays on the calling thread. ``on_result`` is called
+    with each test case and its saved result as soon as it completes. With
+    ``finalize_report=False`` the report totals are refreshed but ``finished`` is
+    left unset, so other runs can still add to it.
+
+    Cancelling the run (``cancel_run``) or passing ``deadline_at`` aborts in-flight
+    calls and records every case that has not finished as blocked. As in ``run_collection``
+    the result writes share one transaction; if the batch crashes they are rolled back, the
+    run is closed as failed and the report is still finished.
+    """
+    base_variables: Dict[str, Any] = {}
+    if environment:
+        base_variables.update(environment.variables or {})
+    if overrides:
+        base_variables.update(overrides)
+
+    run = models.ApiRun.objects.create(
+        environment=environment,
+        triggered_by=user,
+        status=models.ApiRun.Status.RUNNING,
+        started_at=timezone.now(),
+        deadline_at=deadline_at,
+    )
+    if automation_report is None:
+        automation_report = models.AutomationReport.objects.create(
+            triggered_in=triggered_in, triggered_by=user, started=run.started_at
+        )
+
+    try:
+        return _execute_test_case_batch(
+            run,
+            automation_report=automation_report,
+            test_cases=test_cases,
+            base_variables=base_variables,
+            environment=environment,
+            max_workers=max_workers,
+            on_result=on_result,
+            finalize_report=finalize_report,
+        )
+    except Exception as exc:
+        _close_crashed_run(run, exc)
+        _finish_batch_report(automation_report, timezone.now(), finalize=finalize_report)
+        raise
+
+
+def _finish_batch_report(
+    automation_report: models.AutomationReport, finished_at: datetime, *, finalize: bool
+) -> None:
+    try:
+        recompute_automation_report_totals(automation_report)
+        if finalize and (not automation_report.finished or finished_at > automation_report.finished):
+            automation_report.finished = finished_at
+            automation_report.save(update_fields=["finished"])
+    except Exception:
+        logger.exception("failed to finish automation report %s", automation_report.pk)
+
+
+@transaction.atomic
+def _execute_test_case_batch(
+    run: models.ApiRun,
+    *,
+    automation_report: models.AutomationReport,
+    test_cases: Iterable[models.TestCase],
+    base_variables: Dict[str, Any],
+    environment: models.ApiEnvironment | None,
+    max_workers: int | None,
+    on_result: Callable[[models.TestCase, models.ApiRunResult], None] | None,
+    finalize_report: bool,
+) -> models.ApiRun:
+    pending = _batch_closure(list(test_cases))
+    outcomes: Dict[int, _BatchOutcome] = {}
+    shared_executions = 0
+    latencies: Dict[int, List[float]] = {}
+    reports: List[models.ApiRunResultReport] = []
+    timed_results: List[models.ApiRunResult] = []
+    retry_budget = circuit.RetryBudget()
+
+    # Record/replay reads and writes recordings, so only live environments go to the pool.
+    live = getattr(environment, "replay_mode", models.ApiEnvironment.ReplayModes.LIVE) == (
+        models.ApiEnvironment.ReplayModes.LIVE
+    )
+    workers = max_workers or getattr(settings, "API_BATCH_MAX_WORKERS", 4)
+    workers = max(1, int(workers)) if live else 1
+
+    def new_result(api_request: models.ApiRequest | None, **fields: Any) -> models.ApiRunResult:
+        result = models.ApiRunResult.objects.create(
+            run=run, request=api_request, order=len(timed_results) + 1, **fields
+        )
+        timed_results.append(result)
+        return result
+
+    def finish(test_case: models.TestCase, outcome: _BatchOutcome) -> _BatchOutcome:
+        reports.append(
+            models.ApiRunResultReport(
+                run=run,
+                request=outcome.result.request,
+                result=outcome.result,
+                order=outcome.result.order,
+                status=outcome.result.status,
+                testcase=test_case,
+                automation_report=automation_report,
+            )
+        )
+        outcomes[test_case.pk] = outcome
+        if on_result is not None:
+            on_result(test_case, outcome.result)
+        return outcome
+
+    def blocked(test_case: models.TestCase, reason: str) -> _BatchOutcome:
+        result = new_result(test_case.related_api_request, status=models.ApiRunResult.Status.ERROR, error=reason)
+        return finish(test_case, _BatchOutcome(result, None, False))
+
+    def case_variables(test_case: models.TestCase) -> Dict[str, Any] | str:
+        """Effective variables for ``test_case``, or the reason it cannot run."""
+        nonlocal shared_executions
+        variables = dict(base_variables)
+        if not (test_case.requires_dependency or test_case.test_case_dependency_id):
+            return variables
+        upstream = outcomes.get(test_case.test_case_dependency_id) if test_case.test_case_dependency_id else None
+        if upstream is None:
+            return "Dependency test case not configured."
+        dependency = cases_by_id.get(test_case.test_case_dependency_id)
+        label = getattr(dependency, "title", "") or f"case {test_case.test_case_dependency_id}"
+        if not upstream.success or upstream.parsed is None:
+            return f"Dependency {label} has not completed successfully."
+        extra = dependency_overrides(test_case.dependency_response_key, upstream.parsed.json)
+        if extra is None:
+            return f'Dependency key "{test_case.dependency_response_key}" not found in {label}.'
+        variables.update(extra)
+        shared_executions += 1
+        return variables
+
+    cases_by_id = {case.pk: case for case in pending}
+    estimates = batch_duration_estimates(pending)
+    path_lengths = _critical_path_lengths(pending, estimates)
+    dependents: Dict[int, List[models.TestCase]] = {}
+    for case in pending:
+        if case.test_case_dependency_id in cases_by_id:
+            dependents.setdefault(case.test_case_dependency_id, []).append(case)
+    position = {case.pk: index for index, case in enumerate(pending)}
+    ready: List[Tuple[float, float, int, int]] = []
+
+    def make_ready(test_case: models.TestCase) -> None:
+        # Longest remaining critical path first, then longest own duration, then selection order.
+        heapq.heappush(
+            ready, (-path_lengths[test_case.pk], -estimates[test_case.pk], position[test_case.pk], test_case.pk)
+        )
+
+    def settle(test_case: models.TestCase) -> None:
+        for dependent in dependents.get(test_case.pk, ()):
+            make_ready(dependent)
+
+    def start(test_case: models.TestCase) -> Tuple[Any, ...] | None:
+        """Prepare ``test_case`` on this thread; returns a job to transmit, or ``None`` when settled."""
+        variables = case_variables(test_case)
+        if isinstance(variables, str):
+            blocked(test_case, variables)
+            settle(test_case)
+            return None
+        api_request = test_case.related_api_request
+        if api_request is None:
+            blocked(test_case, "No related API request configured.")
+            settle(test_case)
+            return None
+
+        timer = PhaseTimer()
+        with timer.phase("persist"):
+            result = new_result(api_request, status=models.ApiRunResult.Status.ERROR)
+        try:
+            with timer.phase("resolve"):
+                payload = _build_request_payload(api_request, variables, environment, timer)
+        except ValueError as exc:
+            result.error = str(exc)
+            result.save(update_fields=["error", "updated_at"])
+            finish(test_case, _BatchOutcome(result, None, False))
+            settle(test_case)
+            return None
+        with timer.phase("assertions"):
+            plan = compile_assertion_plan(api_request.assertions.all())
+        send = None
+        if not live:
+            send = partial(_send_or_replay_payload, payload=payload, environment=environment, api_request=api_request)
+        return test_case, result, timer, payload, plan, send
+
+    def complete(job: Tuple[Any, ...], outcome: Dict[str, Any]) -> None:
+        test_case, result, timer = job[:3]
+        _apply_run_outcome(result, outcome)
+        if outcome.get("response_time_ms") is not None:
+            latencies.setdefault(result.request_id, []).append(outcome["response_time_ms"])
+        with timer.phase("persist"):
+            result.save()
+        result.phase_timings = timer.as_dict()
+        finish(test_case, _BatchOutcome(result, outcome.get("parsed"), outcome["success"]))
+        settle(test_case)
+
+    for case in pending:
+        if case.test_case_dependency_id not in cases_by_id:
+            make_ready(case)
+
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    in_flight: Dict[Any, Tuple[Any, ...]] = {}
+    with run_control.RunControl(run) as control:
+        try:
+            while (ready and not control.stopped) or in_flight:
+                while ready and len(in_flight) < workers and not control.stopped:
+                    job = start(cases_by_id[heapq.heappop(ready)[-1]])
+                    if job is None:
+                        continue
+                    _case, _result, timer, payload, plan, send = job
+                    transmit = partial(
+                        _transmit_run_request, payload, plan, timer, retry_budget=retry_budget, control=control
+                    )
+                    if executor is None:
+                        complete(job, transmit(send))
+                    else:
+                        in_flight[executor.submit(transmit)] = job
+                if in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        complete(in_flight.pop(future), future.result())
+            for test_case in pending:
+                if test_case.pk not in outcomes:
+                    blocked(test_case, control.reason or "Dependency cycle detected.")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
+
+    models.ApiRunResultReport.objects.bulk_create(reports)
+    models.ApiRunResult.objects.bulk_update(timed_results, ["phase_timings"])
+    for request_id, values in latencies.items():
+        try:
+            record_request_latencies(request_id, values)
+        except Exception:
+            # latency history is best-effort and must not fail the run
+            pass
+
+    total = len(timed_results)
+    passed = sum(1 for result in timed_results if result.status == models.ApiRunResult.Status.PASSED)
+    run.finished_at = timezone.now()
+    run.summary = {**_summarize_run(total, passed), "shared_executions": shared_executions, "workers": workers}
+    if control.reason:
+        run.summary["stopped"] = control.reason
+    run.status = _final_run_status(bool(total) and passed == total, control)
+    run.save(update_fields=["finished_at", "summary", "status", "updated_at"])
+
+    _finish_batch_report(automation_report, run.finished_at, finalize=finalize_report)
+    return run
+
+
+SCHEDULED_RUN_TASK = "apps.core.tasks.trigger_scheduled_run"
+PLAN_SELECTION_KEYS = ("project_ids", "module_ids", "scenario_ids", "testcase_ids")
+
+
+def parse_cron_expression(expression: str) -> Dict[str, str]:
+    """Split a five-field cron expression into ``CrontabSchedule`` fields."""
+    parts = str(expression or "").split()
+    if len(parts) != 5:
+        raise ValueError("Cron expression must have five fields: minute hour day-of-month month day-of-week.")
+    minute, hour, day_of_month, month_of_year, day_of_week = parts
+    return {
+        "minute": minute,
+        "hour": hour,
+        "day_of_month": day_of_month,
+        "month_of_year": month_of_year,
+        "day_of_week": day_of_week,
+    }
+
+
+def plan_selection_filters(selection: Dict[str, Any] | None) -> Dict[str, List[int]]:
+    """Normalize a selection payload into ``selectors.automated_test_case_list`` filters."""
+    filters: Dict[str, List[int]] = {}
+    for key in PLAN_SELECTION_KEYS:
+        value = (selection or {}).get(key)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        ids = []
+        for item in values:
+            try:
+                ids.append(int(item))
+            except (TypeError, ValueError):
+                continue
+        if ids:
+            filters[key] = ids
+    return filters
+
+
+def scheduled_run_sync_periodic_task(schedule: models.ScheduledRun) -> None:
+    """Create or update the celery beat entry that triggers ``schedule``."""
+    from django_celery_beat.models import CrontabSchedule, PeriodicTask
+
+    crontab, _ = CrontabSchedule.objects.get_or_create(
+        **parse_cron_expression(schedule.cron), timezone=settings.TIME_ZONE
+    )
+    task = schedule.periodic_task or PeriodicTask(name=f"core-scheduled-run-{schedule.pk}")
+    task.task = SCHEDULED_RUN_TASK
+    task.crontab = crontab
+    task.args = json.dumps([schedule.pk])
+    task.enabled = schedule.is_active
+    task.description = schedule.name
+    task.save()
+    if schedule.periodic_task_id != task.pk:
+        models.ScheduledRun.objects.filter(pk=schedule.pk).update(periodic_task=task)
+        schedule.periodic_task = task
+
+
+def _scheduled_run_active(schedule: models.ScheduledRun, now: Any) -> bool:
+    """Whether ``schedule`` holds a run slot; claims older than the stale window are ignored."""
+    if schedule.running_since is None:
+        return False
+    stale_after = timedelta(seconds=getattr(settings, "SCHEDULED_RUN_STALE_SECONDS", 3600))
+    return now - schedule.running_since < stale_after
+
+
+def claim_scheduled_run(schedule_id: int) -> str:
+    """Try to start ``schedule_id``; returns ``claimed``, ``coalesced``, ``capped`` or ``inactive``.
+
+    A trigger that finds the schedule already running (``coalesced``) or the global
+    ``SCHEDULED_RUN_MAX_CONCURRENT`` cap reached (``capped``) is folded into a single
+    ``rerun_requested`` flag instead of queueing another run.
+    """
+    now = timezone.now()
+    cap = int(getattr(settings, "SCHEDULED_RUN_MAX_CONCURRENT", 0) or 0)
+    with transaction.atomic():
+        # Locking every candidate row serializes claims, so the cap holds across workers.
+        rows = list(
+            models.ScheduledRun.objects.select_for_update()
+            .filter(Q(is_active=True) | Q(running_since__isnull=False) | Q(pk=schedule_id))
+            .order_by("pk")
+        )
+        schedule = next((row for row in rows if row.pk == schedule_id), None)
+        if schedule is None or not schedule.is_active:
+            return "inactive"
+        if _scheduled_run_active(schedule, now):
+            outcome = "coalesced"
+        elif cap and sum(1 for row in rows if _scheduled_run_active(row, now)) >= cap:
+            outcome = "capped"
+        else:
+            models.ScheduledRun.objects.filter(pk=schedule_id).update(
+                running_since=now, rerun_requested=False, last_triggered_at=now
+            )
+            return "claimed"
+        models.ScheduledRun.objects.filter(pk=schedule_id).update(
+            rerun_requested=True, coalesced_count=F("coalesced_count") + 1
+        )
+        return outcome
+
+
+def release_scheduled_run(schedule_id: int, run: models.ApiRun | None = None) -> None:
+    fields: Dict[str, Any] = {"running_since": None, "last_finished_at": timezone.now()}
+    if run is not None:
+        fields["last_run"] = run
+    models.ScheduledRun.objects.filter(pk=schedule_id).update(**fields)
+    dispatch_pending_scheduled_runs()
+
+
+def dispatch_pending_scheduled_runs() -> List[int]:
+    """Queue one follow-up run for coalesced schedules while cap slots are free."""
+    from . import tasks
+
+    now = timezone.now()
+    cap = int(getattr(settings, "SCHEDULED_RUN_MAX_CONCURRENT", 0) or 0)
+    running = models.ScheduledRun.objects.filter(running_since__isnull=False)
+    free = cap - sum(1 for schedule in running if _scheduled_run_active(schedule, now)) if cap else None
+    pending = models.ScheduledRun.objects.filter(is_active=True, rerun_requested=True).order_by(
+        F("last_triggered_at").asc(nulls_first=True), "pk"
+    )
+    dispatched: List[int] = []
+    for schedule in pending:
+        if free is not None and len(dispatched) >= free:
+            break
+        if _scheduled_run_active(schedule, now):
+            continue
+        # Clearing the flag first keeps concurrent finishers from queueing the same follow-up.
+        if models.ScheduledRun.objects.filter(pk=schedule.pk, rerun_requested=True).update(rerun_requested=False):
+            tasks.trigger_scheduled_run.delay(schedule.pk)
+            dispatched.append(schedule.pk)
+    return dispatched
+
+
+def run_scheduled_plan(schedule_id: int) -> Dict[str, Any]:
+    """Claim and execute one scheduled run; see ``claim_scheduled_run`` for coalescing."""
+    outcome = claim_scheduled_run(schedule_id)
+    if outcome != "claimed":
+        logger.info("scheduled run %s not started: %s", schedule_id, outcome)
+        return {"schedule": schedule_id, "outcome": outcome}
+
+    run = None
+    try:
+        schedule = models.ScheduledRun.objects.select_related("environment", "created_by").get(pk=schedule_id)
+        filters = plan_selection_filters(schedule.selection)
+        test_cases = list(selectors.automated_test_case_list(**filters)) if filters else []
+        if test_cases:
+            run = run_test_case_batch(
+                test_cases=test_cases,
+                environment=schedule.environment,
+                overrides=schedule.overrides or {},
+                user=schedule.created_by,
+                triggered_in=f"Schedule: {schedule.name}",
+                deadline_at=run_deadline(schedule.deadline_seconds or None),
+            )
+    finally:
+        release_scheduled_run(schedule_id, run)
+    return {"schedule": schedule_id, "outcome": "ran", "run_id": getattr(run, "pk", None)}
+
+
+def plan_batch_shards(test_cases: Iterable[models.TestCase], shard_count: int) -> List[List[models.TestCase]]:
+    """Split a batch into at most ``shard_count`` shards of whole scenarios.
+
+    Cases in one scenario, and cases linked by a dependency chain (including
+    dependencies pulled in from outside the selection), always land in the same
+    shard. Groups are placed largest first onto the smallest shard.
+    """
+    cases = _batch_closure(list(test_cases))
+    parent: Dict[int, int] = {case.pk: case.pk for case in cases}
+
+    def find(pk: int) -> int:
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    def union(left: int, right: int) -> None:
+        parent[find(left)] = find(right)
+
+    first_in_scenario: Dict[int, int] = {}
+    for case in cases:
+        anchor = first_in_scenario.setdefault(case.scenario_id, case.pk)
+        union(case.pk, anchor)
+        if case.test_case_dependency_id in parent:
+            union(case.pk, case.test_case_dependency_id)
+
+    groups: Dict[int, List[models.TestCase]] = {}
+    for case in cases:
+        groups.setdefault(find(case.pk), []).append(case)
+
+    shards: List[List[models.TestCase]] = [[] for _ in range(max(1, min(int(shard_count), len(groups))))]
+    for group in sorted(groups.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    return [shard for shard in shards if shard]
+
+
+def dispatch_sharded_batch(
+    *,
+    test_cases: Iterable[models.TestCase],
+    shard_count: int,
+    environment: models.ApiEnvironment | None = None,
+    overrides: Dict[str, Any] | None = None,
+    user: Any = None,
+    triggered_in: str = "",
+    deadline_at: datetime | None = None,
+) -> Tuple[models.AutomationReport, List[List[int]]]:
+    """Run a batch as celery shards that all report into one new ``AutomationReport``.
+
+    Shards run as a chord; ``finalize_sharded_batch`` recomputes the report totals
+    once every shard has finished. If a shard fails the chord callback never runs, so
+    ``abort_sharded_batch`` is attached as its errback and finishes the report instead
+    (the failed shard has already closed its own run). Every shard stops at the shared
+    ``deadline_at``. Returns the report and the test case ids per shard.
+    """
+    from celery import chord
+
+    from . import tasks
+
+    shards = [[case.pk for case in shard] for shard in plan_batch_shards(test_cases, shard_count)]
+    report = models.AutomationReport.objects.create(
+        triggered_in=triggered_in, triggered_by=user, started=timezone.now()
+    )
+    header = [
+        tasks.run_batch_shard.s(
+            report.pk,
+            testcase_ids,
+            environment_id=getattr(environment, "pk", None),
+            overrides=overrides or {},
+            user_id=getattr(user, "pk", None),
+            shard_index=index,
+            deadline_at=deadline_at.isoformat() if deadline_at else None,
+        )
+        for index, testcase_ids in enumerate(shards)
+    ]
+    # Rows must be visible to workers before the shards start.
+    callback = tasks.finalize_sharded_batch.s(report.pk).on_error(tasks.abort_sharded_batch.si(report.pk))
+    transaction.on_commit(lambda: chord(header)(callback))
+    return report, shards
+
+
+def run_batch_shard(
+    *,
+    automation_report_id: int,
+    testcase_ids: List[int],
+    environment_id: int | None = None,
+    overrides: Dict[str, Any] | None = None,
+    user_id: int | None = None,
+    shard_index: int = 0,
+    deadline_at: str | None = None,
+) -> Dict[str, Any]:
+    """Execute one shard of a sharded batch; see ``dispatch_sharded_batch``."""
+    from django.contrib.auth import get_user_model
+
+    report = models.AutomationReport.objects.get(pk=automation_report_id)
+    cases_by_id = {
+        case.pk: case
+        for case in models.TestCase.objects.select_related("scenario", "related_api_request").filter(pk__in=testcase_ids)
+    }
+    environment = models.ApiEnvironment.objects.filter(pk=environment_id).first() if environment_id else None
+    user = get_user_model().objects.filter(pk=user_id).first() if user_id else None
+    run = run_test_case_batch(
+        test_cases=[cases_by_id[pk] for pk in testcase_ids if pk in cases_by_id],
+        environment=environment,
+        overrides=overrides,
+        user=user,
+        automation_report=report,
+        finalize_report=False,
+        deadline_at=parse_datetime(deadline_at) if deadline_at else None,
+    )
+    summary = dict(run.summary or {})
+    return {
+        "shard": shard_index,
+        "run_id": run.pk,
+        "status": run.status,
+        "total": summary.get("total_requests", 0),
+        "passed": summary.get("passed_requests", 0),
+    }
+
+
+def abort_sharded_batch(automation_report_id: int) -> None:
+    """Finish a sharded report with the totals of the shards that did report back."""
+    report = models.AutomationReport.objects.get(pk=automation_report_id)
+    _finish_batch_report(report, timezone.now(), finalize=True)
+
+
+def finalize_sharded_batch(automation_report_id: int, shard_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Recompute a sharded report's totals once every shard has reported back."""
+    report = models.AutomationReport.objects.get(pk=automation_report_id)
+    recompute_automation_report_totals(report)
+    run_ids = [result["run_id"] for result in shard_results if result.get("run_id")]
+    finished = (
+        models.ApiRun.objects.filter(pk__in=run_ids).order_by("-finished_at").values_list("finished_at", flat=True).first()
+    )
+    report.finished = finished or timezone.now()
+    report.save(update_fields=["finished"])
+    return {
+        "automation_report_id": report.pk,
+        "shards": len(shard_results),
+        "runs": run_ids,
+        "total": sum(result.get("total", 0) for result in shard_results),
+        "passed": sum(result.get("passed", 0) for result in shard_results),
+    }
+
+
+def parse_dataset_rows(content: str, source_format: str) -> List[Dict[str, Any]]:
+    """Parse CSV text or a JSON array of objects into dataset rows."""
+    text = (content or "").strip()
+    if not text:
+        return []
+    if source_format == models.ApiDataset.Formats.CSV:
+        reader = csv.DictReader(io.StringIO(text))
+        return [{key.strip(): value for key, value in row.items() if key} for row in reader]
+    try:
+        parsed = json.loads(text)
+    except ValueError as error:
+        raise ValueError(f"Invalid JSON dataset: {error}") from error
+    if isinstance(parsed, dict):
+        parsed = parsed.get("rows")
+    if not isinstance(parsed, list) or not all(isinstance(row, dict) for row in parsed):
+        raise ValueError("JSON dataset must be an array of objects.")
+    return parsed
+
+
+def _execute_dataset_row(
+    session: requests.Session,
+    payload: Dict[str, Any],
+    plan: Tuple[Dict[str, Any], ...],
+) -> Dict[str, Any]:
+    """Send one dataset row's request and evaluate the assertion plan; no database access."""
+    try:
+        start = time.perf_counter()
+        response = session.request(
+            method=payload["method"],
+            url=payload["url"],
+            headers=payload["headers"],
+            params=payload["params"],
+            data=payload["data"],
+            json=payload["json"],
+            auth=payload["auth"],
+            timeout=payload["timeout"],
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except requests.RequestException as exc:
+        return {"status": models.ApiRunResult.Status.ERROR, "error": str(exc)}
+    parsed = ParsedResponse(response)
+    success, _passed, failed = _run_assertion_plan(plan, parsed)
+    return {
+        "status": models.ApiRunResult.Status.PASSED if success else models.ApiRunResult.Status.FAILED,
+        "response_status": response.status_code,
+        "response_time_ms": elapsed_ms,
+        "assertions_failed": failed,
+        # Only failing rows keep a (truncated) body to keep dataset runs compact.
+        "response_body": "" if success else parsed.text[:2000],
+    }
+
+
+def run_dataset(
+    *,
+    dataset: models.ApiDataset,
+    environment: models.ApiEnvironment | None = None,
+    overrides: Dict[str, Any] | None = None,
+    user: Any = None,
+    max_workers: int | None = None,
+) -> models.ApiRun:
+    """Execute the dataset's request once per row on a bounded worker pool.
+
+    Row values are merged over environment variables and overrides. Each row is
+    stored as a compact ``ApiRunResult`` on a single ``ApiRun``; a row that raises is
+    stored as an error. The run passes only when it has rows and every row passed.
+    """
+    api_request = dataset.resolve_request()
+    if api_request is None:
+        raise ValueError("Dataset is not linked to an API request.")
+
+    base_variables: Dict[str, Any] = {}
+    if environment:
+        base_variables.update(environment.variables or {})
+    if overrides:
+        base_variables.update(overrides)
+
+    run = models.ApiRun.objects.create(
+        collection=api_request.collection,
+        environment=environment,
+        triggered_by=user,
+        status=models.ApiRun.Status.RUNNING,
+        started_at=timezone.now(),
+    )
+    try:
+        return _execute_dataset_run(
+            run, dataset=dataset, api_request=api_request, base_variables=base_variables,
+            environment=environment, max_workers=max_workers,
+        )
+    except Exception as exc:
+        _close_crashed_run(run, exc)
+        raise
+
+
+def _dataset_row_error(exc: Exception) -> Dict[str, Any]:
+    return {"status": models.ApiRunResult.Status.ERROR, "error": str(exc) or exc.__class__.__name__}
+
+
+def _execute_dataset_run(
+    run: models.ApiRun,
+    *,
+    dataset: models.ApiDataset,
+    api_request: models.ApiRequest,
+    base_variables: Dict[str, Any],
+    environment: models.ApiEnvironment | None,
+    max_workers: int | None,
+) -> models.ApiRun:
+    plan = compile_assertion_plan(api_request.assertions.all())
+    rows = [row for row in (dataset.rows or []) if isinstance(row, dict)]
+
+    workers = max_workers or getattr(settings, "API_DATASET_MAX_WORKERS", 8)
+    workers = max(1, min(int(workers), len(rows) or 1))
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    outcomes: List[Dict[str, Any] | None] = [None] * len(rows)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for index, row in enumerate(rows):
+                try:
+                    payload = _build_request_payload(api_request, {**base_variables, **row}, environment)
+                except Exception as exc:
+                    outcomes[index] = _dataset_row_error(exc)
+                    continue
+                futures[executor.submit(_execute_dataset_row, session, payload, plan)] = index
+            for future, index in futures.items():
+                try:
+                    outcomes[index] = future.result()
+                except Exception as exc:
+                    # e.g. a transform or assertion value that fails on this row only
+                    outcomes[index] = _dataset_row_error(exc)
+    finally:
+        session.close()
+
+    results = []
+    passed_rows = 0
+    latencies: List[float] = []
+    for index, outcome in enumerate(outcomes):
+        outcome = outcome or {"status": models.ApiRunResult.Status.ERROR}
+        if outcome["status"] == models.ApiRunResult.Status.PASSED:
+            passed_rows += 1
+        if outcome.get("response_time_ms") is not None:
+            latencies.append(outcome["response_time_ms"])
+        results.append(
+            models.ApiRunResult(
+                run=run,
+                request=api_request,
+                order=index + 1,
+                status=outcome["status"],
+                response_status=outcome.get("response_status"),
+                response_body=outcome.get("response_body", ""),
+                response_time_ms=outcome.get("response_time_ms"),
+                assertions_failed=outcome.get("assertions_failed", []),
+                error=outcome.get("error", ""),
+            )
+        )
+    models.ApiRunResult.objects.bulk_create(results, batch_size=500)
+    try:
+        record_request_latencies(api_request.pk, latencies)
+    except Exception:
+        pass
+
+    summary = _summarize_run(len(rows), passed_rows)
+    summary["dataset_id"] = dataset.pk
+    if latencies:
+        summary["avg_response_time_ms"] = sum(latencies) / len(latencies)
+        summary["max_response_time_ms"] = max(latencies)
+    run.finished_at = timezone.now()
+    run.summary = summary
+    # An empty dataset proved nothing, so like test case batches it does not pass.
+    run.status = models.ApiRun.Status.PASSED if rows and passed_rows == len(rows) else models.ApiRun.Status.FAILED
+    run.save(update_fields=["finished_at", "summary", "status", "updated_at"])
+    return run
+
+
+def _run_rollup_deltas(runs: Iterable[models.ApiRun], results: Iterable[models.ApiRunResult]) -> Dict[str, float]:
+    deltas: Dict[str, float] = {
+        "runs_total": 0,
+        "runs_passed": 0,
+        "runs_failed": 0,
+        "results_total": 0,
+        "results_passed": 0,
+        "results_failed": 0,
+        "results_error": 0,
+        "response_time_ms_total": 0.0,
+        "response_time_count": 0,
+    }
+    for run in runs:
+        deltas["runs_total"] += 1
+        if run.status == models.ApiRun.Status.PASSED:
+            deltas["runs_passed"] += 1
+        elif run.status == models.ApiRun.Status.FAILED:
+            deltas["runs_failed"] += 1
+    for result in results:
+        deltas["results_total"] += 1
+        key = f"results_{result.status}"
+        if key in deltas:
+            deltas[key] += 1
+        if result.response_time_ms is not None:
+            deltas["response_time_ms_total"] += result.response_time_ms
+            deltas["response_time_count"] += 1
+    return deltas
+
+
+def _apply_run_rollup(day: Any, deltas: Dict[str, float], sign: int = 1) -> None:
+    models.ApiRunDailyRollup.objects.get_or_create(day=day)
+    models.ApiRunDailyRollup.objects.filter(day=day).update(
+        **{field: F(field) + sign * value for field, value in deltas.items()},
+        updated_at=timezone.now(),
+    )
+
+
+@transaction.atomic
+def _archive_run_batch(day: Any, run_ids: List[int]) -> models.ApiRunArchive:
+    runs = list(models.ApiRun.objects.filter(pk__in=run_ids).order_by("id"))
+    results = list(models.ApiRunResult.objects.filter(run_id__in=run_ids).order_by("id"))
+    reports = list(models.ApiRunResultReport.objects.filter(run_id__in=run_ids).order_by("id"))
+    # Parents first so the archive can be deserialized back in order.
+    payload = django_serializers.serialize("json", [*runs, *results, *reports])
+
+    archive = models.ApiRunArchive(
+        day=day,
+        run_count=len(runs),
+        result_count=len(results),
+        report_count=len(reports),
+    )
+    filename = f"runs-{runs[0].pk}-{runs[-1].pk}.json.gz"
+    archive.file.save(filename, ContentFile(gzip.compress(payload.encode("utf-8"))), save=False)
+    archive.save()
+    _apply_run_rollup(day, _run_rollup_deltas(runs, results))
+
+    models.ApiRunResultReport.objects.filter(run_id__in=run_ids).delete()
+    models.ApiRunResult.objects.filter(run_id__in=run_ids).delete()
+    models.ApiRun.objects.filter(pk__in=run_ids).delete()
+    return archive
+
+
+def archive_run_history(
+    *,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Archive runs older than the retention policy to date-partitioned files, then delete them.
+
+    Each batch (at most ``batch_size`` runs from a single day) is written and
+    deleted in its own transaction so locks stay short.
+    """
+    if older_than_days is None:
+        older_than_days = getattr(settings, "RUN_HISTORY_RETENTION_DAYS", 90)
+    batch_size = max(1, batch_size or getattr(settings, "RUN_HISTORY_ARCHIVE_BATCH_SIZE", 500))
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    expired = models.ApiRun.objects.filter(created_at__lt=cutoff)
+
+    totals = {"runs": 0, "results": 0, "reports": 0, "archives": 0}
+    if dry_run:
+        totals["runs"] = expired.count()
+        totals["results"] = models.ApiRunResult.objects.filter(run__created_at__lt=cutoff).count()
+        totals["reports"] = models.ApiRunResultReport.objects.filter(run__created_at__lt=cutoff).count()
+        return totals
+
+    while True:
+        batch = list(expired.order_by("created_at", "id").values_list("id", "created_at")[:batch_size])
+        if not batch:
+            break
+        by_day: Dict[Any, List[int]] = {}
+        for run_id, created_at in batch:
+            by_day.setdefault(timezone.localdate(created_at), []).append(run_id)
+        for day, run_ids in by_day.items():
+            archive = _archive_run_batch(day, run_ids)
+            totals["runs"] += archive.run_count
+            totals["results"] += archive.result_count
+            totals["reports"] += archive.report_count
+            totals["archives"] += 1
+    return totals
+
+
+def _detach_missing_relations(instance: Any, known: Dict[Tuple[Any, Any], bool]) -> None:
+    """Null out nullable foreign keys whose targets were deleted after archiving."""
+    for field in instance._meta.concrete_fields:
+        if not field.is_relation or not field.null:
+            continue
+        value = getattr(instance, field.attname)
+        if value is None:
+            continue
+        key = (field.related_model, value)
+        if key not in known:
+            known[key] = field.related_model._base_manager.filter(pk=value).exists()
+        if not known[key]:
+            setattr(instance, field.attname, None)
+
+
+@transaction.atomic
+def restore_run_archive(archive: models.ApiRunArchive) -> int:
+    """Load an archive's runs, results and report rows back into the database."""
+    with archive.file.open("rb") as handle:
+        payload = gzip.decompress(handle.read()).decode("utf-8")
+
+    known: Dict[Tuple[Any, Any], bool] = {}
+    runs: List[models.ApiRun] = []
+    results: List[models.ApiRunResult] = []
+    restored = 0
+    for deserialized in django_serializers.deserialize("json", payload):
+        instance = deserialized.object
+        _detach_missing_relations(instance, known)
+        deserialized.save()
+        restored += 1
+        if isinstance(instance, models.ApiRun):
+            runs.append(instance)
+        elif isinstance(instance, models.ApiRunResult):
+            results.append(instance)
+
+    _apply_run_rollup(archive.day, _run_rollup_deltas(runs, results), sign=-1)
+    archive.restored_at = timezone.now()
+    archive.save(update_fields=["restored_at", "updated_at"])
+    return restored
+
+
 @transaction.atomic
 def import_postman_collection(collection_payload: Dict[str, Any]) -> models.ApiCollection:
     if not isinstance(collection_payload, dict):
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+
+from . import models, services
+
+# Fields that change the celery beat entry; execution state is written with update().
+_SCHEDULE_FIELDS = {'name', 'cron', 'is_active'}
+
+
+def _sync_scheduled_run(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not _SCHEDULE_FIELDS.intersection(update_fields):
+        return
+    services.scheduled_run_sync_periodic_task(instance)
+
+
+def _delete_periodic_task(sender, instance, **kwargs):
+    if instance.periodic_task_id:
+        from django_celery_beat.models import PeriodicTask
+
+        PeriodicTask.objects.filter(pk=instance.periodic_task_id).delete()
+
+
+def connect():
+    post_save.connect(_sync_scheduled_run, sender=models.ScheduledRun, dispatch_uid='scheduled-run-sync-beat')
+    post_delete.connect(_delete_periodic_task, sender=models.ScheduledRun, dispatch_uid='scheduled-run-delete-beat')
@@ -0,0 +1,45 @@
+"""Celery tasks for API automation housekeeping."""
+
+from celery import shared_task
+
+from . import services
+
+
+@shared_task
+def archive_run_history():
+    """Archive and delete run history older than RUN_HISTORY_RETENTION_DAYS."""
+    return services.archive_run_history()
+
+
+@shared_task
+def trigger_scheduled_run(schedule_id):
+    """Run a scheduled selection unless it is already running or the concurrency cap is reached."""
+    return services.run_scheduled_plan(schedule_id)
+
+
+@shared_task
+def run_batch_shard(
+    automation_report_id, testcase_ids, environment_id=None, overrides=None, user_id=None, shard_index=0, deadline_at=None
+):
+    """Execute one shard of a sharded test case batch."""
+    return services.run_batch_shard(
+        automation_report_id=automation_report_id,
+        testcase_ids=testcase_ids,
+        environment_id=environment_id,
+        overrides=overrides,
+        user_id=user_id,
+        shard_index=shard_index,
+        deadline_at=deadline_at,
+    )
+
+
+@shared_task
+def finalize_sharded_batch(shard_results, automation_report_id):
+    """Chord callback: merge shard results into the shared automation report."""
+    return services.finalize_sharded_batch(automation_report_id, shard_results)
+
+
+@shared_task
+def abort_sharded_batch(automation_report_id):
+    """Chord errback: finish the shared report when a shard failed."""
+    return services.abort_sharded_batch(automation_report_id)
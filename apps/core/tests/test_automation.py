@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import json
+from datetime import date
 from unittest import mock
 
+import requests
+
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from apps.core import models, selectors, services
+from apps.core import models, selectors, serializers, services
 
 
 class ApiAutomationTests(APITestCase):
@@ -44,7 +49,7 @@ class ApiAutomationTests(APITestCase):
             expected_value="200",
         )
 
-    @mock.patch("apps.core.services.requests.request")
+    @mock.patch("apps.core.services.requests.Session.request")
     def test_run_collection_service(self, mock_request: mock.MagicMock) -> None:
         mock_response = mock.Mock()
         mock_response.status_code = 200
@@ -72,7 +77,39 @@ class ApiAutomationTests(APITestCase):
         self.assertEqual(kwargs["headers"]["X-Env"], "staging")
         self.assertEqual(run.triggered_by, self.user)
 
-    @mock.patch("apps.core.services.requests.request")
+    def test_crashed_collection_run_rolls_back_results_and_fails_the_run(self) -> None:
+        with mock.patch.object(services, "_send_run_request", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                services.run_collection(collection=self.collection, user=self.user)
+
+        run = models.ApiRun.objects.get()
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(run.summary, {"error": "boom"})
+        self.assertFalse(models.ApiRunResult.objects.exists())
+        self.assertFalse(models.ApiRunResultReport.objects.exists())
+
+    @mock.patch("apps.core.services.requests.Session.request")
+    def test_run_collection_report_reads_through_to_result(self, mock_request: mock.MagicMock) -> None:
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = "{\"widgets\": []}"
+        mock_response.json.return_value = {"widgets": []}
+        mock_request.return_value = mock_response
+
+        run = services.run_collection(collection=self.collection, environment=self.environment, user=self.user)
+
+        result = run.results.get()
+        report = run.result_reports.select_related("result").get()
+        self.assertEqual(report.result_id, result.id)
+        data = serializers.ApiRunResultReportSerializer(report).data
+        self.assertEqual(data["response_status"], 200)
+        self.assertEqual(data["response_body"], "{\"widgets\": []}")
+        self.assertEqual(data["response_headers"], {"Content-Type": "application/json"})
+        self.assertEqual(len(data["assertions_passed"]), 1)
+
+    @mock.patch("apps.core.services.requests.Session.request")
     def test_run_collection_via_api(self, mock_request: mock.MagicMock) -> None:
         mock_response = mock.Mock()
         mock_response.status_code = 200
@@ -88,6 +125,31 @@ class ApiAutomationTests(APITestCase):
         self.assertEqual(response.data["status"], models.ApiRun.Status.PASSED)
         self.assertEqual(response.data["summary"]["total_requests"], 1)
 
+    @mock.patch("apps.core.services.requests.Session.request")
+    def test_run_collection_records_phase_timings(self, mock_request: mock.MagicMock) -> None:
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.text = "{}"
+        mock_response.json.return_value = {}
+        mock_request.return_value = mock_response
+
+        run = services.run_collection(collection=self.collection, environment=self.environment, user=self.user)
+
+        result = run.results.get()
+        self.assertTrue({"resolve", "upstream", "parse", "assertions", "persist"} <= set(result.phase_timings))
+        self.assertTrue(all(value >= 0 for value in result.phase_timings.values()))
+        self.assertEqual(serializers.ApiRunResultSerializer(result).data["phase_timings"], result.phase_timings)
+
+        url = reverse("core:core-runs-phases")
+        response = self.client.get(url, {"request": self.request.pk, "days": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        phases = response.data["phases"]
+        self.assertEqual(phases["upstream"]["count"], 1)
+        self.assertEqual(phases["encryption"]["count"], 0)
+        self.assertIsNone(phases["encryption"]["avg_ms"])
+        self.assertEqual(self.client.get(url, {"days": "x"}).status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_selectors_include_prefetched_relations(self) -> None:
         collections = selectors.api_collection_list()
         self.assertEqual(collections.count(), 1)
@@ -164,6 +226,8 @@ class DataManagementTests(APITestCase):
         self.assertEqual(result.status, models.ApiRunResult.Status.PASSED)
         self.assertEqual(result.response_status, 200)
         self.assertTrue(result.response_time_ms is not None)
+        self.assertIn("upstream", result.phase_timings)
+        self.assertEqual(response.data["phase_timings"], result.phase_timings)
 
         self.assertEqual(response.data["run_id"], run.id)
         self.assertEqual(response.data["run_result_id"], result.id)
@@ -204,3 +268,584 @@ class DataManagementTests(APITestCase):
         self.assertEqual(response.data["run_id"], run.id)
         self.assertEqual(response.data["run_result_id"], result.id)
         mock_request.assert_called_once()
+
+    @override_settings(AUDIT_LOG_BACKEND="sync", AUDIT_COALESCE_SECONDS=0)
+    @mock.patch("apps.core.views.requests.request")
+    def test_execute_audits_unless_the_report_was_audited(self, mock_request: mock.MagicMock) -> None:
+        from apps.accounts.models import UserAuditTrail
+
+        mock_response = mock.Mock(status_code=200, headers={}, text="{}", ok=True)
+        mock_response.json.return_value = {}
+        mock_request.return_value = mock_response
+        url = reverse("core:core-request-execute")
+        audited = models.AutomationReport.objects.create(triggered_in="Scenario: Checkout", triggered_by=self.user)
+        unaudited = models.AutomationReport.objects.create(triggered_in="Nightly", triggered_by=self.user)
+
+        def run_test_case_rows() -> int:
+            return UserAuditTrail.objects.filter(user=self.user, action=UserAuditTrail.Actions.RUN_TEST_CASE).count()
+
+        for report, expected in ((audited, 0), (unaudited, 1), (None, 2)):
+            payload = {"method": "GET", "url": "https://api.example.com/widgets"}
+            if report is not None:
+                payload["automation_report_id"] = report.pk
+            response = self.client.post(url, data=payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(run_test_case_rows(), expected)
+
+    @override_settings(AUDIT_LOG_BACKEND="sync", AUDIT_COALESCE_SECONDS=60)
+    @mock.patch("apps.core.views.requests.request")
+    def test_execute_skips_report_lookup_when_audit_is_coalesced(self, mock_request: mock.MagicMock) -> None:
+        mock_response = mock.Mock(status_code=200, headers={}, text="{}", ok=True)
+        mock_response.json.return_value = {}
+        mock_request.return_value = mock_response
+        url = reverse("core:core-request-execute")
+        report = models.AutomationReport.objects.create(triggered_in="Nightly", triggered_by=self.user)
+        payload = {"method": "GET", "url": "https://api.example.com/widgets", "automation_report_id": report.pk}
+
+        with mock.patch("apps.core.views._automation_report_audited", return_value=False) as audited:
+            for _ in range(3):
+                response = self.client.post(url, data=payload, format="json")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        audited.assert_called_once_with(report.pk)
+
+
+class AssertionPlanTests(APITestCase):
+    def setUp(self) -> None:
+        collection = models.ApiCollection.objects.create(name="Plans")
+        self.request = models.ApiRequest.objects.create(
+            collection=collection,
+            name="Get Widget",
+            method="GET",
+            url="https://example.org/widgets/1",
+        )
+        self.status_assertion = models.ApiAssertion.objects.create(
+            request=self.request,
+            type=models.ApiAssertion.AssertionTypes.STATUS_CODE,
+            expected_value="200",
+        )
+        models.ApiAssertion.objects.create(
+            request=self.request,
+            type=models.ApiAssertion.AssertionTypes.JSON_PATH,
+            field="data.items.0.price",
+            expected_value="10",
+            comparator="gte",
+        )
+        models.ApiAssertion.objects.create(
+            request=self.request,
+            type=models.ApiAssertion.AssertionTypes.BODY_CONTAINS,
+            expected_value="widget",
+        )
+
+    def _response(self) -> mock.Mock:
+        response = mock.Mock()
+        response.status_code = 200
+        response.headers = {}
+        response.text = "{\"name\": \"widget\"}"
+        response.json.return_value = {"data": {"items": [{"price": 12.5}]}}
+        return response
+
+    def test_plan_is_cached_until_assertions_change(self) -> None:
+        first = services.compile_assertion_plan(self.request.assertions.all())
+        second = services.compile_assertion_plan(self.request.assertions.all())
+        self.assertIs(first, second)
+        self.assertEqual(first[0]["expected"], 200)
+        self.assertEqual(first[1]["segments"], ("data", "items", "0", "price"))
+
+        self.status_assertion.expected_value = "201"
+        self.status_assertion.save()
+        updated = services.compile_assertion_plan(self.request.assertions.all())
+        self.assertIsNot(first, updated)
+        self.assertEqual(updated[0]["expected"], 201)
+
+    def test_evaluate_parses_response_once(self) -> None:
+        response = self._response()
+        success, passed, failed = services._evaluate_assertions(self.request.assertions.all(), response, 1.0)
+        self.assertTrue(success, msg=failed)
+        self.assertEqual(len(passed), 3)
+        response.json.assert_called_once()
+
+    def test_parsed_response_decodes_and_serializes_once(self) -> None:
+        body = {"data": {"items": [{"price": 12.5}], "name": "widget"}}
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response.encoding = "utf-8"
+        response._content = json.dumps(body).encode()
+
+        with mock.patch.object(
+            requests.Response, "text", new_callable=mock.PropertyMock, return_value=json.dumps(body)
+        ) as text, mock.patch.object(requests.Response, "json", side_effect=AssertionError("parsed twice")):
+            parsed = services.ParsedResponse(response)
+            success, passed, failed = services._evaluate_assertions(self.request.assertions.all(), parsed, 1.0)
+            self.assertTrue(success, msg=failed)
+            self.assertEqual(parsed.json, body)
+            self.assertEqual(parsed.body, json.dumps(body))
+            snapshot = parsed.snapshot
+            self.assertIs(parsed.snapshot, snapshot)
+            self.assertEqual(json.loads(snapshot), body)
+        text.assert_called_once()
+
+
+class BodyTransformPlanTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="planner",
+            email="planner@example.com",
+            password="secret123",
+        )
+        self.client.force_authenticate(self.user)
+        self.collection = models.ApiCollection.objects.create(name="Transforms")
+
+    def test_plan_is_normalized_and_cached_by_content(self) -> None:
+        transforms = {
+            "overrides": [{"path": "ref", "value": "", "isRandom": True, "charLimit": "12"}],
+            "signatures": [{"targetPath": "sig", "algorithm": "SHA256", "components": "ref\nliteral:k", "storeAs": "sig"}],
+        }
+        plan = services.get_body_transform_plan(transforms)
+        self.assertIs(plan, services.get_body_transform_plan(dict(transforms)))
+        self.assertEqual(plan["overrides"][0]["char_limit"], 12)
+        self.assertTrue(plan["overrides"][0]["is_random"])
+        self.assertEqual(plan["signatures"][0]["algorithm"], "sha256")
+        self.assertEqual(plan["signatures"][0]["store_as"], "sig")
+
+        payload = {"ref": ""}
+        variables: dict = {}
+        stored = services._apply_body_transforms(payload, transforms, variables)
+        self.assertEqual(len(payload["ref"]), 12)
+        self.assertEqual(stored["sig"], services._compute_hash_hex("sha256", f"{payload['ref']}k"))
+        self.assertEqual(payload["sig"], stored["sig"])
+
+    def test_external_overrides_are_not_shared_between_runs(self) -> None:
+        transforms = {
+            "overrides": [{"path": "data", "name": "ext", "external_json": {"a": "1"}}],
+            "signatures": [{"target_path": "external.ext.sig", "algorithm": "sha256", "components": "external.ext.a"}],
+        }
+        services._apply_body_transforms({}, transforms, {})
+        services._apply_body_transforms({}, transforms, {})
+        self.assertEqual(services.get_body_transform_plan(transforms)["overrides"][0]["external_obj"], {"a": "1"})
+
+    def test_invalid_transforms_rejected_on_save(self) -> None:
+        url = reverse("core:core-requests-list")
+        payload = {
+            "collection": self.collection.pk,
+            "name": "Signed",
+            "method": "POST",
+            "url": "https://example.org/pay",
+            "body_transforms": {
+                "signatures": [{"target_path": "sig", "algorithm": "md5", "components": "amount"}],
+            },
+        }
+        response = self.client.post(url, data=payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("body_transforms", response.data)
+
+        payload["body_transforms"]["signatures"][0]["algorithm"] = "sha512"
+        response = self.client.post(url, data=payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, msg=response.data)
+
+    def test_environment_choice_uses_indexed_variable_keys(self) -> None:
+        generic = models.ApiEnvironment.objects.create(name="Generic", variables={"base_url": "https://x"})
+        partial = models.ApiEnvironment.objects.create(name="Partial", variables={"mid": "M-1"})
+        full = models.ApiEnvironment.objects.create(name="Full", variables={"mid": "M-2", "secret": "s"})
+        self.collection.environments.add(generic, partial, full)
+        api_request = models.ApiRequest.objects.create(
+            collection=self.collection,
+            name="Signed",
+            url="https://example.org/pay",
+            body_transforms={
+                "overrides": [{"path": "merchant", "value": "{{ mid }}"}],
+                "signatures": [{"target_path": "sig", "algorithm": "sha256", "components": "literal:{{secret}}"}],
+            },
+        )
+        self.assertEqual(api_request.transform_variable_keys, ["mid", "secret"])
+        self.assertEqual(full.variable_keys, ["mid", "secret"])
+
+        with self.assertNumQueries(1):
+            chosen = services.choose_environment_for_request(collection=self.collection, api_request=api_request)
+        self.assertEqual(chosen, full)
+
+        full.variables = {"other": "1"}
+        full.save(update_fields=["variables", "updated_at"])
+        self.assertEqual(models.ApiEnvironment.objects.get(pk=full.pk).variable_keys, ["other"])
+        self.assertEqual(services.choose_environment_for_request(collection=self.collection, api_request=api_request), partial)
+
+        api_request.body_transforms = {}
+        api_request.save()
+        self.assertEqual(services.choose_environment_for_request(collection=self.collection, api_request=api_request), generic)
+        self.assertEqual(
+            services.choose_environment_for_request(
+                collection=self.collection, api_request=api_request, body_transforms={"x": "{{other}}"}
+            ),
+            full,
+        )
+
+
+class DatasetRunTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="datadriven",
+            email="dd@example.com",
+            password="secret123",
+        )
+        self.client.force_authenticate(self.user)
+        collection = models.ApiCollection.objects.create(name="Datasets")
+        self.request = models.ApiRequest.objects.create(
+            collection=collection,
+            name="Get Account",
+            method="GET",
+            url="https://example.org/accounts/{{ account }}",
+        )
+        models.ApiAssertion.objects.create(
+            request=self.request,
+            type=models.ApiAssertion.AssertionTypes.STATUS_CODE,
+            expected_value="200",
+        )
+
+    @staticmethod
+    def _respond(**kwargs):
+        response = mock.Mock()
+        response.status_code = 404 if kwargs["url"].endswith("/missing") else 200
+        response.headers = {}
+        response.text = "{}"
+        response.json.return_value = {}
+        return response
+
+    def test_parse_csv_and_json_rows(self) -> None:
+        self.assertEqual(
+            services.parse_dataset_rows("account,amount\n1,10\n2,20\n", models.ApiDataset.Formats.CSV),
+            [{"account": "1", "amount": "10"}, {"account": "2", "amount": "20"}],
+        )
+        self.assertEqual(services.parse_dataset_rows('[{"account": 1}]', models.ApiDataset.Formats.JSON), [{"account": 1}])
+        with self.assertRaises(ValueError):
+            services.parse_dataset_rows('{"account": 1}', models.ApiDataset.Formats.JSON)
+
+    def test_run_dataset_via_api(self) -> None:
+        create = self.client.post(
+            reverse("core:core-datasets-list"),
+            data={
+                "name": "Accounts",
+                "request": self.request.pk,
+                "source_format": "csv",
+                "content": "account\n1\nmissing\n3\n",
+            },
+            format="json",
+        )
+        self.assertEqual(create.status_code, status.HTTP_201_CREATED, msg=create.data)
+        self.assertEqual(create.data["row_count"], 3)
+
+        url = reverse("core:core-datasets-run", kwargs={"pk": create.data["id"]})
+        with mock.patch.object(services.requests.Session, "request", side_effect=self._respond) as mock_request:
+            response = self.client.post(url, data={}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(mock_request.call_count, 3)
+        run = models.ApiRun.objects.get()
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertEqual(run.summary["total_requests"], 3)
+        self.assertEqual(run.summary["passed_requests"], 2)
+        self.assertEqual(run.summary["dataset_id"], create.data["id"])
+        statuses = list(run.results.order_by("order").values_list("status", flat=True))
+        self.assertEqual(statuses, ["passed", "failed", "passed"])
+
+    def test_row_exception_is_recorded_and_run_finishes(self) -> None:
+        dataset = models.ApiDataset.objects.create(name="Rows", request=self.request, rows=[{"account": "1"}, {"account": "boom"}])
+
+        def respond(**kwargs):
+            if kwargs["url"].endswith("/boom"):
+                raise RuntimeError("bad assertion value")
+            return self._respond(**kwargs)
+
+        with mock.patch.object(services.requests.Session, "request", side_effect=respond):
+            run = services.run_dataset(dataset=dataset)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertIsNotNone(run.finished_at)
+        rows = list(run.results.order_by("order").values_list("status", "error"))
+        self.assertEqual(rows, [("passed", ""), ("error", "bad assertion value")])
+
+    def test_empty_dataset_does_not_pass(self) -> None:
+        dataset = models.ApiDataset.objects.create(name="Empty", request=self.request, rows=[])
+        run = services.run_dataset(dataset=dataset)
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertEqual(run.summary["total_requests"], 0)
+
+    def test_dataset_requires_linked_request(self) -> None:
+        response = self.client.post(
+            reverse("core:core-datasets-list"),
+            data={"name": "Orphan", "rows": [{"a": 1}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LatencySketchTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="latency",
+            email="latency@example.com",
+            password="secret123",
+        )
+        self.client.force_authenticate(self.user)
+        collection = models.ApiCollection.objects.create(name="Latency")
+        self.request = models.ApiRequest.objects.create(
+            collection=collection,
+            name="Ping",
+            method="GET",
+            url="https://example.org/ping",
+        )
+
+    def test_quantiles_are_within_relative_error(self) -> None:
+        values = [float(value) for value in range(1, 1001)]
+        services.record_request_latencies(self.request.pk, values[:500])
+        services.record_request_latencies(self.request.pk, values[500:])
+        sketch = models.ApiLatencySketch.objects.get()
+        self.assertEqual(sketch.count, 1000)
+
+        summary = services.latency_quantiles(services.merge_latency_sketches([sketch]))
+        self.assertAlmostEqual(summary["p50"], 500, delta=500 * 0.02)
+        self.assertAlmostEqual(summary["p90"], 900, delta=900 * 0.02)
+        self.assertAlmostEqual(summary["p99"], 990, delta=990 * 0.02)
+        self.assertEqual(summary["max_ms"], 1000)
+
+    def test_latency_endpoint_merges_days(self) -> None:
+        services.record_request_latencies(self.request.pk, [10.0, 20.0], day=date(2026, 3, 2))
+        services.record_request_latencies(self.request.pk, [30.0], day=date(2026, 3, 4))
+        services.record_request_latencies(self.request.pk, [999.0], day=date(2026, 4, 1))
+
+        url = reverse("core:core-requests-latency", kwargs={"pk": self.request.pk})
+        response = self.client.get(url, {"start": "2026-03-01", "end": "2026-03-31", "group": "week"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["points"]), 1)
+        self.assertEqual(response.data["points"][0]["period"], "2026-03-02")
+        self.assertEqual(response.data["overall"]["count"], 3)
+        self.assertEqual(response.data["overall"]["max_ms"], 30.0)
+
+        response = self.client.get(url, {"start": "2026-03-31", "end": "2026-03-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_execute_latencies_are_buffered_and_merged_in_batches(self) -> None:
+        buffer = services.LatencyBuffer(size=3, interval=60)
+        self.addCleanup(buffer.flush)
+        with self.assertNumQueries(0):
+            buffer.add(self.request.pk, 10.0)
+            buffer.add(self.request.pk, 20.0)
+        self.assertFalse(models.ApiLatencySketch.objects.exists())
+
+        buffer.add(self.request.pk, 30.0)  # fills the buffer
+        sketch = models.ApiLatencySketch.objects.get()
+        self.assertEqual((sketch.count, sketch.max_ms), (3, 30.0))
+
+        buffer.add(self.request.pk, 40.0)
+        url = reverse("core:core-requests-latency", kwargs={"pk": self.request.pk})
+        with mock.patch.object(services, "_execute_latencies", buffer):
+            self.assertEqual(self.client.get(url).data["overall"]["count"], 4)
+
+
+class ReplayTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="replayer", password="secret123")
+        self.client.force_authenticate(self.user)
+        self.environment = models.ApiEnvironment.objects.create(
+            name="Replay",
+            variables={"base_url": "https://upstream.example"},
+            replay_mode=models.ApiEnvironment.ReplayModes.RECORD,
+            replay_match_keys=["account"],
+        )
+        self.collection = models.ApiCollection.objects.create(name="Replay collection")
+        self.request = models.ApiRequest.objects.create(
+            collection=self.collection,
+            name="Balance",
+            method="POST",
+            url="{{ base_url }}/balance",
+            body_type=models.ApiRequest.BodyTypes.JSON,
+            body_json={"account": "{{ account }}"},
+        )
+        models.ApiAssertion.objects.create(
+            request=self.request, type=models.ApiAssertion.AssertionTypes.JSON_PATH, field="balance", expected_value="10"
+        )
+
+    def _respond(self, **kwargs):
+        response = mock.Mock()
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        balance = "10" if kwargs["json"]["account"] == "A" else "99"
+        response.text = json.dumps({"balance": balance})
+        response.json.return_value = {"balance": balance}
+        return response
+
+    def test_record_then_replay_matches_body_keys_without_upstream(self) -> None:
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond) as mock_request:
+            services.run_collection(collection=self.collection, environment=self.environment, overrides={"account": "A"})
+            services.run_collection(collection=self.collection, environment=self.environment, overrides={"account": "B"})
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(models.ApiRecording.objects.filter(url_template="{{ base_url }}/balance").count(), 2)
+
+        self.environment.replay_mode = models.ApiEnvironment.ReplayModes.REPLAY
+        self.environment.save()
+        with mock.patch("apps.core.services.requests.Session.request") as mock_request:
+            run_a = services.run_collection(collection=self.collection, environment=self.environment, overrides={"account": "A"})
+            run_b = services.run_collection(collection=self.collection, environment=self.environment, overrides={"account": "B"})
+            run_c = services.run_collection(collection=self.collection, environment=self.environment, overrides={"account": "C"})
+        mock_request.assert_not_called()
+        self.assertEqual(run_a.results.get().status, models.ApiRunResult.Status.PASSED)
+        self.assertEqual(run_b.results.get().status, models.ApiRunResult.Status.FAILED)
+        missing = run_c.results.get()
+        self.assertEqual(missing.status, models.ApiRunResult.Status.ERROR)
+        self.assertIn("No recorded response", missing.error)
+
+    def test_import_recordings_from_results_as_wildcards(self) -> None:
+        run = models.ApiRun.objects.create(collection=self.collection, status=models.ApiRun.Status.PASSED)
+        models.ApiRunResult.objects.create(
+            run=run, request=self.request, status=models.ApiRunResult.Status.PASSED,
+            response_status=200, response_body='{"balance": "10"}',
+        )
+        models.ApiRunResult.objects.create(
+            run=run, request=self.request, status=models.ApiRunResult.Status.PASSED,
+            response_status=201, response_body='{"balance": "12"}',
+        )
+        url = reverse("core:core-environments-import-recordings", kwargs={"pk": self.environment.pk})
+        response = self.client.post(url, {"collection": self.collection.pk}, format="json")
+        self.assertEqual(response.data, {"imported": 1})
+
+        recording = services.find_recording(
+            environment=self.environment, method="post", url_template=self.request.url, json_body={"account": "Z"}
+        )
+        self.assertIsNotNone(recording)
+        self.assertEqual(recording.match_key, "")
+        self.assertEqual(recording.response_status, 201)
+
+
+class TestCaseBatchTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="batcher", password="secret123")
+        self.client.force_authenticate(self.user)
+        self.environment = models.ApiEnvironment.objects.create(
+            name="Batch", variables={"base_url": "https://upstream.example"}
+        )
+        collection = models.ApiCollection.objects.create(name="Batch collection")
+        login_request = models.ApiRequest.objects.create(
+            collection=collection, name="Login", method="POST", url="{{ base_url }}/login"
+        )
+        profile_request = models.ApiRequest.objects.create(
+            collection=collection,
+            name="Profile",
+            method="GET",
+            url="{{ base_url }}/profile",
+            headers={"Authorization": "Bearer {{ token }}"},
+        )
+        project = models.Project.objects.create(name="Batch project")
+        scenario = models.TestScenario.objects.create(project=project, title="Scenario")
+        self.login = models.TestCase.objects.create(
+            scenario=scenario, title="Login", related_api_request=login_request
+        )
+        self.dependents = [
+            models.TestCase.objects.create(
+                scenario=scenario,
+                title=f"Profile {index}",
+                related_api_request=profile_request,
+                test_case_dependency=self.login,
+                dependency_response_key="data.token",
+            )
+            for index in range(2)
+        ]
+
+    def _respond(self, **kwargs):
+        response = mock.Mock()
+        response.status_code = 200
+        response.headers = {"Content-Type": "application/json"}
+        body = {"data": {"token": "abc"}} if kwargs["url"].endswith("/login") else {"ok": True}
+        response.text = json.dumps(body)
+        response.json.return_value = body
+        return response
+
+    def test_dependency_split_and_override_keys(self) -> None:
+        self.assertEqual(services._split_dependency_path("data.items[0].token"), ["data", "items", "0", "token"])
+        self.assertEqual(services._dependency_override_key("data.items[0]"), "data_items_0")
+        self.assertEqual(
+            services.dependency_overrides("data.items[1]", {"data": {"items": [1, {"a": 2}]}}),
+            {"dependency_value": '{"a": 2}', "data_items_1": '{"a": 2}'},
+        )
+        self.assertIsNone(services.dependency_overrides("data.missing", {"data": {}}))
+
+    def test_shared_dependency_runs_once_and_fans_out(self) -> None:
+        url = reverse("core:core-test-cases-run-batch")
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond) as mock_request:
+            response = self.client.post(
+                url,
+                {"test_cases": [case.pk for case in self.dependents], "environment": self.environment.pk},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        urls = [call.kwargs["url"] for call in mock_request.call_args_list]
+        self.assertEqual(urls.count("https://upstream.example/login"), 1)
+        profile_calls = [call for call in mock_request.call_args_list if call.kwargs["url"].endswith("/profile")]
+        self.assertEqual(len(profile_calls), 2)
+        for call in profile_calls:
+            self.assertEqual(call.kwargs["headers"]["Authorization"], "Bearer abc")
+
+        run = models.ApiRun.objects.get(pk=response.data["id"])
+        self.assertEqual(run.status, models.ApiRun.Status.PASSED)
+        self.assertEqual(run.summary["shared_executions"], 2)
+        reports = models.ApiRunResultReport.objects.filter(run=run)
+        self.assertEqual(reports.count(), 3)
+        self.assertEqual(
+            sorted(reports.values_list("testcase_id", flat=True)),
+            sorted([self.login.pk] + [case.pk for case in self.dependents]),
+        )
+
+    def test_missing_dependency_key_blocks_dependent(self) -> None:
+        self.dependents[0].dependency_response_key = "data.session"
+        self.dependents[0].save()
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond):
+            run = services.run_test_case_batch(test_cases=[self.dependents[0]], environment=self.environment)
+        blocked = run.results.get(status=models.ApiRunResult.Status.ERROR)
+        self.assertIn('"data.session" not found', blocked.error)
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+
+    def test_crashing_on_result_closes_the_run_and_finishes_the_report(self) -> None:
+        report = models.AutomationReport.objects.create(triggered_in="Batch", triggered_by=self.user)
+
+        def broken_writer(test_case, result):
+            raise OSError("disk full")
+
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond):
+            with self.assertRaises(OSError):
+                services.run_test_case_batch(
+                    test_cases=self.dependents, environment=self.environment,
+                    automation_report=report, on_result=broken_writer,
+                )
+
+        run = models.ApiRun.objects.get()
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertEqual(run.summary, {"error": "disk full"})
+        self.assertFalse(run.results.exists())
+        report.refresh_from_db()
+        self.assertIsNotNone(report.finished)
+
+    def test_orders_ready_cases_by_critical_path_and_history(self) -> None:
+        standalone_request = models.ApiRequest.objects.create(
+            collection=self.login.related_api_request.collection,
+            name="Health",
+            method="GET",
+            url="{{ base_url }}/health",
+        )
+        standalone = models.TestCase.objects.create(
+            scenario=self.login.scenario, title="Health", related_api_request=standalone_request
+        )
+        selection = [standalone, *self.dependents]
+
+        def first_path(history):
+            with mock.patch.object(
+                services.selectors, "test_case_duration_estimates", return_value=history
+            ), mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond) as mock_request:
+                services.run_test_case_batch(test_cases=selection, environment=self.environment, max_workers=1)
+            return mock_request.call_args_list[0].kwargs["url"].rsplit("/", 1)[-1]
+
+        # Unseen cases share the default estimate, so the login -> profile chain is longer.
+        self.assertEqual(first_path({}), "login")
+        # A standalone case known to be slower than the whole chain goes first.
+        self.assertEqual(first_path({standalone.pk: 5000.0, self.login.pk: 50.0}), "health")
+        estimates = {self.login.pk: 50.0, **{case.pk: 1000.0 for case in self.dependents}}
+        lengths = services._critical_path_lengths([self.login, *self.dependents], estimates)
+        self.assertEqual(lengths[self.login.pk], 1050.0)
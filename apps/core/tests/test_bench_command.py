@@ -0,0 +1,32 @@
+"""Smoke test for the benchmark management command."""
+
+from __future__ import annotations
+
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase
+
+from apps.core import benchmarks, models
+
+
+class BenchCommandTests(TransactionTestCase):
+    def test_bench_reports_every_scenario_and_rolls_back(self) -> None:
+        out = StringIO()
+        call_command(
+            "bench", "--iterations", "1", "--cases", "4", "--requests", "2", "--postman-requests", "2", stdout=out
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(set(report["results"]), set(benchmarks.SCENARIOS))
+        for name, stats in report["results"].items():
+            with self.subTest(scenario=name):
+                self.assertEqual(stats["iterations"], 1)
+                self.assertGreater(stats["throughput_per_s"], 0)
+        self.assertFalse(models.ApiCollection.objects.exists())
+        self.assertFalse(models.ApiRun.objects.exists())
+
+    def test_unknown_scenario_is_rejected(self) -> None:
+        with self.assertRaises(CommandError):
+            call_command("bench", "nope", stdout=StringIO())
@@ -0,0 +1,89 @@
+"""Query-count regression tests for comment thread serialization."""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from apps.core import models
+
+
+class CommentThreadQueryTests(APITestCase):
+    def setUp(self) -> None:
+        User = get_user_model()
+        self.user = User.objects.create_user(username="viewer", email="viewer@example.com", password="secret123")
+        self.other = User.objects.create_user(username="other", email="other@example.com", password="secret123")
+        self.client.force_authenticate(self.user)
+        project = models.Project.objects.create(name="Project")
+        self.scenario = models.TestScenario.objects.create(project=project, title="Scenario")
+        self.case = models.TestCase.objects.create(scenario=self.scenario, title="Case")
+
+    def _seed_scenario_thread(self, count: int) -> None:
+        for index in range(count):
+            comment = models.ScenarioComment.objects.create(
+                scenario=self.scenario, user=self.other, content=f"comment {index}"
+            )
+            models.CommentLike.objects.create(comment=comment, user=self.other)
+            models.CommentReaction.objects.create(comment=comment, user=self.other, reaction="+1")
+            reply = models.ScenarioComment.objects.create(
+                scenario=self.scenario, user=self.user, parent=comment, content=f"reply {index}"
+            )
+            models.CommentLike.objects.create(comment=reply, user=self.user)
+            models.ScenarioCommentAttachment.objects.create(
+                comment=reply, uploaded_by=self.user, original_name="a.png", file="docs/a.png"
+            )
+
+    def _seed_test_case_thread(self, count: int) -> None:
+        for index in range(count):
+            comment = models.TestCaseComment.objects.create(
+                test_case=self.case, user=self.other, content=f"comment {index}"
+            )
+            models.TestCaseCommentLike.objects.create(comment=comment, user=self.user)
+            models.TestCaseCommentReaction.objects.create(comment=comment, user=self.user, reaction="heart")
+            models.TestCaseComment.objects.create(
+                test_case=self.case, user=self.other, parent=comment, content=f"reply {index}"
+            )
+
+    def _count_queries(self, url: str) -> tuple[int, list]:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_scenario_comment_list_query_count_is_constant(self) -> None:
+        url = f"/api/core/scenario-comments/?scenario={self.scenario.pk}"
+        self._seed_scenario_thread(2)
+        small, _ = self._count_queries(url)
+        self._seed_scenario_thread(10)
+        large, data = self._count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 12)
+        top = data[0]
+        self.assertEqual(top["likes_count"], 1)
+        self.assertFalse(top["user_has_liked"])
+        self.assertEqual(top["reactions_summary"], [{"reaction": "+1", "count": 1}])
+        self.assertIsNone(top["user_reaction"])
+        reply = top["replies"][0]
+        self.assertEqual(reply["likes_count"], 1)
+        self.assertTrue(reply["user_has_liked"])
+        self.assertEqual(len(reply["attachments"]), 1)
+        self.assertEqual(reply["replies"], [])
+
+    def test_test_case_comment_list_query_count_is_constant(self) -> None:
+        url = f"/api/core/test-case-comments/?test_case={self.case.pk}"
+        self._seed_test_case_thread(2)
+        small, _ = self._count_queries(url)
+        self._seed_test_case_thread(10)
+        large, data = self._count_queries(url)
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(data), 12)
+        top = data[0]
+        self.assertEqual(top["likes_count"], 1)
+        self.assertTrue(top["user_has_liked"])
+        self.assertEqual(top["user_reaction"], "heart")
+        self.assertEqual(len(top["replies"]), 1)
+        self.assertEqual(top["replies"][0]["likes_count"], 0)
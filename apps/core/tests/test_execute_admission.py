@@ -0,0 +1,71 @@
+"""Tests for rate and in-flight limits on the API tester execute endpoint."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.core import models, throttling
+
+EXECUTE_URL = "/api/core/tester/execute/"
+
+
+@override_settings(
+    EXECUTE_RATE_PER_SECOND=0,
+    EXECUTE_MAX_IN_FLIGHT_PER_USER=1,
+    EXECUTE_MAX_IN_FLIGHT_PER_HOST=1,
+)
+class ExecuteAdmissionTests(APITestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(throttling, "_get_redis", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        throttling._local_buckets.clear()
+        throttling._local_slots.clear()
+        self.user = get_user_model().objects.create_user(username="runner", password="secret123")
+        self.client.force_authenticate(self.user)
+
+    @override_settings(EXECUTE_RATE_PER_SECOND=0.01, EXECUTE_RATE_BURST=1)
+    def test_token_bucket_returns_429_with_retry_after(self) -> None:
+        first = self.client.post(EXECUTE_URL, {}, format="json")
+        self.assertEqual(first.status_code, 400)
+
+        second = self.client.post(EXECUTE_URL, {}, format="json")
+        self.assertEqual(second.status_code, 429)
+        self.assertGreaterEqual(int(second["Retry-After"]), 1)
+
+    def test_user_in_flight_limit_and_release(self) -> None:
+        key = throttling.USER_SLOT_KEY.format(user_id=self.user.pk)
+        slot = throttling.acquire_slot(key, limit=1, ttl=60)
+        self.assertIsNotNone(slot)
+        self.assertEqual(self.client.post(EXECUTE_URL, {}, format="json").status_code, 429)
+
+        throttling.release_slot(key, slot)
+        self.assertEqual(self.client.post(EXECUTE_URL, {}, format="json").status_code, 400)
+        self.assertEqual(throttling._local_slots, {})
+
+    def test_host_in_flight_limit_rejects_before_creating_run(self) -> None:
+        throttling.acquire_slot(throttling.HOST_SLOT_KEY.format(host="busy.example.org"), limit=1, ttl=60)
+        response = self.client.post(EXECUTE_URL, {"url": "https://busy.example.org/pay"}, format="json")
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(models.ApiRun.objects.exists())
+        self.assertNotIn(throttling.USER_SLOT_KEY.format(user_id=self.user.pk), throttling._local_slots)
+
+    def test_leaked_slot_expires_under_steady_traffic(self) -> None:
+        key = throttling.HOST_SLOT_KEY.format(host="leaky.example.org")
+        self.assertIsNotNone(throttling.acquire_slot(key, limit=2, ttl=60))  # never released
+        now = throttling.time.time()
+        for offset in (30, 50):
+            with mock.patch.object(throttling.time, "time", return_value=now + offset):
+                slot = throttling.acquire_slot(key, limit=2, ttl=60)
+                self.assertIsNotNone(slot)
+                self.assertIsNone(throttling.acquire_slot(key, limit=2, ttl=60))
+                throttling.release_slot(key, slot)
+
+        # Traffic never stopped, yet the leaked slot lapses 60s after it was taken.
+        with mock.patch.object(throttling.time, "time", return_value=now + 61):
+            self.assertIsNotNone(throttling.acquire_slot(key, limit=2, ttl=60))
+            self.assertIsNotNone(throttling.acquire_slot(key, limit=2, ttl=60))
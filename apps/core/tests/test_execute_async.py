@@ -0,0 +1,90 @@
+"""Tests for the async API tester execute endpoint."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from apps.core import models, services, throttling, views
+
+EXECUTE_URL = "/api/core/tester/execute-async/"
+
+
+@override_settings(EXECUTE_RATE_PER_SECOND=0, EXECUTE_MAX_IN_FLIGHT_PER_USER=1, EXECUTE_MAX_IN_FLIGHT_PER_HOST=0)
+class AsyncExecuteTests(APITestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(throttling, "_get_redis", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        throttling._local_slots.clear()
+        self.user = get_user_model().objects.create_user(username="async-runner", password="secret123")
+        self.environment = models.ApiEnvironment.objects.create(
+            name="Sandbox", variables={"base_url": "https://sandbox.example"}
+        )
+
+    def _execute(self, payload, *, user=None):
+        request = APIRequestFactory().post(EXECUTE_URL, payload, format="json")
+        if user is not None:
+            force_authenticate(request, user=user)
+        return async_to_sync(views.api_execute_async)(request)
+
+    def test_awaits_upstream_and_persists_run(self) -> None:
+        upstream = httpx.Response(
+            201, json={"data": {"pay_reference": "P-1"}}, request=httpx.Request("POST", "https://sandbox.example/pay")
+        )
+        with mock.patch.object(httpx.AsyncClient, "request", new=mock.AsyncMock(return_value=upstream)) as send:
+            response = self._execute(
+                {
+                    "method": "POST",
+                    "url": "{{ base_url }}/pay",
+                    "json": {"amount": 10},
+                    "environment": self.environment.pk,
+                },
+                user=self.user,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status_code"], 201)
+        self.assertEqual(response.data["json"], {"data": {"pay_reference": "P-1"}})
+        self.assertEqual(send.await_args.args[:2], ("POST", "https://sandbox.example/pay"))
+        run = models.ApiRun.objects.get(pk=response.data["run_id"])
+        self.assertEqual(run.status, models.ApiRun.Status.PASSED)
+        self.assertIn("upstream", run.results.get().phase_timings)
+        self.assertEqual(throttling._local_slots, {})
+
+    def test_transport_error_returns_bad_gateway(self) -> None:
+        failure = mock.AsyncMock(side_effect=httpx.ConnectError("refused"))
+        with mock.patch.object(httpx.AsyncClient, "request", new=failure):
+            response = self._execute({"url": "https://sandbox.example/down"}, user=self.user)
+
+        self.assertEqual(response.status_code, 502)
+        result = models.ApiRunResult.objects.get(run_id=response.data["run_id"])
+        self.assertEqual(result.status, models.ApiRunResult.Status.ERROR)
+        self.assertIn("refused", result.error)
+
+    def test_requires_authentication(self) -> None:
+        response = self._execute({"url": "https://sandbox.example/pay"})
+        self.assertIn(response.status_code, (401, 403))
+        self.assertFalse(models.ApiRun.objects.exists())
+
+    def test_async_client_is_reused_within_an_event_loop(self) -> None:
+        upstream = httpx.Response(200, text="ok", request=httpx.Request("GET", "https://sandbox.example/"))
+        send = mock.AsyncMock(return_value=upstream)
+
+        async def two_calls():
+            await services.asend_request(method="GET", url="https://sandbox.example/a", timeout=3)
+            await services.asend_request(method="GET", url="https://sandbox.example/b", timeout=7)
+            await services._async_client().aclose()
+
+        with mock.patch.object(httpx.AsyncClient, "request", new=send), mock.patch.object(
+            services.httpx, "AsyncClient", wraps=httpx.AsyncClient
+        ) as make_client:
+            async_to_sync(two_calls)()
+
+        self.assertEqual(make_client.call_count, 1)
+        self.assertEqual([call.kwargs["timeout"] for call in send.await_args_list], [3, 7])
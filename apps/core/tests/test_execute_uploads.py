@@ -0,0 +1,101 @@
+"""Tests for multipart file passthrough on the API tester execute endpoint."""
+
+from __future__ import annotations
+
+import io
+import json
+from unittest import mock
+
+import requests
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from apps.core import benchmarks, models, multipart, throttling
+
+EXECUTE_URL = "/api/core/tester/execute/"
+
+
+@override_settings(EXECUTE_RATE_PER_SECOND=0, EXECUTE_MAX_IN_FLIGHT_PER_USER=0, EXECUTE_MAX_IN_FLIGHT_PER_HOST=0)
+class ExecuteUploadTests(APITestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(throttling, "_get_redis", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = get_user_model().objects.create_user(username="uploader", password="secret123")
+        self.client.force_authenticate(self.user)
+
+    def test_stream_is_valid_multipart_and_rewinds(self) -> None:
+        content = bytes(range(256)) * 800
+        stream = multipart.MultipartStream(
+            {"note": "héllo"},
+            {"doc": ('quote "me".bin', io.BytesIO(content), "application/octet-stream", len(content))},
+        )
+        body = b"".join(stream)
+        self.assertEqual(len(body), len(stream))
+
+        fields, files = MultiPartParser(
+            {"CONTENT_TYPE": stream.content_type, "CONTENT_LENGTH": str(len(body))},
+            io.BytesIO(body),
+            [MemoryFileUploadHandler()],
+        ).parse()
+        self.assertEqual(fields["note"], "héllo")
+        self.assertEqual(files["doc"].read(), content)
+        self.assertEqual(files["doc"].name, "quote %22me%22.bin")
+
+        stream.reset()
+        self.assertEqual(stream.read(), body)
+
+        async def drain():
+            return b"".join([chunk async for chunk in stream])
+
+        stream.reset()
+        self.assertEqual(async_to_sync(drain)(), body)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_multipart_upload_streams_to_upstream(self) -> None:
+        size = 300 * 1024
+        with benchmarks.stub_upstream() as base_url, mock.patch(
+            "apps.core.views.requests.request", wraps=requests.request
+        ) as send:
+            payload = {
+                "method": "POST",
+                "url": f"{base_url}/upload",
+                "form_data": [
+                    {"key": "document", "type": "file"},
+                    {"key": "note", "type": "text", "value": "scan"},
+                ],
+            }
+            response = self.client.post(
+                EXECUTE_URL,
+                {
+                    "payload": json.dumps(payload),
+                    "document": SimpleUploadedFile("scan.pdf", b"%" * size, content_type="application/pdf"),
+                },
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        outbound = send.call_args.kwargs
+        self.assertIsInstance(outbound["data"], multipart.MultipartStream)
+        self.assertIsNone(outbound["files"])
+        self.assertTrue(outbound["headers"]["Content-Type"].startswith("multipart/form-data; boundary="))
+        self.assertEqual(response.data["json"]["received_bytes"], len(outbound["data"]))
+        self.assertGreater(len(outbound["data"]), size)
+        self.assertEqual(
+            response.data["request"]["form_data"],
+            [
+                {"key": "document", "type": "file", "filename": "scan.pdf", "content_type": "application/pdf", "size": size},
+                {"key": "note", "type": "text", "value": "scan"},
+            ],
+        )
+        self.assertEqual(models.ApiRun.objects.get().status, models.ApiRun.Status.PASSED)
+
+    def test_multipart_requires_json_payload(self) -> None:
+        response = self.client.post(EXECUTE_URL, {"payload": "not json"}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("payload", response.data)
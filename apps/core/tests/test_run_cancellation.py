@@ -0,0 +1,123 @@
+"""Tests for run deadlines and cancellation."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.core import benchmarks, models, run_control, services
+
+
+class RunCancellationTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="canceller", password="secret123")
+        self.client.force_authenticate(self.user)
+
+    def _collection(self, base_url: str, count: int) -> models.ApiCollection:
+        collection = models.ApiCollection.objects.create(name="Slow upstream")
+        for index in range(count):
+            models.ApiRequest.objects.create(
+                collection=collection, name=f"Slow {index}", method="GET", url=f"{base_url}/slow", order=index
+            )
+        return collection
+
+    def test_stop_aborts_in_flight_call_at_the_socket(self) -> None:
+        run = models.ApiRun.objects.create(status=models.ApiRun.Status.RUNNING)
+        raised = []
+        with benchmarks.stub_upstream(delay_ms=5000) as base_url, run_control.RunControl(run) as control:
+            def call() -> None:
+                try:
+                    control.request(method="GET", url=f"{base_url}/slow", timeout=30)
+                except Exception as exc:  # noqa: BLE001 - asserted below
+                    raised.append(exc)
+
+            worker = threading.Thread(target=call)
+            started = time.perf_counter()
+            worker.start()
+            time.sleep(0.3)
+            control.stop(run_control.CANCELLED_REASON)
+            worker.join(timeout=5)
+
+        self.assertLess(time.perf_counter() - started, 3)
+        self.assertEqual(len(raised), 1)
+        self.assertIsInstance(raised[0], run_control.RunStopped)
+        self.assertEqual(str(raised[0]), run_control.CANCELLED_REASON)
+
+    @override_settings(API_RUN_CANCEL_POLL_SECONDS=0.2)
+    def test_cancelled_collection_run_blocks_remaining_requests(self) -> None:
+        with benchmarks.stub_upstream(delay_ms=5000) as base_url, mock.patch.object(
+            run_control.RunControl, "cancel_requested", return_value=True
+        ):
+            collection = self._collection(base_url, 3)
+            started = time.perf_counter()
+            run = services.run_collection(collection=collection, user=self.user)
+
+        self.assertLess(time.perf_counter() - started, 3)
+        self.assertEqual(run.status, models.ApiRun.Status.CANCELLED)
+        self.assertEqual(run.summary["stopped"], run_control.CANCELLED_REASON)
+        self.assertEqual(list(run.results.values_list("error", flat=True)), [run_control.CANCELLED_REASON] * 3)
+
+    def test_collection_deadline_bounds_the_run(self) -> None:
+        with benchmarks.stub_upstream(delay_ms=5000) as base_url:
+            collection = self._collection(base_url, 2)
+            started = time.perf_counter()
+            run = services.run_collection(collection=collection, deadline_at=services.run_deadline(0.5))
+
+        self.assertLess(time.perf_counter() - started, 3)
+        self.assertEqual(run.status, models.ApiRun.Status.FAILED)
+        self.assertEqual(run.summary["stopped"], run_control.DEADLINE_REASON)
+        self.assertEqual(list(run.results.values_list("error", flat=True)), [run_control.DEADLINE_REASON] * 2)
+
+    def test_expired_batch_marks_cases_blocked_in_report(self) -> None:
+        project = models.Project.objects.create(name="Deadline project")
+        scenario = models.TestScenario.objects.create(project=project, title="Scenario")
+        collection = models.ApiCollection.objects.create(name="Deadline collection")
+        api_request = models.ApiRequest.objects.create(collection=collection, name="Ping", url="https://x.example/")
+        cases = [
+            models.TestCase.objects.create(scenario=scenario, title=f"Case {index}", related_api_request=api_request)
+            for index in range(2)
+        ]
+        report = models.AutomationReport.objects.create(triggered_in="Deadline", triggered_by=self.user)
+
+        with mock.patch("apps.core.services.requests.Session.request") as mock_request:
+            run = services.run_test_case_batch(
+                test_cases=cases, automation_report=report, deadline_at=timezone.now() - timedelta(seconds=1)
+            )
+
+        mock_request.assert_not_called()
+        rows = models.ApiRunResultReport.objects.filter(automation_report=report)
+        self.assertEqual(sorted(rows.values_list("testcase_id", flat=True)), sorted(case.pk for case in cases))
+        self.assertEqual({row.result.error for row in rows}, {run_control.DEADLINE_REASON})
+        self.assertIsNotNone(run.deadline_at)
+
+    def test_cancel_endpoint(self) -> None:
+        run = models.ApiRun.objects.create(status=models.ApiRun.Status.RUNNING, started_at=timezone.now())
+        url = reverse("core:core-runs-cancel", kwargs={"pk": run.pk})
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        run.refresh_from_db()
+        self.assertIsNotNone(run.cancel_requested_at)
+        self.assertTrue(run_control.RunControl(run).cancel_requested())
+
+        run.status = models.ApiRun.Status.PASSED
+        run.save(update_fields=["status"])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_invalid_deadline(self) -> None:
+        collection = models.ApiCollection.objects.create(name="Empty")
+        response = self.client.post(
+            reverse("core:core-collections-run", kwargs={"pk": collection.pk}), {"deadline_seconds": -5}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("deadline_seconds", response.data)
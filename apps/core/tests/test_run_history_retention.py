@@ -0,0 +1,78 @@
+"""Tests for run history archival and restore."""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core import models, services
+
+
+class RunHistoryRetentionTests(TestCase):
+    def setUp(self) -> None:
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.user = get_user_model().objects.create_user(username="keeper", password="secret123")
+        self.collection = models.ApiCollection.objects.create(name="History")
+        self.request = models.ApiRequest.objects.create(
+            collection=self.collection, name="Ping", method="GET", url="https://example.org/ping"
+        )
+        self.old_runs = [self._create_run(days_ago=120, passed=index % 2 == 0) for index in range(3)]
+        self.recent_run = self._create_run(days_ago=1, passed=True)
+
+    def _create_run(self, *, days_ago: int, passed: bool) -> models.ApiRun:
+        run = models.ApiRun.objects.create(
+            collection=self.collection,
+            triggered_by=self.user,
+            status=models.ApiRun.Status.PASSED if passed else models.ApiRun.Status.FAILED,
+        )
+        result_status = models.ApiRunResult.Status.PASSED if passed else models.ApiRunResult.Status.FAILED
+        models.ApiRunResult.objects.create(
+            run=run, request=self.request, status=result_status, response_time_ms=40.0, response_body="{}"
+        )
+        models.ApiRunResultReport.objects.create(run=run, request=self.request, status=result_status)
+        models.ApiRun.objects.filter(pk=run.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return run
+
+    def test_archive_and_restore_round_trip(self) -> None:
+        out = StringIO()
+        call_command("archive_run_history", "--days", "90", "--batch-size", "2", stdout=out)
+        self.assertIn("Archived 3 runs", out.getvalue())
+
+        self.assertEqual(list(models.ApiRun.objects.values_list("pk", flat=True)), [self.recent_run.pk])
+        self.assertEqual(models.ApiRunResult.objects.count(), 1)
+        self.assertEqual(models.ApiRunResultReport.objects.count(), 1)
+
+        archives = list(models.ApiRunArchive.objects.order_by("id"))
+        self.assertEqual([archive.run_count for archive in archives], [2, 1])
+        self.assertTrue(archives[0].file.name.startswith("archives/runs/"))
+        rollup = models.ApiRunDailyRollup.objects.get()
+        self.assertEqual((rollup.runs_total, rollup.runs_passed, rollup.runs_failed), (3, 2, 1))
+        self.assertEqual(rollup.response_time_count, 3)
+
+        self.request.delete()
+        call_command("restore_run_archive", *[str(archive.pk) for archive in archives], stdout=StringIO())
+        self.assertEqual(models.ApiRun.objects.count(), 4)
+        self.assertEqual(models.ApiRunResult.objects.count(), 4)
+        self.assertFalse(models.ApiRunResult.objects.filter(request__isnull=False).exists())
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.runs_total, 0)
+        self.assertTrue(all(archive.restored_at for archive in models.ApiRunArchive.objects.all()))
+
+    def test_dry_run_keeps_rows(self) -> None:
+        totals = services.archive_run_history(older_than_days=90, dry_run=True)
+        self.assertEqual(totals["runs"], 3)
+        self.assertEqual(totals["results"], 3)
+        self.assertEqual(models.ApiRun.objects.count(), 4)
+        self.assertFalse(models.ApiRunArchive.objects.exists())
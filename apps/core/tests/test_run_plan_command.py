@@ -0,0 +1,116 @@
+"""Tests for the headless ``run_plan`` management command."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from xml.etree import ElementTree as ET
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.core import models
+
+
+class RunPlanCommandTests(TestCase):
+    def setUp(self) -> None:
+        collection = models.ApiCollection.objects.create(name="Plan collection")
+        login_request = models.ApiRequest.objects.create(
+            collection=collection, name="Login", method="POST", url="https://upstream.example/login"
+        )
+        orders_request = models.ApiRequest.objects.create(
+            collection=collection,
+            name="Orders",
+            method="GET",
+            url="https://upstream.example/orders",
+            headers={"Authorization": "Bearer {{ token }}"},
+        )
+        models.ApiAssertion.objects.create(
+            request=orders_request, type=models.ApiAssertion.AssertionTypes.STATUS_CODE, expected_value="200"
+        )
+        self.project = models.Project.objects.create(name="Payments")
+        module = models.TestModules.objects.create(title="Checkout", project=self.project)
+        self.scenario = models.TestScenario.objects.create(
+            project=self.project, module=module, title="Orders", is_automated=True
+        )
+        self.login = models.TestCase.objects.create(
+            scenario=self.scenario, title="Login", related_api_request=login_request
+        )
+        self.orders = [
+            models.TestCase.objects.create(
+                scenario=self.scenario,
+                title=f"Orders {index}",
+                related_api_request=orders_request,
+                test_case_dependency=self.login,
+                dependency_response_key="token",
+            )
+            for index in range(3)
+        ]
+        manual = models.TestScenario.objects.create(project=self.project, title="Manual", is_automated=False)
+        models.TestCase.objects.create(scenario=manual, title="Manual", related_api_request=login_request)
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir, ignore_errors=True)
+        self.junit_path = os.path.join(tmpdir, "junit.xml")
+
+    def _respond(self, orders_status: int):
+        def respond(**kwargs):
+            response = mock.Mock()
+            response.headers = {"Content-Type": "application/json"}
+            if kwargs["url"].endswith("/login"):
+                body, response.status_code = {"token": "t-1"}, 200
+            else:
+                body, response.status_code = {"orders": []}, orders_status
+            response.text = json.dumps(body)
+            response.json.return_value = body
+            return response
+        return respond
+
+    def test_runs_selection_and_writes_ndjson_and_junit(self) -> None:
+        out = StringIO()
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond(200)) as mock_request:
+            call_command(
+                "run_plan", "--project", str(self.project.pk), "--workers", "3", "--junit", self.junit_path,
+                stdout=out, stderr=StringIO(),
+            )
+
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        results, summary = records[:-1], records[-1]
+        self.assertEqual([record["type"] for record in results], ["result"] * 4)
+        self.assertEqual(results[0]["testcase"], self.login.pk)
+        self.assertEqual(summary["type"], "summary")
+        self.assertEqual((summary["total"], summary["passed"]), (4, 4))
+        self.assertEqual(mock_request.call_count, 4)
+        for call in mock_request.call_args_list[1:]:
+            self.assertEqual(call.kwargs["headers"]["Authorization"], "Bearer t-1")
+
+        report = models.AutomationReport.objects.get(pk=summary["automation_report_id"])
+        self.assertEqual(report.triggered_in, "CLI")
+        self.assertEqual(models.ApiRunResultReport.objects.filter(automation_report=report).count(), 4)
+
+        suite = ET.parse(self.junit_path).getroot().find("testsuite")
+        self.assertEqual(suite.get("name"), "Payments / Orders")
+        self.assertEqual((suite.get("tests"), suite.get("failures"), suite.get("errors")), ("4", "0", "0"))
+
+    def test_failures_are_reported_and_exit_nonzero(self) -> None:
+        out = StringIO()
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._respond(500)):
+            with self.assertRaisesMessage(CommandError, "3 of 4 test cases did not pass"):
+                call_command(
+                    "run_plan", "--scenario", str(self.scenario.pk), "--junit", self.junit_path,
+                    stdout=out, stderr=StringIO(),
+                )
+
+        summary = json.loads(out.getvalue().splitlines()[-1])
+        self.assertEqual((summary["passed"], summary["failed"]), (1, 3))
+        root = ET.parse(self.junit_path).getroot()
+        self.assertEqual(root.get("failures"), "3")
+        self.assertEqual(len(root.findall(".//testcase/failure")), 3)
+
+    def test_requires_a_selection(self) -> None:
+        with self.assertRaisesMessage(CommandError, "Select test cases"):
+            call_command("run_plan", stdout=StringIO())
@@ -0,0 +1,101 @@
+"""Tests for scheduled regression runs."""
+
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
+from rest_framework.test import APITestCase
+
+from apps.core import models, services
+
+
+@override_settings(SCHEDULED_RUN_MAX_CONCURRENT=1, SCHEDULED_RUN_STALE_SECONDS=600)
+class ScheduledRunTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(username="scheduler", password="secret123")
+        self.client.force_authenticate(self.user)
+        collection = models.ApiCollection.objects.create(name="Nightly")
+        api_request = models.ApiRequest.objects.create(
+            collection=collection, name="Health", method="GET", url="https://sandbox.example/health"
+        )
+        project = models.Project.objects.create(name="Sandbox")
+        scenario = models.TestScenario.objects.create(project=project, title="Smoke", is_automated=True)
+        models.TestCase.objects.create(scenario=scenario, title="Health", related_api_request=api_request)
+        self.selection = {"scenario_ids": [scenario.pk]}
+        self.nightly = models.ScheduledRun.objects.create(name="Nightly", cron="0 2 * * *", selection=self.selection)
+        self.hourly = models.ScheduledRun.objects.create(name="Hourly", cron="0 * * * *", selection=self.selection)
+
+    def test_api_create_registers_beat_entry(self) -> None:
+        response = self.client.post(
+            reverse("core:core-scheduled-runs-list"),
+            {"name": "Smoke", "cron": "*/15  8-18 * * 1-5", "selection": {"scenario_ids": ["3", "x"]}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["selection"], {"scenario_ids": [3]})
+        schedule = models.ScheduledRun.objects.get(pk=response.data["id"])
+        task = schedule.periodic_task
+        self.assertEqual(task.task, services.SCHEDULED_RUN_TASK)
+        self.assertEqual(json.loads(task.args), [schedule.pk])
+        self.assertEqual((task.crontab.minute, task.crontab.hour, task.crontab.day_of_week), ("*/15", "8-18", "1-5"))
+
+        self.client.patch(
+            reverse("core:core-scheduled-runs-detail", kwargs={"pk": schedule.pk}), {"is_active": False}, format="json"
+        )
+        task.refresh_from_db()
+        self.assertFalse(task.enabled)
+        schedule.delete()
+        self.assertFalse(PeriodicTask.objects.filter(pk=task.pk).exists())
+
+    def test_api_rejects_bad_cron_and_empty_selection(self) -> None:
+        response = self.client.post(
+            reverse("core:core-scheduled-runs-list"), {"name": "Bad", "cron": "* *", "selection": {}}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"cron", "selection"})
+
+    def test_trigger_while_running_is_coalesced(self) -> None:
+        models.ScheduledRun.objects.filter(pk=self.nightly.pk).update(running_since=timezone.now())
+        with mock.patch("apps.core.services.requests.Session.request") as mock_request:
+            self.assertEqual(services.run_scheduled_plan(self.nightly.pk)["outcome"], "coalesced")
+            self.assertEqual(services.run_scheduled_plan(self.nightly.pk)["outcome"], "coalesced")
+        mock_request.assert_not_called()
+        self.nightly.refresh_from_db()
+        self.assertTrue(self.nightly.rerun_requested)
+        self.assertEqual(self.nightly.coalesced_count, 2)
+        self.assertFalse(models.ApiRun.objects.exists())
+
+    def test_global_cap_defers_other_schedules_until_a_slot_frees(self) -> None:
+        models.ScheduledRun.objects.filter(pk=self.nightly.pk).update(running_since=timezone.now())
+        self.assertEqual(services.claim_scheduled_run(self.hourly.pk), "capped")
+
+        with mock.patch("apps.core.tasks.trigger_scheduled_run.delay") as delay:
+            services.release_scheduled_run(self.nightly.pk)
+        delay.assert_called_once_with(self.hourly.pk)
+        self.hourly.refresh_from_db()
+        self.assertFalse(self.hourly.rerun_requested)
+
+    def test_stale_claim_does_not_block(self) -> None:
+        stale = timezone.now() - timedelta(seconds=601)
+        models.ScheduledRun.objects.filter(pk=self.nightly.pk).update(running_since=stale)
+        self.assertEqual(services.claim_scheduled_run(self.nightly.pk), "claimed")
+
+    def test_run_executes_selection_and_releases(self) -> None:
+        response = mock.Mock(status_code=200, headers={}, text="{}")
+        response.json.return_value = {}
+        with mock.patch("apps.core.services.requests.Session.request", return_value=response):
+            outcome = services.run_scheduled_plan(self.nightly.pk)
+
+        self.assertEqual(outcome["outcome"], "ran")
+        self.nightly.refresh_from_db()
+        self.assertIsNone(self.nightly.running_since)
+        self.assertEqual(self.nightly.last_run_id, outcome["run_id"])
+        report = models.ApiRunResultReport.objects.get(run_id=outcome["run_id"]).automation_report
+        self.assertEqual(report.triggered_in, "Schedule: Nightly")
@@ -0,0 +1,101 @@
+"""Tests for sharded test case batches."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.core import models, services, tasks
+from config.celery import app as celery_app
+
+
+class ShardedBatchTests(TestCase):
+    def setUp(self) -> None:
+        collection = models.ApiCollection.objects.create(name="Regression")
+        self.ok_request = models.ApiRequest.objects.create(
+            collection=collection, name="Ok", method="GET", url="https://sandbox.example/ok"
+        )
+        self.bad_request = models.ApiRequest.objects.create(
+            collection=collection, name="Bad", method="GET", url="https://sandbox.example/bad"
+        )
+        models.ApiAssertion.objects.create(
+            request=self.bad_request, type=models.ApiAssertion.AssertionTypes.STATUS_CODE, expected_value="201"
+        )
+        project = models.Project.objects.create(name="Regression")
+        self.scenarios = [
+            models.TestScenario.objects.create(project=project, title=f"Scenario {index}") for index in range(4)
+        ]
+
+    def _case(self, scenario, title, *, depends_on=None, api_request=None):
+        return models.TestCase.objects.create(
+            scenario=scenario,
+            title=title,
+            related_api_request=api_request or self.ok_request,
+            test_case_dependency=depends_on,
+            dependency_response_key="id" if depends_on else "",
+        )
+
+    def test_shards_keep_scenarios_and_dependency_chains_together(self) -> None:
+        first = [self._case(self.scenarios[0], f"A{index}") for index in range(3)]
+        login = self._case(self.scenarios[1], "Login")
+        linked = self._case(self.scenarios[2], "Linked", depends_on=login)
+        last = self._case(self.scenarios[3], "D")
+
+        shards = services.plan_batch_shards(first + [linked, last], 3)
+
+        self.assertEqual(len(shards), 3)
+        shard_of = {case.pk: index for index, shard in enumerate(shards) for case in shard}
+        self.assertEqual(len({shard_of[case.pk] for case in first}), 1)
+        self.assertEqual(shard_of[login.pk], shard_of[linked.pk])
+        self.assertEqual(sorted(len(shard) for shard in shards), [1, 2, 3])
+        self.assertEqual(len(services.plan_batch_shards(first, 5)), 1)
+
+    def test_dispatch_merges_shards_into_one_report(self) -> None:
+        cases = [self._case(scenario, f"Case {index}") for index, scenario in enumerate(self.scenarios[:3])]
+        cases.append(self._case(self.scenarios[3], "Broken", api_request=self.bad_request))
+        response = mock.Mock(status_code=200, headers={}, text="{}")
+        response.json.return_value = {}
+
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", eager)
+        with mock.patch("apps.core.services.requests.Session.request", return_value=response) as mock_request:
+            with self.captureOnCommitCallbacks(execute=True):
+                report, shards = services.dispatch_sharded_batch(
+                    test_cases=cases, shard_count=2, triggered_in="Nightly"
+                )
+
+        self.assertEqual(len(shards), 2)
+        self.assertEqual(mock_request.call_count, 4)
+        report.refresh_from_db()
+        self.assertEqual((report.total_passed, report.total_failed), (3, 1))
+        self.assertIsNotNone(report.finished)
+        runs = set(models.ApiRunResultReport.objects.filter(automation_report=report).values_list("run_id", flat=True))
+        self.assertEqual(len(runs), 2)
+
+    def test_failed_shard_closes_its_run_and_errback_finishes_report(self) -> None:
+        cases = [self._case(scenario, f"Case {index}") for index, scenario in enumerate(self.scenarios[:2])]
+        with mock.patch("celery.chord") as chord, self.captureOnCommitCallbacks(execute=True):
+            report, shards = services.dispatch_sharded_batch(test_cases=cases, shard_count=2)
+        callback = chord.return_value.call_args.args[0]
+        self.assertEqual(callback.task, tasks.finalize_sharded_batch.name)
+        errback = callback.options["link_error"][0]
+        self.assertEqual((errback.task, tuple(errback.args)), (tasks.abort_sharded_batch.name, (report.pk,)))
+
+        response = mock.Mock(status_code=200, headers={}, text="{}")
+        response.json.return_value = {}
+        with mock.patch("apps.core.services.requests.Session.request", return_value=response):
+            services.run_batch_shard(automation_report_id=report.pk, testcase_ids=shards[0])
+        with mock.patch.object(services, "_transmit_run_request", side_effect=RuntimeError("worker lost")):
+            with self.assertRaises(RuntimeError):
+                services.run_batch_shard(automation_report_id=report.pk, testcase_ids=shards[1], shard_index=1)
+        crashed = models.ApiRun.objects.get(summary__error="worker lost")
+        self.assertEqual(crashed.status, models.ApiRun.Status.FAILED)
+
+        report.refresh_from_db()
+        self.assertIsNone(report.finished)  # shards never finish the shared report themselves
+        tasks.abort_sharded_batch.apply(args=(report.pk,))
+        report.refresh_from_db()
+        self.assertIsNotNone(report.finished)
+        self.assertEqual((report.total_passed, report.total_failed), (1, 0))
@@ -0,0 +1,94 @@
+"""Tests for the per-host circuit breaker and retry budget on outbound test requests."""
+
+from __future__ import annotations
+
+from unittest import mock
+
+import requests
+from django.test import TestCase, override_settings
+
+from apps.core import circuit, models, services
+
+
+@override_settings(
+    UPSTREAM_CIRCUIT_FAILURE_THRESHOLD=2,
+    UPSTREAM_CIRCUIT_COOLDOWN_SECONDS=30,
+    UPSTREAM_RETRY_ATTEMPTS=0,
+    UPSTREAM_RETRY_BACKOFF_MS=0,
+)
+class UpstreamCircuitTests(TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(circuit, "_get_redis", return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        circuit._local_circuits.clear()
+        self.addCleanup(circuit._local_circuits.clear)
+
+    def _refuse(self, *args, **kwargs):
+        raise requests.ConnectionError("refused")
+
+    def test_trips_after_consecutive_failures_and_probes_after_cooldown(self) -> None:
+        send = mock.Mock(side_effect=self._refuse)
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                circuit.call("https://down.example/pay", send)
+        with self.assertRaises(circuit.CircuitOpen):
+            circuit.call("https://down.example/other", send)
+        self.assertEqual(send.call_count, 2)
+
+        # Other hosts are unaffected.
+        self.assertEqual(circuit.call("https://up.example/pay", lambda: "ok"), "ok")
+
+        later = circuit.time.time() + 31
+        with mock.patch.object(circuit.time, "time", return_value=later):
+            self.assertEqual(circuit.call("https://down.example/pay", lambda: "ok"), "ok")
+        self.assertNotIn("down.example", circuit._local_circuits)
+
+    def test_failed_probe_reopens_the_circuit(self) -> None:
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                circuit.call("https://down.example/pay", self._refuse)
+        later = circuit.time.time() + 31
+        with mock.patch.object(circuit.time, "time", return_value=later):
+            with self.assertRaises(requests.ConnectionError) as raised:
+                circuit.call("https://down.example/pay", self._refuse)
+            self.assertNotIsInstance(raised.exception, circuit.CircuitOpen)
+            with self.assertRaises(circuit.CircuitOpen):
+                circuit.call("https://down.example/pay", self._refuse)
+
+    @override_settings(UPSTREAM_CIRCUIT_FAILURE_THRESHOLD=0, UPSTREAM_RETRY_ATTEMPTS=3)
+    def test_retries_draw_from_the_run_budget(self) -> None:
+        budget = circuit.RetryBudget(2)
+        flaky = mock.Mock(side_effect=[requests.Timeout("slow"), requests.ConnectionError("reset"), "ok"])
+        self.assertEqual(circuit.call("https://flaky.example/", flaky, budget=budget), "ok")
+        self.assertEqual(budget.remaining, 0)
+
+        dead = mock.Mock(side_effect=self._refuse)
+        with self.assertRaises(requests.ConnectionError):
+            circuit.call("https://flaky.example/", dead, budget=budget)
+        self.assertEqual(dead.call_count, 1)
+
+    def test_http_errors_do_not_count_as_failures(self) -> None:
+        with self.assertRaises(requests.ConnectionError):
+            circuit.call("https://down.example/", self._refuse)
+        circuit.call("https://down.example/", lambda: mock.Mock(status_code=503))
+        with self.assertRaises(requests.ConnectionError):
+            circuit.call("https://down.example/", self._refuse)
+        with self.assertRaises(requests.ConnectionError) as raised:
+            circuit.call("https://down.example/", self._refuse)
+        self.assertNotIsInstance(raised.exception, circuit.CircuitOpen)
+
+    def test_collection_run_fails_fast_once_the_host_is_down(self) -> None:
+        collection = models.ApiCollection.objects.create(name="Dead sandbox")
+        for index in range(4):
+            models.ApiRequest.objects.create(
+                collection=collection, name=f"Call {index}", method="GET", url="https://down.example/items", order=index
+            )
+        with mock.patch("apps.core.services.requests.Session.request", side_effect=self._refuse) as mock_request:
+            run = services.run_collection(collection=collection)
+
+        self.assertEqual(mock_request.call_count, 2)
+        errors = list(run.results.order_by("order").values_list("error", flat=True))
+        self.assertEqual(errors[:2], ["refused", "refused"])
+        for error in errors[2:]:
+            self.assertIn("Circuit open for down.example", error)
@@ -0,0 +1,62 @@
+"""Tests for XML body transforms."""
+
+from __future__ import annotations
+
+from xml.etree import ElementTree as ET
+
+from django.test import SimpleTestCase
+
+from apps.core import services
+
+
+PAYLOAD = (
+    "<soap:Envelope xmlns:soap='http://schemas.xmlsoap.org/soap/envelope/'>"
+    "<soap:Body><pay:Request xmlns:pay='urn:pay'>"
+    "<pay:merchant>M1</pay:merchant>"
+    "<pay:item><pay:amount>10</pay:amount></pay:item>"
+    "<pay:item><pay:amount>20</pay:amount></pay:item>"
+    "<pay:signature/>"
+    "</pay:Request></soap:Body></soap:Envelope>"
+)
+
+
+class XmlTransformTests(SimpleTestCase):
+    def test_index_lookup_matches_linear_lookup(self) -> None:
+        root = ET.fromstring(PAYLOAD)
+        index = services._build_xml_index(root)
+        paths = [
+            "",
+            "Envelope",
+            "Envelope.Body.Request.merchant",
+            "Body/Request/item[1]/amount",
+            "soap:Body.pay:Request.item[0].amount",
+            "Body.Request.item[2].amount",
+            "Body.Request.missing",
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                self.assertIs(services._lookup_xml_node(root, index, path), services._locate_xml_node(root, path))
+
+    def test_transforms_apply_overrides_and_signatures(self) -> None:
+        transforms = {
+            "overrides": [{"path": "Body.Request.merchant", "value": "{{ merchant }}"}],
+            "signatures": [
+                {
+                    "target_path": "Body.Request.signature",
+                    "algorithm": "sha256",
+                    "components": "Body.Request.merchant\nBody.Request.item[1].amount\nliteral:key",
+                    "store_as": "sig",
+                }
+            ],
+        }
+        variables = {"merchant": "M2"}
+        first = services._apply_xml_body_transforms(PAYLOAD, transforms, variables)
+        root = ET.fromstring(first)
+        self.assertEqual(services._get_xml_node_text(root, "Body.Request.merchant"), "M2")
+        expected = services._compute_hash_hex("sha256", "M220key")
+        self.assertEqual(services._get_xml_node_text(root, "Body.Request.signature"), expected)
+        self.assertEqual(variables["sig"], expected)
+
+        # The cached template must not leak mutations from the previous call.
+        second = services._apply_xml_body_transforms(PAYLOAD, {"overrides": []}, {})
+        self.assertEqual(services._get_xml_node_text(ET.fromstring(second), "Body.Request.merchant"), "M1")
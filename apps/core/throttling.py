@@ -0,0 +1,204 @@
+"""Admission control for the API tester execute endpoint.
+
+Each execute call must take a token from the caller's token bucket and hold an in-flight
+slot for both the caller and the upstream host while the request is proxied. State lives
+in Redis when ``REDIS_URL`` is configured so every web worker shares the same limits;
+otherwise a process-local fallback applies the same rules per worker.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+
+try:  # avoid hard dependency at import time
+    from apps.accounts.services import _get_redis
+except Exception:  # pragma: no cover
+    def _get_redis():  # type: ignore[misc]
+        return None
+
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "core:execute:bucket:{user_id}"
+USER_SLOT_KEY = "core:execute:inflight:user:{user_id}"
+HOST_SLOT_KEY = "core:execute:inflight:host:{host}"
+
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+# In-flight slots are members of a sorted set scored by their own expiry, so a slot leaked
+# by a crashed worker lapses after EXECUTE_SLOT_TTL no matter how busy the key stays.
+_ACQUIRE_SLOT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= limit then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + ttl, ARGV[4])
+redis.call('EXPIRE', KEYS[1], math.ceil(ttl))
+return 1
+"""
+
+_local_lock = threading.Lock()
+_local_buckets: Dict[str, Tuple[float, float]] = {}
+_local_slots: Dict[str, Dict[str, float]] = {}
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return float(getattr(settings, name, default) or 0)
+    except (TypeError, ValueError):
+        return float(default)
+
+
+def _local_take_token(key: str, rate: float, burst: float, now: float) -> float:
+    with _local_lock:
+        tokens, ts = _local_buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+        wait = 0.0
+        if tokens < 1:
+            wait = (1 - tokens) / rate
+        else:
+            tokens -= 1
+        _local_buckets[key] = (tokens, now)
+    return wait
+
+
+def take_token(key: str, *, rate: float, burst: float) -> float:
+    """Take one token from bucket ``key``; return seconds to wait (0 when admitted)."""
+    if rate <= 0:
+        return 0.0
+    burst = max(1.0, burst)
+    now = time.time()
+    client = _get_redis()
+    if client is not None:
+        try:
+            return float(client.eval(_TOKEN_BUCKET_SCRIPT, 1, key, rate, burst, now))
+        except Exception:
+            logger.warning("execute admission: redis token bucket unavailable, using local fallback", exc_info=True)
+    return _local_take_token(key, rate, burst, now)
+
+
+def acquire_slot(key: str, *, limit: int, ttl: int) -> Optional[str]:
+    """Reserve an in-flight slot under ``key`` if fewer than ``limit`` are held.
+
+    Returns the slot id to pass to ``release_slot``, or ``None`` when the limit is reached.
+    """
+    slot = uuid.uuid4().hex
+    if limit <= 0:
+        return slot
+    now = time.time()
+    client = _get_redis()
+    if client is not None:
+        try:
+            if int(client.eval(_ACQUIRE_SLOT_SCRIPT, 1, key, now, limit, ttl, slot)):
+                return slot
+            return None
+        except Exception:
+            logger.warning("execute admission: redis slot set unavailable, using local fallback", exc_info=True)
+    with _local_lock:
+        held = {held_slot: expires for held_slot, expires in _local_slots.get(key, {}).items() if expires > now}
+        if len(held) >= limit:
+            _local_slots[key] = held
+            return None
+        held[slot] = now + ttl
+        _local_slots[key] = held
+    return slot
+
+
+def release_slot(key: str, slot: str) -> None:
+    client = _get_redis()
+    if client is not None:
+        try:
+            client.zrem(key, slot)
+            return
+        except Exception:
+            logger.warning("execute admission: failed to release redis slot %s", key, exc_info=True)
+    with _local_lock:
+        held = _local_slots.get(key)
+        if held is not None:
+            held.pop(slot, None)
+            if not held:
+                _local_slots.pop(key, None)
+
+
+class ExecuteAdmission:
+    """Slots held by one execute call; released by ``execute_admission`` on exit."""
+
+    def __init__(self) -> None:
+        self._held: List[Tuple[str, str]] = []
+
+    def _hold(self, key: str, limit: int) -> None:
+        ttl = int(_setting("EXECUTE_SLOT_TTL", 300))
+        slot = acquire_slot(key, limit=limit, ttl=ttl)
+        if slot is None:
+            raise Throttled(
+                wait=math.ceil(_setting("EXECUTE_BUSY_RETRY_AFTER", 1)),
+                detail="Too many requests are already in flight; retry shortly.",
+            )
+        self._held.append((key, slot))
+
+    def enter_host(self, url: Optional[str]) -> None:
+        """Reserve an in-flight slot for the upstream host of ``url``."""
+        limit = int(_setting("EXECUTE_MAX_IN_FLIGHT_PER_HOST", 0))
+        host = (urlparse(str(url or "")).hostname or "").lower()
+        if limit > 0 and host:
+            self._hold(HOST_SLOT_KEY.format(host=host), limit)
+
+    def release(self) -> None:
+        while self._held:
+            release_slot(*self._held.pop())
+
+
+@contextmanager
+def execute_admission(user) -> Iterator[ExecuteAdmission]:
+    """Admit one execute call for ``user`` or raise ``Throttled`` (HTTP 429 with Retry-After)."""
+    user_id = getattr(user, "pk", None) or "anonymous"
+    wait = take_token(
+        BUCKET_KEY.format(user_id=user_id),
+        rate=_setting("EXECUTE_RATE_PER_SECOND", 0),
+        burst=_setting("EXECUTE_RATE_BURST", 1),
+    )
+    if wait > 0:
+        raise Throttled(wait=math.ceil(wait))
+
+    admission = ExecuteAdmission()
+    try:
+        limit = int(_setting("EXECUTE_MAX_IN_FLIGHT_PER_USER", 0))
+        if limit > 0:
+            admission._hold(USER_SLOT_KEY.format(user_id=user_id), limit)
+        yield admission
+    finally:
+        admission.release()
@@ -9,7 +9,9 @@ router = DefaultRouter()
 router.register(r"collections", views.ApiCollectionViewSet, basename="core-collections")
 router.register(r"environments", views.ApiEnvironmentViewSet, basename="core-environments")
 router.register(r"runs", views.ApiRunViewSet, basename="core-runs")
+router.register(r"scheduled-runs", views.ScheduledRunViewSet, basename="core-scheduled-runs")
 router.register(r"requests", views.ApiRequestViewSet, basename="core-requests")
+router.register(r"datasets", views.ApiDatasetViewSet, basename="core-datasets")
 router.register(r"directories", views.ApiCollectionDirectoryViewSet, basename="core-directories")
 router.register(r"test-plans", views.ProjectViewSet, basename="core-test-plans")
 router.register(r"test-scenarios", views.TestScenarioViewSet, basename="core-test-scenarios")
@@ -23,6 +25,7 @@ urlpatterns = router.urls
 
 urlpatterns += [
 	path("tester/execute/", views.ApiAdhocRequestView.as_view(), name="core-request-execute"),
+	path("tester/execute-async/", views.api_execute_async, name="core-request-execute-async"),
 	path("automation-report/finalize/", views.AutomationReportFinalizeView.as_view(), name="core-automation-report-finalize"),
 	path("automation-report/create/", views.AutomationReportCreateView.as_view(), name="core-automation-report-create"),
 	path("automation-report/<int:pk>/testcase/<str:testcase_id>/", views.AutomationReportTestcaseDetailView.as_view(), name="core-automation-report-testcase-detail"),
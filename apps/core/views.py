@@ -15,11 +15,14 @@ import subprocess
 import sys
 import threading
 import time
+from datetime import timedelta
 from pathlib import Path
+from types import SimpleNamespace
 from urllib.parse import urlparse
 
 import requests
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 # Optional dependency: PyCryptodome for AES-CBC handling
 try:  # pragma: no cover - environment dependent
@@ -39,6 +42,7 @@ from django.http import Http404
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from django.views.decorators.csrf import ensure_csrf_cookie
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -54,7 +58,7 @@ try:  # optional at import time; present via django-rest-knox
 except Exception:  # pragma: no cover
     AuthToken = None  # type: ignore
 
-from . import models, selectors, serializers, services
+from . import circuit, models, multipart, selectors, serializers, services, tasks, throttling
 try:  # avoid hard dependency at import time
     from apps.accounts import models as account_models
     from apps.accounts import services as account_services
@@ -107,6 +111,26 @@ def _automation_run_action(triggered_in: str | None):
         return account_models.UserAuditTrail.Actions.RUN_AUTOMATION_TEST_CASE
     return None
 
+
+def _automation_report_audited(report_id) -> bool:
+    """Whether creating automation report ``report_id`` logged a run action (see above)."""
+    if not report_id:
+        return False
+    try:
+        triggered_in = models.AutomationReport.objects.filter(pk=int(report_id)).values_list("triggered_in", flat=True).first()
+    except (TypeError, ValueError):
+        return False
+    return triggered_in is not None and _automation_run_action(triggered_in) is not None
+
+
+def _run_deadline_from(data) -> Any:
+    """Absolute deadline for a run from the optional ``deadline_seconds`` request field."""
+    try:
+        return services.run_deadline(data.get("deadline_seconds"))
+    except ValueError as exc:
+        raise ValidationError({"deadline_seconds": str(exc)}) from exc
+
+
 DEFAULT_AES_KEY = "kRdVzIqmQsfpRGItSLP5SDz0jkRLO9Cm"
 DEFAULT_AES_IV = "1gJFNMeeQODA7wJA"
 DEFAULT_CHANNEL_KEY = "dgzCF9eJw2uX9LNV4JrkQLxSHxBlZeGV"
@@ -262,6 +286,30 @@ class ApiEnvironmentViewSet(viewsets.ModelViewSet):
         if account_models:
             _log_user_action(self.request, account_models.UserAuditTrail.Actions.DELETE_API_ENVIRONMENT)
 
+    @action(detail=True, methods=["get", "delete"], url_path="recordings")
+    def recordings(self, request, pk=None):
+        """List or clear the responses recorded for replay in this environment."""
+        environment = self.get_object()
+        recordings = environment.recordings.all()
+        if request.method == "DELETE":
+            deleted, _ = recordings.delete()
+            return Response({"deleted": deleted})
+        return Response(serializers.ApiRecordingSerializer(recordings, many=True).data)
+
+    @action(detail=True, methods=["post"], url_path="import-recordings")
+    def import_recordings(self, request, pk=None):
+        """Seed replay recordings from the latest stored result of each request."""
+        environment = self.get_object()
+        collection = None
+        collection_id = request.data.get("collection")
+        if collection_id not in (None, ""):
+            try:
+                collection = models.ApiCollection.objects.get(pk=int(collection_id))
+            except (TypeError, ValueError, models.ApiCollection.DoesNotExist) as exc:
+                raise ValidationError({"collection": "Collection not found."}) from exc
+        imported = services.import_recordings_from_results(environment=environment, collection=collection)
+        return Response({"imported": imported}, status=status.HTTP_201_CREATED)
+
 
 class ApiCollectionViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.ApiCollectionSerializer
@@ -297,6 +345,7 @@ class ApiCollectionViewSet(viewsets.ModelViewSet):
             environment=environment,
             overrides=overrides,
             user=user,
+            deadline_at=_run_deadline_from(request.data),
         )
         serializer = serializers.ApiRunSerializer(run, context=self.get_serializer_context())
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -339,6 +388,43 @@ class ApiCollectionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class ApiDatasetViewSet(viewsets.ModelViewSet):
+    serializer_class = serializers.ApiDatasetSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = models.ApiDataset.objects.select_related("request", "test_case__related_api_request")
+        request_id = self.request.query_params.get("request")
+        if request_id:
+            queryset = queryset.filter(request_id=request_id)
+        test_case_id = self.request.query_params.get("test_case")
+        if test_case_id:
+            queryset = queryset.filter(test_case_id=test_case_id)
+        return queryset
+
+    @action(detail=True, methods=["post"], url_path="run")
+    def run(self, request, pk=None):
+        dataset = self.get_object()
+        environment = None
+        environment_id = request.data.get("environment")
+        if environment_id is not None:
+            environment = models.ApiEnvironment.objects.filter(pk=environment_id).first()
+            if environment is None:
+                raise NotFound("Environment not found")
+
+        overrides = request.data.get("overrides") or {}
+        if not isinstance(overrides, dict):
+            raise ValidationError({"overrides": "Overrides must be an object"})
+
+        user: Any = request.user if request.user.is_authenticated else None
+        try:
+            run = services.run_dataset(dataset=dataset, environment=environment, overrides=overrides, user=user)
+        except ValueError as exc:
+            raise ValidationError({"dataset": str(exc)}) from exc
+        serializer = serializers.ApiRunSerializer(run, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 class ApiRequestViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.ApiRequestSerializer
     permission_classes = [IsAuthenticated]
@@ -350,6 +436,52 @@ class ApiRequestViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(collection_id=collection_id)
         return queryset
 
+    @action(detail=True, methods=["get"], url_path="latency")
+    def latency(self, request, pk=None):
+        """Latency percentiles for this request, per day/week/month and overall."""
+        api_request = self.get_object()
+        start_str = (request.query_params.get("start") or "").strip()
+        end_str = (request.query_params.get("end") or "").strip()
+        try:
+            end = parse_date(end_str) if end_str else timezone.localdate()
+            start = parse_date(start_str) if start_str else None
+        except ValueError:
+            end = start = None
+        if end is None or (start_str and start is None):
+            raise ValidationError({"start": "Dates must be YYYY-MM-DD."})
+        start = start or (end - timedelta(days=29))
+        if start > end:
+            raise ValidationError({"start": "Start must be on or before end."})
+        group = (request.query_params.get("group") or "day").lower()
+        if group not in ("day", "week", "month"):
+            raise ValidationError({"group": "Group must be day, week or month."})
+
+        # Include this process's queued execute latencies.
+        services.flush_request_latencies()
+        sketches = list(selectors.api_latency_sketch_list(request_id=api_request.pk, start=start, end=end))
+        grouped: dict[Any, list[models.ApiLatencySketch]] = {}
+        for sketch in sketches:
+            if group == "week":
+                key = sketch.day - timedelta(days=sketch.day.weekday())
+            elif group == "month":
+                key = sketch.day.replace(day=1)
+            else:
+                key = sketch.day
+            grouped.setdefault(key, []).append(sketch)
+
+        points = [
+            {"period": key.isoformat(), **services.latency_quantiles(services.merge_latency_sketches(items))}
+            for key, items in grouped.items()
+        ]
+        return Response({
+            "request": api_request.pk,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "group": group,
+            "points": points,
+            "overall": services.latency_quantiles(services.merge_latency_sketches(sketches)),
+        })
+
     @action(detail=True, methods=["get"], url_path="last-run")
     def last_run(self, request, pk=None):
         api_request = self.get_object()
@@ -473,6 +605,26 @@ class ApiCollectionDirectoryViewSet(viewsets.ModelViewSet):
         return Response({"status": "ok"}, status=status.HTTP_200_OK)
 
 
+class ScheduledRunViewSet(viewsets.ModelViewSet):
+    serializer_class = serializers.ScheduledRunSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return selectors.scheduled_run_list()
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user if self.request.user.is_authenticated else None)
+
+    @action(detail=True, methods=["post"], url_path="trigger")
+    def trigger(self, request, pk=None):
+        schedule = self.get_object()
+        if not schedule.is_active:
+            raise ValidationError({"is_active": "Schedule is paused."})
+        # Manual triggers go through the same task so coalescing and the cap still apply.
+        tasks.trigger_scheduled_run.delay(schedule.pk)
+        return Response({"queued": True, "schedule": schedule.pk}, status=status.HTTP_202_ACCEPTED)
+
+
 class ApiRunViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = serializers.ApiRunSerializer
     permission_classes = [IsAuthenticated]
@@ -486,6 +638,40 @@ class ApiRunViewSet(viewsets.ReadOnlyModelViewSet):
             raise Http404
         return instance
 
+    @action(detail=True, methods=["post"], url_path="cancel")
+    def cancel(self, request, pk=None):
+        """Stop a running run: in-flight calls are aborted and remaining cases are blocked."""
+        run = self.get_object()
+        try:
+            services.cancel_run(run)
+        except ValueError as exc:
+            raise ValidationError({"status": str(exc)}) from exc
+        return Response(
+            {"id": run.pk, "status": run.status, "cancel_requested_at": run.cancel_requested_at},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=False, methods=["get"], url_path="phases")
+    def phases(self, request):
+        """Per-phase timing aggregates, optionally filtered by request, run and age in days."""
+        filters: dict[str, Any] = {}
+        for name in ("request", "run", "days"):
+            raw = (request.query_params.get(name) or "").strip()
+            if not raw:
+                continue
+            try:
+                filters[name] = int(raw)
+            except ValueError:
+                raise ValidationError({name: "Must be an integer."})
+        since = timezone.now() - timedelta(days=filters["days"]) if "days" in filters else None
+        summary = selectors.api_run_result_phase_summary(
+            phases=services.RUN_PHASES,
+            request_id=filters.get("request"),
+            run_id=filters.get("run"),
+            since=since,
+        )
+        return Response({"phases": summary})
+
 
 class ProjectViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.ProjectSerializer
@@ -653,14 +839,7 @@ class ScenarioCommentViewSet(viewsets.ModelViewSet):
     parser_classes = [JSONParser, FormParser, MultiPartParser]
 
     def get_queryset(self):
-        queryset = models.ScenarioComment.objects.select_related("user", "scenario").prefetch_related(
-            "replies__user",
-            "likes",
-            "reactions",
-            "replies__reactions",
-            "attachments",
-            "replies__attachments",
-        ).all()
+        queryset = selectors.scenario_comment_list(user=self.request.user)
         scenario_id = self.request.query_params.get("scenario")
         if scenario_id:
             queryset = queryset.filter(scenario_id=scenario_id)
@@ -838,14 +1017,7 @@ class TestCaseCommentViewSet(viewsets.ModelViewSet):
     parser_classes = [JSONParser, FormParser, MultiPartParser]
 
     def get_queryset(self):
-        queryset = models.TestCaseComment.objects.select_related("user", "test_case").prefetch_related(
-            "replies__user",
-            "likes",
-            "reactions",
-            "replies__reactions",
-            "attachments",
-            "replies__attachments",
-        ).all()
+        queryset = selectors.test_case_comment_list(user=self.request.user)
         test_case_id = self.request.query_params.get("test_case")
         if test_case_id:
             queryset = queryset.filter(test_case_id=test_case_id)
@@ -1098,6 +1270,57 @@ class TestCaseViewSet(viewsets.ModelViewSet):
             _log_user_action(request, account_models.UserAuditTrail.Actions.DELETE_TEST_CASE)
         return response
 
+    @action(detail=False, methods=["post"], url_path="run-batch")
+    def run_batch(self, request):
+        raw_ids = request.data.get("test_cases")
+        if not isinstance(raw_ids, list) or not raw_ids:
+            raise ValidationError({"test_cases": "Provide a non-empty list of test case ids."})
+        try:
+            ids = [int(value) for value in raw_ids]
+        except (TypeError, ValueError) as exc:
+            raise ValidationError({"test_cases": "Test case ids must be integers."}) from exc
+
+        cases_by_id = {
+            case.pk: case
+            for case in models.TestCase.objects.select_related("related_api_request").filter(pk__in=ids)
+        }
+        missing = [case_id for case_id in ids if case_id not in cases_by_id]
+        if missing:
+            raise NotFound(f"Test cases not found: {', '.join(str(case_id) for case_id in missing)}")
+
+        environment = None
+        environment_id = request.data.get("environment")
+        if environment_id not in (None, ""):
+            environment = models.ApiEnvironment.objects.filter(pk=environment_id).first()
+            if environment is None:
+                raise NotFound("Environment not found")
+
+        automation_report = None
+        report_id = request.data.get("automation_report")
+        if report_id not in (None, ""):
+            automation_report = models.AutomationReport.objects.filter(pk=report_id).first()
+            if automation_report is None:
+                raise NotFound("Automation report not found")
+
+        overrides = request.data.get("overrides") or {}
+        if not isinstance(overrides, dict):
+            raise ValidationError({"overrides": "Overrides must be an object"})
+
+        user: Any = request.user if request.user.is_authenticated else None
+        run = services.run_test_case_batch(
+            test_cases=[cases_by_id[case_id] for case_id in dict.fromkeys(ids)],
+            environment=environment,
+            overrides=overrides,
+            user=user,
+            automation_report=automation_report,
+            triggered_in=str(request.data.get("triggered_in") or "Test case batch"),
+            deadline_at=_run_deadline_from(request.data),
+        )
+        if account_models:
+            _log_user_action(request, account_models.UserAuditTrail.Actions.RUN_TEST_CASE)
+        serializer = serializers.ApiRunSerializer(run, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     def get_queryset(self):
         queryset = selectors.test_case_list()
         search = self.request.query_params.get("search")
@@ -1514,7 +1737,7 @@ def automation_reports(request):
     except Exception:
         pass
     try:
-        testcase_reports_qs = models.ApiRunResultReport.objects.select_related("testcase", "run", "request").order_by("-created_at")[:100]
+        testcase_reports_qs = models.ApiRunResultReport.objects.select_related("testcase", "run", "request", "result").order_by("-created_at")[:100]
         # base serialized list (from serializer)
         testcase_reports_serialized = serializers.ApiRunResultReportSerializer(testcase_reports_qs, many=True).data
         # Build a lookup of automation_report.id -> triggered_by (from serialized automation_reports)
@@ -2408,22 +2631,33 @@ class ApiAdhocRequestView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):  # noqa: D401
-        payload = request.data or {}
+        # Rate and in-flight limits keep one heavy batch from starving interactive users;
+        # rejected calls get 429 with Retry-After from DRF's Throttled handling.
+        with throttling.execute_admission(request.user) as admission:
+            return self._execute(request, admission)
 
+    def _execute(self, request, admission: throttling.ExecuteAdmission):
+        prepared = self._prepare_execution(request, admission)
+        start = time.perf_counter()
+        try:
+            response = self._send(prepared)
+        except requests.RequestException as exc:  # pragma: no cover - network error path
+            return self._execution_failed(prepared, exc, (time.perf_counter() - start) * 1000)
+        return self._execution_finished(prepared, response, (time.perf_counter() - start) * 1000)
+
+    def _prepare_execution(self, request, admission: throttling.ExecuteAdmission) -> SimpleNamespace:
+        """Validate the payload, resolve the outbound request and create the pending run rows."""
+        payload = self._execute_payload(request)
+        timer = services.PhaseTimer()
+
+        # Requests issued as part of an automation report whose creation was audited are
+        # not logged again; ad-hoc executions and unaudited reports are logged here. The
+        # report is only looked up when the row would not be coalesced away anyway.
+        report_id = payload.get("automation_report_id") or payload.get("automationReportId")
         if account_models:
             action = account_models.UserAuditTrail.Actions.RUN_TEST_CASE
-            report_id = payload.get("automation_report_id") or payload.get("automationReportId")
-            if report_id:
-                try:
-                    report = models.AutomationReport.objects.filter(id=int(report_id)).only("triggered_in").first()
-                    if report and report.triggered_in:
-                        triggered_text = str(report.triggered_in).lower()
-                        if any(token in triggered_text for token in ("project", "module", "scenario", "case", "testcase", "individual", "run")):
-                            action = account_models.UserAuditTrail.Actions.RUN_AUTOMATION_TEST_CASE
-                except Exception:
-                    pass
-
-            if action != account_models.UserAuditTrail.Actions.RUN_AUTOMATION_TEST_CASE:
+            user = getattr(request, "user", None)
+            if not account_services.audit_coalesced(user=user, action=action) and not _automation_report_audited(report_id):
                 _log_user_action(request, action)
 
         # Temporary debug: log a safe summary of incoming body_transforms and environment
@@ -2526,47 +2760,17 @@ class ApiAdhocRequestView(APIView):
                     collection = api_request.collection
 
         # If no explicit environment was provided but the collection has environments,
-        # prefer an environment that contains any template variables referenced by
-        # the request's body_transforms (for example `non_realtime_mid`). If none
-        # match, fall back to the first environment.
+        # prefer one that defines the template variables referenced by the request's
+        # body_transforms (for example `non_realtime_mid`), else the first environment.
         if environment is None and collection is not None:
             try:
-                transforms_to_apply = None
-                if isinstance(payload.get("body_transforms"), dict):
-                    transforms_to_apply = payload.get("body_transforms")
-                elif api_request and getattr(api_request, "body_transforms", None):
-                    transforms_to_apply = api_request.body_transforms
-
-                chosen_env = None
-                envs_qs = collection.environments.all()
-                # If transforms reference template variables, try to pick an env that contains them
-                if transforms_to_apply:
-                    try:
-                        import json as _json
-                        raw_text = _json.dumps(transforms_to_apply)
-                        keys = set(services.VARIABLE_PATTERN.findall(raw_text))
-                        if keys:
-                            # Prefer an environment that contains all referenced keys (strong match)
-                            for candidate in envs_qs:
-                                vars_map = candidate.variables or {}
-                                if all(k in vars_map for k in keys):
-                                    chosen_env = candidate
-                                    break
-                            # If no env contains all keys, fall back to any env that has at least one of the keys
-                            if chosen_env is None:
-                                for candidate in envs_qs:
-                                    vars_map = candidate.variables or {}
-                                    if any(k in vars_map for k in keys):
-                                        chosen_env = candidate
-                                        break
-                    except Exception:
-                        chosen_env = None
-
-                if chosen_env is None:
-                    chosen_env = envs_qs.first()
-
-                if chosen_env is not None:
-                    environment = chosen_env
+                explicit_transforms = payload.get("body_transforms")
+                environment = services.choose_environment_for_request(
+                    collection=collection,
+                    api_request=api_request,
+                    body_transforms=explicit_transforms if isinstance(explicit_transforms, dict) else None,
+                )
+                if environment is not None:
                     variables.update(environment.variables or {})
                     default_headers = environment.default_headers or {}
                     headers = {**default_headers, **headers}
@@ -2595,9 +2799,11 @@ class ApiAdhocRequestView(APIView):
                 pass
 
         # Resolve url/headers/params after collection/environment and overrides have been merged
-        resolved_url = services._resolve_variables(url, variables)  # type: ignore[attr-defined]
-        resolved_headers = services._resolve_variables(headers, variables)  # type: ignore[attr-defined]
-        resolved_params = services._resolve_variables(params, variables)  # type: ignore[attr-defined]
+        with timer.phase("resolve"):
+            resolved_url = services._resolve_variables(url, variables)  # type: ignore[attr-defined]
+            resolved_headers = services._resolve_variables(headers, variables)  # type: ignore[attr-defined]
+            resolved_params = services._resolve_variables(params, variables)  # type: ignore[attr-defined]
+        admission.enter_host(resolved_url)
 
         form_data_entries = payload.get("form_data") or []
         if form_data_entries and not isinstance(form_data_entries, list):
@@ -2609,10 +2815,12 @@ class ApiAdhocRequestView(APIView):
         resolved_body: Any = None
         files_payload: dict[str, tuple[str, io.BytesIO, str]] | None = None
         request_form_snapshot: list[dict[str, Any]] | None = None
+        upload_stream: multipart.MultipartStream | None = None
 
         if form_data_entries:
             text_fields: dict[str, Any] = {}
             file_fields: dict[str, dict[str, Any]] = {}
+            uploads: dict[str, multipart.FilePart] = {}
             request_form_snapshot = []
 
             for entry in form_data_entries:
@@ -2622,7 +2830,24 @@ class ApiAdhocRequestView(APIView):
                 if not key:
                     continue
                 entry_type = entry.get("type", "text")
-                if entry_type == "file":
+                upload = None
+                if entry_type == "file" and not entry.get("data"):
+                    upload = request.FILES.get(str(entry.get("upload") or key))
+                if upload is not None:
+                    # Multipart upload: forwarded from Django's upload (memory or temp file) as is.
+                    filename = entry.get("filename") or upload.name or "upload.bin"
+                    content_type = entry.get("content_type") or upload.content_type or "application/octet-stream"
+                    uploads[key] = (filename, upload, content_type, upload.size)
+                    request_form_snapshot.append(
+                        {
+                            "key": key,
+                            "type": "file",
+                            "filename": filename,
+                            "content_type": content_type,
+                            "size": upload.size,
+                        }
+                    )
+                elif entry_type == "file":
                     data_url = entry.get("data")
                     if not data_url or not isinstance(data_url, str):
                         continue
@@ -2660,7 +2885,8 @@ class ApiAdhocRequestView(APIView):
                     request_form_snapshot.append({"key": key, "type": "text", "value": value})
 
             if text_fields:
-                resolved_text = services._resolve_variables(text_fields, variables)  # type: ignore[attr-defined]
+                with timer.phase("resolve"):
+                    resolved_text = services._resolve_variables(text_fields, variables)  # type: ignore[attr-defined]
                 if isinstance(resolved_text, dict):
                     resolved_body = resolved_text
                 else:  # pragma: no cover - defensive fallback
@@ -2671,7 +2897,12 @@ class ApiAdhocRequestView(APIView):
             elif request_form_snapshot:  # at least one file entry
                 resolved_body = None
 
-            if file_fields:
+            if uploads:
+                # Stream every part so uploads are never copied into memory whole.
+                for key, meta in file_fields.items():
+                    uploads[key] = (meta["filename"], io.BytesIO(meta["bytes"]), meta["content_type"], len(meta["bytes"]))
+                upload_stream = multipart.MultipartStream(resolved_body or {}, uploads)
+            elif file_fields:
                 files_payload = {
                     key: (meta["filename"], io.BytesIO(meta["bytes"]), meta["content_type"])
                     for key, meta in file_fields.items()
@@ -2679,7 +2910,8 @@ class ApiAdhocRequestView(APIView):
         elif json_body is not None:
             if not isinstance(json_body, (dict, list)):
                 raise ValidationError({"json": "JSON body must be an object or array."})
-            resolved_json = services._resolve_variables(json_body, variables)  # type: ignore[attr-defined]
+            with timer.phase("resolve"):
+                resolved_json = services._resolve_variables(json_body, variables)  # type: ignore[attr-defined]
             # If JSON payload is an object, apply body_transforms (overrides/signatures).
             if isinstance(resolved_json, dict):
                 transforms_to_apply = None
@@ -2689,17 +2921,20 @@ class ApiAdhocRequestView(APIView):
                     transforms_to_apply = api_request.body_transforms
                 if transforms_to_apply:
                     try:
-                        overrides_map = services._apply_body_transforms(resolved_json, transforms_to_apply, variables)
+                        with timer.phase("transforms"):
+                            overrides_map = services._apply_body_transforms(resolved_json, transforms_to_apply, variables)
                         # update variables with any values produced by signature builders
                         variables.update(overrides_map or {})
                     except Exception:
                         # best-effort: continue with untransformed payload
                         pass
         elif body not in (None, ""):
-            if isinstance(body, (dict, list)):
-                resolved_json = services._resolve_variables(body, variables)  # type: ignore[attr-defined]
-            else:
-                resolved_body = services._resolve_variables(str(body), variables)  # type: ignore[attr-defined]
+            with timer.phase("resolve"):
+                if isinstance(body, (dict, list)):
+                    resolved_json = services._resolve_variables(body, variables)  # type: ignore[attr-defined]
+                else:
+                    resolved_body = services._resolve_variables(str(body), variables)  # type: ignore[attr-defined]
+            if not isinstance(body, (dict, list)):
                 # If body is raw XML and transforms are present, apply XML transforms
                 try:
                     raw_type = payload.get("body_raw_type") or ""
@@ -2711,7 +2946,8 @@ class ApiAdhocRequestView(APIView):
                             transforms_to_apply = api_request.body_transforms
                         if transforms_to_apply:
                             try:
-                                resolved_body = services._apply_xml_body_transforms(resolved_body, transforms_to_apply, variables)
+                                with timer.phase("transforms"):
+                                    resolved_body = services._apply_xml_body_transforms(resolved_body, transforms_to_apply, variables)
                             except Exception:
                                 pass
                 except Exception:
@@ -2733,6 +2969,7 @@ class ApiAdhocRequestView(APIView):
         if signature_value not in (None, ""):
             logger.info("API tester resolved signature: %s", signature_value)
 
+        persist_started = time.perf_counter()
         run = models.ApiRun.objects.create(
             collection=collection,
             environment=environment,
@@ -2746,151 +2983,230 @@ class ApiAdhocRequestView(APIView):
             order=1,
             status=models.ApiRunResult.Status.ERROR,
         )
-        # track any AutomationReport created during execution so we can
-        # include its id in the response payload to clients
-        automation_report = None
+        timer.add_since("persist", persist_started)
 
         outbound_plaintext = None
         outbound_payload = None
         payload_reencrypted = False
         if isinstance(resolved_json, dict):
             try:
-                outbound_plaintext, outbound_payload, payload_reencrypted = _apply_pay_reference_override(resolved_json, overrides)
+                with timer.phase("encryption"):
+                    outbound_plaintext, outbound_payload, payload_reencrypted = _apply_pay_reference_override(resolved_json, overrides)
                 if payload_reencrypted:
                     logger.info("[tester.execute] outbound payload updated with overridden pay_reference.")
                     print("[tester.execute] outbound payload updated with overridden pay_reference.")
                     if outbound_payload is not None:
-                        try:
-                            outbound_preview = json.dumps(outbound_payload, ensure_ascii=False)[:2000]
-                        except TypeError:
-                            outbound_preview = str(outbound_payload)[:2000]
+                        outbound_preview = services.json_snapshot(outbound_payload)[:2000]
                         logger.info("[tester.execute] outbound decrypted payload: %s", outbound_preview)
                         print("[tester.execute] outbound decrypted payload:", outbound_preview)
             except Exception:
                 # helper already logs; continue without blocking execution
                 pass
 
-        start = time.perf_counter()
+        if resolved_json is not None:
+            # Serializing a large payload is only worth it when the line is actually emitted.
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("API tester outbound JSON: %s", services.json_snapshot(resolved_json)[:2000])
+        elif resolved_body not in (None, ""):
+            body_preview = resolved_body
+            if isinstance(body_preview, str) and len(body_preview) > 2000:
+                body_preview = f"{body_preview[:2000]}…"
+            logger.info("API tester outbound body: %s", body_preview)
+
+        return SimpleNamespace(
+            payload=payload,
+            timer=timer,
+            method=method,
+            url=url,
+            timeout=timeout,
+            environment=environment,
+            variables=variables,
+            api_request=api_request,
+            resolved_url=resolved_url,
+            resolved_headers=resolved_headers,
+            resolved_params=resolved_params,
+            resolved_json=resolved_json,
+            resolved_body=resolved_body,
+            files_payload=files_payload,
+            upload_stream=upload_stream,
+            request_form_snapshot=request_form_snapshot,
+            run=run,
+            run_result=run_result,
+        )
+
+    @staticmethod
+    def _execute_payload(request) -> dict[str, Any]:
+        """The execute payload; multipart requests carry it as JSON in a ``payload`` part.
+
+        In multipart requests a ``form_data`` file entry without ``data`` refers to the
+        uploaded file named by its ``upload`` (default: its ``key``).
+        """
+        if not str(request.content_type or "").startswith("multipart/"):
+            return request.data or {}
+        raw = request.data.get("payload")
         try:
-            if resolved_json is not None:
-                try:
-                    logger.info(
-                        "API tester outbound JSON: %s",
-                        json.dumps(resolved_json, ensure_ascii=False)[:2000],
-                    )
-                except Exception:
-                    logger.info("API tester outbound JSON (unserializable)")
-            elif resolved_body not in (None, ""):
-                body_preview = resolved_body
-                if isinstance(body_preview, str) and len(body_preview) > 2000:
-                    body_preview = f"{body_preview[:2000]}…"
-                logger.info("API tester outbound body: %s", body_preview)
-            response = requests.request(
-                method=method,
-                url=resolved_url,
-                headers=resolved_headers,
-                params=resolved_params,
-                data=None if resolved_json is not None else resolved_body,
-                json=resolved_json,
-                files=files_payload,
-                timeout=max(1.0, float(timeout)),
-            )
-        except requests.RequestException as exc:  # pragma: no cover - network error path
-            elapsed_ms = (time.perf_counter() - start) * 1000
-            run_result.error = str(exc)
-            run_result.response_time_ms = elapsed_ms
-            run_result.status = models.ApiRunResult.Status.ERROR
-            run_result.save(update_fields=["error", "response_time_ms", "status", "updated_at"])
-            run.status = models.ApiRun.Status.FAILED
-            run.summary = services._summarize_run(1, 0)  # type: ignore[attr-defined]
-            run.finished_at = timezone.now()
-            run.save(update_fields=["status", "summary", "finished_at", "updated_at"])
-            # mirror into report table (non-blocking)
+            payload = json.loads(raw) if raw else {}
+        except ValueError as exc:
+            raise ValidationError({"payload": "payload must be a JSON object."}) from exc
+        if not isinstance(payload, dict):
+            raise ValidationError({"payload": "payload must be a JSON object."})
+        return payload
+
+    @staticmethod
+    def _outbound_body(prepared: SimpleNamespace) -> dict[str, Any]:
+        """Headers and body arguments shared by the sync and async senders."""
+        stream = prepared.upload_stream
+        if stream is None:
+            return {
+                "headers": prepared.resolved_headers,
+                "data": None if prepared.resolved_json is not None else prepared.resolved_body,
+                "json": prepared.resolved_json,
+                "files": prepared.files_payload,
+            }
+        stream.reset()  # a retry must resend the body from the start
+        headers = {
+            key: value
+            for key, value in (prepared.resolved_headers or {}).items()
+            if str(key).lower() not in ("content-type", "content-length")
+        }
+        headers.update({"Content-Type": stream.content_type, "Content-Length": str(len(stream))})
+        return {"headers": headers, "data": stream, "json": None, "files": None}
+
+    def _send(self, prepared: SimpleNamespace) -> requests.Response:
+        return services.send_or_replay(
+            lambda: circuit.call(
+                prepared.resolved_url,
+                lambda: requests.request(
+                    method=prepared.method,
+                    url=prepared.resolved_url,
+                    params=prepared.resolved_params,
+                    timeout=max(1.0, float(prepared.timeout)),
+                    **self._outbound_body(prepared),
+                ),
+            ),
+            environment=prepared.environment,
+            method=prepared.method,
+            url=prepared.resolved_url,
+            url_template=prepared.api_request.url if prepared.api_request is not None else prepared.url,
+            json_body=prepared.resolved_json,
+            api_request=prepared.api_request,
+        )
+
+    async def _asend(self, prepared: SimpleNamespace) -> requests.Response:
+        """Await the upstream call on the event loop; record/replay environments use ``_send``."""
+        mode = getattr(prepared.environment, "replay_mode", models.ApiEnvironment.ReplayModes.LIVE)
+        if mode != models.ApiEnvironment.ReplayModes.LIVE:
+            return await sync_to_async(self._send)(prepared)
+        return await circuit.acall(
+            prepared.resolved_url,
+            lambda: services.asend_request(
+                method=prepared.method,
+                url=prepared.resolved_url,
+                params=prepared.resolved_params,
+                timeout=max(1.0, float(prepared.timeout)),
+                **self._outbound_body(prepared),
+            ),
+        )
+
+    def _execution_failed(self, prepared: SimpleNamespace, exc: Exception, elapsed_ms: float) -> Response:
+        payload, timer, run, run_result = prepared.payload, prepared.timer, prepared.run, prepared.run_result
+        api_request, resolved_url, resolved_headers = prepared.api_request, prepared.resolved_url, prepared.resolved_headers
+        # track any AutomationReport created during execution so we can
+        # include its id in the response payload to clients
+        automation_report = None
+        timer.add("upstream", elapsed_ms)
+        run_result.error = str(exc)
+        run_result.response_time_ms = elapsed_ms
+        run_result.status = models.ApiRunResult.Status.ERROR
+        run_result.phase_timings = timer.as_dict()
+        run_result.save(update_fields=["error", "response_time_ms", "status", "phase_timings", "updated_at"])
+        run.status = models.ApiRun.Status.FAILED
+        run.summary = services._summarize_run(1, 0)  # type: ignore[attr-defined]
+        run.finished_at = timezone.now()
+        run.save(update_fields=["status", "summary", "finished_at", "updated_at"])
+        # mirror into report table (non-blocking)
+        try:
+            tc = None
             try:
+                tc = api_request.test_cases.first()
+            except Exception:
                 tc = None
-                try:
-                    tc = api_request.test_cases.first()
-                except Exception:
-                    tc = None
 
-                automation_report = None
-                # Prefer an explicit automation_report_id from the client payload
+            automation_report = None
+            # Prefer an explicit automation_report_id from the client payload
+            try:
+                ar_id = payload.get("automation_report_id") if isinstance(payload, dict) else None
+            except Exception:
+                ar_id = None
+            if ar_id:
                 try:
-                    ar_id = payload.get("automation_report_id") if isinstance(payload, dict) else None
+                    automation_report = models.AutomationReport.objects.filter(pk=int(ar_id)).first()
                 except Exception:
-                    ar_id = None
-                if ar_id:
-                    try:
-                        automation_report = models.AutomationReport.objects.filter(pk=int(ar_id)).first()
-                    except Exception:
-                        automation_report = None
-                # Fallback to finding/creating by run.started_at and triggered_by
-                if not automation_report:
-                    try:
-                        automation_report = models.AutomationReport.objects.filter(started=run.started_at, triggered_by=run.triggered_by).first()
-                        if not automation_report:
-                            automation_report = models.AutomationReport.objects.create(
-                                triggered_in=(run.collection.name if run.collection else ""),
-                                triggered_by=run.triggered_by,
-                                started=run.started_at,
-                                finished=run.finished_at,
-                            )
-                    except Exception:
-                        automation_report = None
-
-                models.ApiRunResultReport.objects.create(
-                    run=run,
-                    request=api_request,
-                    order=run_result.order,
-                    status=run_result.status,
-                    response_status=run_result.response_status,
-                    response_headers=run_result.response_headers,
-                    response_body=run_result.response_body,
-                    response_time_ms=run_result.response_time_ms,
-                    assertions_passed=run_result.assertions_passed,
-                    assertions_failed=run_result.assertions_failed,
-                    error=run_result.error,
-                    testcase=tc,
-                    automation_report=automation_report,
-                )
-                # recompute report totals based on test case results
+                    automation_report = None
+            # Fallback to finding/creating by run.started_at and triggered_by
+            if not automation_report:
                 try:
-                    services.recompute_automation_report_totals(automation_report)
-                    if automation_report is not None:
-                        # ensure finished is current
-                        if run.finished_at and (not automation_report.finished or run.finished_at > automation_report.finished):
-                            automation_report.finished = run.finished_at
-                            automation_report.save(update_fields=["finished"])
+                    automation_report = models.AutomationReport.objects.filter(started=run.started_at, triggered_by=run.triggered_by).first()
+                    if not automation_report:
+                        automation_report = models.AutomationReport.objects.create(
+                            triggered_in=(run.collection.name if run.collection else ""),
+                            triggered_by=run.triggered_by,
+                            started=run.started_at,
+                            finished=run.finished_at,
+                        )
                 except Exception:
-                    pass
-            except Exception:
-                pass
-            payload = {
-                "error": str(exc),
-                "resolved_url": resolved_url,
-                "request_headers": resolved_headers,
-                "run_id": run.id,
-            }
+                    automation_report = None
+
+            models.ApiRunResultReport.objects.create(
+                run=run,
+                request=api_request,
+                result=run_result,
+                order=run_result.order,
+                status=run_result.status,
+                testcase=tc,
+                automation_report=automation_report,
+            )
+            # recompute report totals based on test case results
             try:
+                services.recompute_automation_report_totals(automation_report)
                 if automation_report is not None:
-                    payload["automation_report_id"] = getattr(automation_report, "id", None)
+                    # ensure finished is current
+                    if run.finished_at and (not automation_report.finished or run.finished_at > automation_report.finished):
+                        automation_report.finished = run.finished_at
+                        automation_report.save(update_fields=["finished"])
             except Exception:
                 pass
-            return Response(payload, status=status.HTTP_502_BAD_GATEWAY)
-
-        elapsed_ms = (time.perf_counter() - start) * 1000
-
+        except Exception:
+            pass
+        payload = {
+            "error": str(exc),
+            "resolved_url": resolved_url,
+            "request_headers": resolved_headers,
+            "run_id": run.id,
+        }
         try:
-            response_json = response.json()
-        except ValueError:
-            response_json = None
+            if automation_report is not None:
+                payload["automation_report_id"] = getattr(automation_report, "id", None)
+        except Exception:
+            pass
+        return Response(payload, status=status.HTTP_502_BAD_GATEWAY)
+
+    def _execution_finished(self, prepared: SimpleNamespace, response: requests.Response, elapsed_ms: float) -> Response:
+        payload, timer, run, run_result = prepared.payload, prepared.timer, prepared.run, prepared.run_result
+        api_request, resolved_url, resolved_headers = prepared.api_request, prepared.resolved_url, prepared.resolved_headers
+        method, timeout, environment, variables = prepared.method, prepared.timeout, prepared.environment, prepared.variables
+        resolved_params, resolved_json, resolved_body = prepared.resolved_params, prepared.resolved_json, prepared.resolved_body
+        request_form_snapshot = prepared.request_form_snapshot
+        automation_report = None
+        timer.add("upstream", elapsed_ms)
+
+        # One parsed view of the response serves logging, decryption, persistence and the reply.
+        with timer.phase("parse"):
+            parsed = services.ParsedResponse(response)
+            response_json = parsed.json
 
         if response_json is not None:
-            try:
-                response_snapshot = json.dumps(response_json, ensure_ascii=False)
-            except TypeError:
-                response_snapshot = str(response_json)
-            truncated_response = response_snapshot[:2000]
+            truncated_response = parsed.snapshot[:2000]
             logger.info("[tester.execute] response json: %s", truncated_response)
             print("[tester.execute] response json:", truncated_response)
 
@@ -2908,17 +3224,14 @@ class ApiAdhocRequestView(APIView):
 
                 encrypted_field = response_json.get("data")
                 if isinstance(encrypted_field, str):
-                    decrypted_plaintext, decrypted_payload = _attempt_decrypt_response_data(encrypted_field)
+                    with timer.phase("decryption"):
+                        decrypted_plaintext, decrypted_payload = _attempt_decrypt_response_data(encrypted_field)
                     if decrypted_plaintext:
                         truncated_plaintext = decrypted_plaintext[:2000]
                         logger.info("[tester.execute] decrypted text: %s", truncated_plaintext)
                         print("[tester.execute] decrypted text:", truncated_plaintext)
                     if decrypted_payload is not None:
-                        try:
-                            decrypted_snapshot = json.dumps(decrypted_payload, ensure_ascii=False)
-                        except TypeError:
-                            decrypted_snapshot = str(decrypted_payload)
-                        truncated_decrypted = decrypted_snapshot[:2000]
+                        truncated_decrypted = services.json_snapshot(decrypted_payload)[:2000]
                         logger.info("[tester.execute] decrypted json: %s", truncated_decrypted)
                         print("[tester.execute] decrypted json:", truncated_decrypted)
                         if pay_reference is None and isinstance(decrypted_payload, dict):
@@ -2928,11 +3241,12 @@ class ApiAdhocRequestView(APIView):
                 logger.info("[tester.execute] response pay_reference=%s", pay_reference)
                 print(f"[tester.execute] response pay_reference={pay_reference}")
 
-        run_result.response_status = response.status_code
-        run_result.response_headers = dict(response.headers)
-        run_result.response_body = response.text[:20000]
+        persist_started = time.perf_counter()
+        run_result.response_status = parsed.status_code
+        run_result.response_headers = parsed.headers_dict
+        run_result.response_body = parsed.body
         run_result.response_time_ms = elapsed_ms
-        run_result.status = models.ApiRunResult.Status.PASSED if response.ok else models.ApiRunResult.Status.FAILED
+        run_result.status = models.ApiRunResult.Status.PASSED if parsed.ok else models.ApiRunResult.Status.FAILED
         run_result.save(
             update_fields=[
                 "response_status",
@@ -2943,6 +3257,11 @@ class ApiAdhocRequestView(APIView):
                 "updated_at",
             ]
         )
+        if api_request is not None:
+            try:
+                services.buffer_request_latency(api_request.pk, elapsed_ms)
+            except Exception:
+                logger.exception("failed to record latency for request %s", api_request.pk)
         # mirror into report table (non-blocking)
         try:
             tc = None
@@ -2978,15 +3297,9 @@ class ApiAdhocRequestView(APIView):
             models.ApiRunResultReport.objects.create(
                 run=run,
                 request=api_request,
+                result=run_result,
                 order=run_result.order,
                 status=run_result.status,
-                response_status=run_result.response_status,
-                response_headers=run_result.response_headers,
-                response_body=run_result.response_body,
-                response_time_ms=run_result.response_time_ms,
-                assertions_passed=run_result.assertions_passed,
-                assertions_failed=run_result.assertions_failed,
-                error=run_result.error,
                 testcase=tc,
                 automation_report=automation_report,
             )
@@ -3001,19 +3314,23 @@ class ApiAdhocRequestView(APIView):
                 pass
         except Exception:
             pass
-        passed = 1 if response.ok else 0
-        run.status = models.ApiRun.Status.PASSED if response.ok else models.ApiRun.Status.FAILED
+        passed = 1 if parsed.ok else 0
+        run.status = models.ApiRun.Status.PASSED if parsed.ok else models.ApiRun.Status.FAILED
         run.summary = services._summarize_run(1, passed)  # type: ignore[attr-defined]
         run.finished_at = timezone.now()
         run.save(update_fields=["status", "summary", "finished_at", "updated_at"])
+        timer.add_since("persist", persist_started)
+        phase_timings = timer.as_dict()
+        models.ApiRunResult.objects.filter(pk=run_result.pk).update(phase_timings=phase_timings)
 
         return Response(
             {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "body": response.text[:20000],
+                "status_code": parsed.status_code,
+                "headers": parsed.headers_dict,
+                "body": parsed.body,
                 "json": response_json,
                 "elapsed_ms": elapsed_ms,
+                "phase_timings": phase_timings,
                 "resolved_url": resolved_url,
                 "request": {
                     "method": method,
@@ -3033,6 +3350,46 @@ class ApiAdhocRequestView(APIView):
         )
 
 
+async def api_execute_async(request, *args, **kwargs):
+    """Async variant of ``ApiAdhocRequestView`` for ASGI deployments.
+
+    Authentication, validation and persistence run on Django's thread pool while the
+    upstream call is awaited on the event loop, so slow upstreams hold no worker thread.
+    Request payload and response body are the same as the synchronous endpoint.
+    """
+    view = ApiAdhocRequestView()
+    view.args, view.kwargs = args, kwargs
+    drf_request = view.initialize_request(request, *args, **kwargs)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+    admission_scope = None
+    try:
+        await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+        admission_scope = throttling.execute_admission(drf_request.user)
+        admission = await sync_to_async(admission_scope.__enter__)()
+        prepared = await sync_to_async(view._prepare_execution)(drf_request, admission)
+        start = time.perf_counter()
+        try:
+            upstream = await view._asend(prepared)
+        except requests.RequestException as exc:
+            response = await sync_to_async(view._execution_failed)(prepared, exc, (time.perf_counter() - start) * 1000)
+        else:
+            response = await sync_to_async(view._execution_finished)(
+                prepared, upstream, (time.perf_counter() - start) * 1000
+            )
+    except Exception as exc:
+        response = await sync_to_async(view.handle_exception)(exc)
+    finally:
+        if admission_scope is not None:
+            await sync_to_async(admission_scope.__exit__)(None, None, None)
+    view.response = view.finalize_response(drf_request, response, *args, **kwargs)
+    return view.response
+
+
+# DRF authenticates with its own CSRF rules; ``csrf_exempt`` would hide the coroutine from Django.
+api_execute_async.csrf_exempt = True
+
+
 @login_required
 def api_tester_page(request):
     """Render the interactive API testing workspace."""
@@ -3243,7 +3600,7 @@ class AutomationReportTestcaseDetailView(APIView):
     def get(self, request, pk=None, testcase_id=None, *args, **kwargs):
         try:
             # Try to find by linked TestCase.testcase_id
-            qs = models.ApiRunResultReport.objects.select_related("testcase", "run", "request")
+            qs = models.ApiRunResultReport.objects.select_related("testcase", "run", "request", "result")
             obj = qs.filter(automation_report_id=int(pk), testcase__testcase_id=str(testcase_id)).order_by("-created_at").first()
             if not obj:
                 # fallback: try matching by TestCase PK if numeric
@@ -3307,9 +3664,6 @@ def _loadtest_collect_testcases(*, scope: str, selection: dict[str, Any]) -> lis
     Selection payload keys (all optional): project_ids, module_ids, scenario_ids, testcase_ids.
     """
 
-    qs = models.TestCase.objects.select_related("scenario", "related_api_request")
-    qs = qs.filter(scenario__is_automated=True)
-
     def as_int_list(value: Any) -> list[int]:
         if value in (None, ""):
             return []
@@ -3325,26 +3679,15 @@ def _loadtest_collect_testcases(*, scope: str, selection: dict[str, Any]) -> lis
                 continue
         return out
 
-    if scope == models.LoadTestRun.Scope.TESTCASE:
-        ids = as_int_list(selection.get("testcase_ids"))
-        if ids:
-            qs = qs.filter(pk__in=ids)
-    elif scope == models.LoadTestRun.Scope.SCENARIO:
-        ids = as_int_list(selection.get("scenario_ids"))
-        if ids:
-            qs = qs.filter(scenario_id__in=ids)
-    elif scope == models.LoadTestRun.Scope.MODULE:
-        ids = as_int_list(selection.get("module_ids"))
-        if ids:
-            qs = qs.filter(scenario__module_id__in=ids)
-    elif scope == models.LoadTestRun.Scope.PROJECT:
-        ids = as_int_list(selection.get("project_ids"))
-        if ids:
-            qs = qs.filter(scenario__project_id__in=ids)
-
-    # Only include testcases that have a related request.
-    qs = qs.filter(related_api_request__isnull=False)
-    return list(qs.order_by("scenario_id", "id"))
+    scope_filters = {
+        models.LoadTestRun.Scope.TESTCASE: "testcase_ids",
+        models.LoadTestRun.Scope.SCENARIO: "scenario_ids",
+        models.LoadTestRun.Scope.MODULE: "module_ids",
+        models.LoadTestRun.Scope.PROJECT: "project_ids",
+    }
+    key = scope_filters.get(scope)
+    filters = {key: as_int_list(selection.get(key))} if key else {}
+    return list(selectors.automated_test_case_list(**filters))
 
 
 def _loadtest_build_execute_payloads(*, testcases: list[models.TestCase], environment_id: int | None) -> list[dict[str, Any]]:
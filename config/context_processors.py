@@ -1,5 +1,9 @@
+import logging
+
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 def static_version(request):
     """Expose STATIC_VERSION for template cache busting."""
@@ -30,25 +34,10 @@ def enabled_modules(request):
     try:
         from django.apps import apps as django_apps
         if not django_apps.is_installed('apps.accounts'):
-            print("Accounts app not installed; no enabled modules.")
             return {'ENABLED_MODULE_CODENAMES': []}
 
-        if user.is_superuser:
-            from apps.accounts.models import Module
-            codes = [c for c in Module.objects.values_list('codename', flat=True) if c]
-            is_superuser = sorted(set(codes))
-            print(f"Superuser enabled modules: {is_superuser}")
-            return {'ENABLED_MODULE_CODENAMES': sorted(set(codes))}
-
-        # Role-based module enablement
-        # Prefer the M2M accessor on Group (`modules`) which is defined via Module.roles related_name.
-        codes = [
-            c for c in user.groups.values_list('modules__codename', flat=True)
-            if c
-        ]
-        not_superuser = sorted(set(codes))
-        print(f"Not superuser enabled modules: {not_superuser}")
-        return {'ENABLED_MODULE_CODENAMES': sorted(set(codes))}
+        from apps.accounts.selectors import user_module_snapshot_get
+        return {'ENABLED_MODULE_CODENAMES': list(user_module_snapshot_get(user=user)['codenames'])}
     except Exception:
-        print("Error determining enabled modules.")
+        logger.exception("Error determining enabled modules.")
         return {'ENABLED_MODULE_CODENAMES': []}
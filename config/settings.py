@@ -1,9 +1,11 @@
 """Django settings for the automation project."""
 
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import environ  # type: ignore
+from celery.schedules import crontab
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -217,6 +219,76 @@ OPENAI_API_BASE = env("OPENAI_API_BASE").rstrip("/") or "https://api.openai.com/
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default=env("REDIS_URL", default="redis://redis:6379/0"))
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default=CELERY_BROKER_URL)
 
+# Worker pool size for data-driven (per dataset row) request execution
+API_DATASET_MAX_WORKERS = env.int("API_DATASET_MAX_WORKERS", default=8)
+# Worker pool size for test case batches (run-batch endpoint, manage.py run_plan)
+API_BATCH_MAX_WORKERS = env.int("API_BATCH_MAX_WORKERS", default=4)
+# Critical-path ordering: per-case durations are averaged over this window; unseen cases use the default
+API_BATCH_ESTIMATE_WINDOW_DAYS = env.int("API_BATCH_ESTIMATE_WINDOW_DAYS", default=30)
+API_BATCH_DEFAULT_ESTIMATE_MS = env.int("API_BATCH_DEFAULT_ESTIMATE_MS", default=1000)
+# Execute-endpoint latencies are queued in-process and folded into the daily sketches in
+# batches of this size or after this many seconds (size 1 writes each sample directly).
+# Test runs write directly: a process-wide queue would outlive each test's transaction.
+TESTING = sys.argv[1:2] == ["test"]
+API_LATENCY_BUFFER_SIZE = env.int("API_LATENCY_BUFFER_SIZE", default=1 if TESTING else 200)
+API_LATENCY_FLUSH_INTERVAL = env.float("API_LATENCY_FLUSH_INTERVAL", default=5.0)
+# How often a running collection/batch checks whether it has been cancelled
+API_RUN_CANCEL_POLL_SECONDS = env.int("API_RUN_CANCEL_POLL_SECONDS", default=2)
+
+# Scheduled runs: at most this many execute at once (0 disables the cap); a claim older
+# than the stale window is treated as abandoned by a dead worker.
+SCHEDULED_RUN_MAX_CONCURRENT = env.int("SCHEDULED_RUN_MAX_CONCURRENT", default=2)
+SCHEDULED_RUN_STALE_SECONDS = env.int("SCHEDULED_RUN_STALE_SECONDS", default=6 * 3600)
+
+# Run history retention: runs older than this are archived to MEDIA storage and deleted
+RUN_HISTORY_RETENTION_DAYS = env.int("RUN_HISTORY_RETENTION_DAYS", default=90)
+RUN_HISTORY_ARCHIVE_BATCH_SIZE = env.int("RUN_HISTORY_ARCHIVE_BATCH_SIZE", default=500)
+
+# Multipart uploads larger than this are spooled to a temporary file instead of memory;
+# the execute endpoint streams them to the upstream from there.
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int("FILE_UPLOAD_MAX_MEMORY_SIZE", default=2621440)
+
+# Admission control for /api/core/tester/execute/ (0 disables a limit). Shared through
+# Redis when REDIS_URL is set, otherwise enforced per process.
+EXECUTE_RATE_PER_SECOND = env.float("EXECUTE_RATE_PER_SECOND", default=10.0)
+EXECUTE_RATE_BURST = env.int("EXECUTE_RATE_BURST", default=20)
+EXECUTE_MAX_IN_FLIGHT_PER_USER = env.int("EXECUTE_MAX_IN_FLIGHT_PER_USER", default=8)
+EXECUTE_MAX_IN_FLIGHT_PER_HOST = env.int("EXECUTE_MAX_IN_FLIGHT_PER_HOST", default=32)
+# Seconds an in-flight slot survives a crashed worker before Redis expires it
+EXECUTE_SLOT_TTL = env.int("EXECUTE_SLOT_TTL", default=300)
+
+# Per-host circuit breaker for outbound test requests (threshold 0 disables it); shared
+# through Redis when REDIS_URL is set. Retries of connection errors/timeouts use jittered
+# backoff and draw from a per-run budget.
+UPSTREAM_CIRCUIT_FAILURE_THRESHOLD = env.int("UPSTREAM_CIRCUIT_FAILURE_THRESHOLD", default=5)
+UPSTREAM_CIRCUIT_COOLDOWN_SECONDS = env.int("UPSTREAM_CIRCUIT_COOLDOWN_SECONDS", default=30)
+UPSTREAM_RETRY_ATTEMPTS = env.int("UPSTREAM_RETRY_ATTEMPTS", default=0)
+UPSTREAM_RETRY_BUDGET = env.int("UPSTREAM_RETRY_BUDGET", default=10)
+UPSTREAM_RETRY_BACKOFF_MS = env.int("UPSTREAM_RETRY_BACKOFF_MS", default=200)
+UPSTREAM_RETRY_BACKOFF_MAX_MS = env.int("UPSTREAM_RETRY_BACKOFF_MAX_MS", default=2000)
+
+# Seconds a user's cached enabled-module/permission snapshot may live. With REDIS_URL set it
+# is shared and signals invalidate it for every process; without Redis each process keeps its
+# own copy that other processes cannot invalidate, so it only lives for the short LOCAL TTL.
+ACCOUNT_MODULE_SNAPSHOT_TTL = env.int("ACCOUNT_MODULE_SNAPSHOT_TTL", default=300)
+ACCOUNT_MODULE_SNAPSHOT_LOCAL_TTL = env.int("ACCOUNT_MODULE_SNAPSHOT_LOCAL_TTL", default=5)
+
+# User audit trail writer: "sync" inserts per action, "buffered" batches in-process,
+# "celery" batches in-process and hands each batch to a worker
+AUDIT_LOG_BACKEND = env("AUDIT_LOG_BACKEND", default="sync")
+AUDIT_BUFFER_SIZE = env.int("AUDIT_BUFFER_SIZE", default=100)
+AUDIT_FLUSH_INTERVAL = env.float("AUDIT_FLUSH_INTERVAL", default=5.0)
+# High-frequency actions keep at most one audit row per user within this window
+AUDIT_COALESCE_ACTIONS = env.list("AUDIT_COALESCE_ACTIONS", default=["testcase_run"])
+AUDIT_COALESCE_SECONDS = env.int("AUDIT_COALESCE_SECONDS", default=60)
+
+CELERY_BEAT_SCHEDULE = {
+    "core-archive-run-history": {
+        "task": "apps.core.tasks.archive_run_history",
+        "schedule": crontab(hour=3, minute=0),
+    },
+}
+
 
 redis_url = env("REDIS_URL", default=None) or env("CHANNEL_REDIS_URL", default=None)
 if redis_url:
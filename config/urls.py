@@ -47,7 +47,7 @@ def _first_enabled_module_url_for_user(user):
 	if not django_apps.is_installed('apps.accounts'):
 		return None
 
-	from apps.accounts.models import Module  # local import
+	from apps.accounts.selectors import user_module_snapshot_get  # local import
 
 	def url_for_module_code(code: str):
 		# Only include modules that have a real page route.
@@ -74,14 +74,8 @@ def _first_enabled_module_url_for_user(user):
 			return '/data-management/environments/'
 		return None
 
-	qs = Module.objects.all()
-	if not user.is_superuser:
-		groups = user.groups.all()
-		qs = qs.filter(rolemodule__role__in=groups).distinct()
-	qs = qs.order_by('order', 'id')
-
-	for m in qs:
-		url = url_for_module_code(str(m.codename or '').strip())
+	for code in user_module_snapshot_get(user=user)['ordered_codenames']:
+		url = url_for_module_code(str(code or '').strip())
 		if url:
 			return url
 	return None